@@ -0,0 +1,194 @@
+"""
+Requests/sec and tail latency of the AJAX endpoints under uvicorn (ASGI)
+versus gunicorn (WSGI, threaded workers) at increasing concurrency.
+
+Both servers run against the same freshly generated SQLite database with
+SQLITE_TUNING on, and are driven by an asyncio client so the load generator
+itself does not run out of threads:
+
+    python benchmarks/asgi_vs_wsgi.py --dares 5000 --concurrency 32 128 512 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import BASE_DIR, summarize
+
+# Any 32-character token is accepted when the cookie and header agree.
+CSRF_TOKEN = 'b' * 32
+
+
+def server_command(server, port, workers, threads):
+    if server == 'asgi':
+        return [
+            sys.executable, '-m', 'uvicorn', 'daredb.asgi:application',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+            '--no-access-log', '--log-level', 'warning',
+        ]
+    return [
+        sys.executable, '-m', 'gunicorn', 'daredb.wsgi:application',
+        '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+        '--worker-class', 'gthread', '--threads', str(threads), '--log-level', 'warning',
+    ]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_listening(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'server exited with status {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server did not start listening on {port}')
+
+
+async def send(port, method, path, body=b''):
+    """One HTTP/1.1 request on a fresh connection; returns ``(seconds, status)``."""
+    started = time.perf_counter()
+    headers = [
+        f'{method} {path} HTTP/1.1', 'Host: localhost', 'Connection: close',
+        'X-Requested-With: XMLHttpRequest', f'Cookie: csrftoken={CSRF_TOKEN}',
+        f'X-CSRFToken: {CSRF_TOKEN}',
+    ]
+    if body:
+        headers += ['Content-Type: application/x-www-form-urlencoded', f'Content-Length: {len(body)}']
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        status = int(response.split(b' ', 2)[1])
+    except (OSError, IndexError, ValueError):
+        status = 0
+    return time.perf_counter() - started, status
+
+
+async def drive(port, make_request, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await send(port, *make_request(i))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, status in results if 200 <= status < 400]
+    summary = summarize(latencies)
+    summary.update({
+        'errors': sum(1 for _, status in results if not 200 <= status < 400),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+    })
+    return summary
+
+
+def endpoints(slugs, label):
+    """Request factories for the async AJAX endpoints, keyed by name."""
+    def like(i):
+        body = urlencode({'email': f'{label}-{i // 2}@example.com'}).encode()
+        return 'POST', f'/ajax/dare/{slugs[i % len(slugs)]}/like/', body
+
+    def complete(i):
+        body = urlencode({
+            'completer_name': 'Bench', 'completer_email': f'{label}-{i}@example.com',
+            'completion_proof': 'Benchmarked it.',
+        }).encode()
+        return 'POST', f'/ajax/dare/{slugs[i % len(slugs)]}/complete/', body
+
+    return {
+        'search_suggestions': lambda i: ('GET', f'/ajax/search/suggestions/?q=a{i % 10}'),
+        'api_stats': lambda i: ('GET', '/api/stats/'),
+        'dare_like': like,
+        'dare_complete': complete,
+    }
+
+
+def prepare_database(path, dares, env):
+    manage = [sys.executable, str(BASE_DIR / 'manage.py')]
+    subprocess.run(manage + ['migrate', '--verbosity', '0'], check=True, env=env, cwd=BASE_DIR)
+    subprocess.run(
+        manage + ['generate_dares', '--dares', str(dares), '--likes', str(dares * 5),
+                  '--completions', str(dares)],
+        check=True, env=env, cwd=BASE_DIR, stdout=subprocess.DEVNULL,
+    )
+    script = (
+        'import django; django.setup(); from dares.models import Dare; '
+        'print("\\n".join(Dare.objects.filter(is_approved=True).values_list("slug", flat=True)[:200]))'
+    )
+    out = subprocess.run([sys.executable, '-c', script], check=True, env=env, cwd=BASE_DIR,
+                         capture_output=True, text=True).stdout
+    return out.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dares', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=1000, help="Requests per endpoint and concurrency level")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[32, 128, 512])
+    parser.add_argument('--workers', type=int, default=2, help="Server processes for both servers")
+    parser.add_argument('--threads', type=int, default=8, help="Threads per gunicorn worker")
+    parser.add_argument('--only', nargs='*', help="Limit the run to these endpoint names")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    report = {'workers': args.workers, 'threads': args.threads, 'results': []}
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ, DJANGO_SETTINGS_MODULE='daredb.settings', SQLITE_TUNING='True', DARES_LOG_LEVEL='ERROR',
+            DATABASE_URL=f"sqlite:///{Path(tmp) / 'bench.sqlite3'}", PYTHONPATH=str(BASE_DIR),
+        )
+        slugs = prepare_database(Path(tmp) / 'bench.sqlite3', args.dares, env)
+
+        for server in ('wsgi', 'asgi'):
+            port = free_port()
+            process = subprocess.Popen(server_command(server, port, args.workers, args.threads),
+                                       env=env, cwd=BASE_DIR)
+            try:
+                wait_until_listening(port, process)
+                for name, make_request in endpoints(slugs, server).items():
+                    if args.only and name not in args.only:
+                        continue
+                    for concurrency in args.concurrency:
+                        # Keep the email space distinct per run so completions stay inserts.
+                        offset = concurrency * args.requests
+                        result = asyncio.run(drive(
+                            port, lambda i: make_request(i + offset), args.requests, concurrency,
+                        ))
+                        result.update({'server': server, 'endpoint': name, 'concurrency': concurrency})
+                        report['results'].append(result)
+                        print(
+                            f"{server:<5} {name:<20} c={concurrency:<5} {result['throughput_rps']:>8} req/s  "
+                            f"p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>9} ms  "
+                            f"errors {result['errors']}"
+                        )
+            finally:
+                process.terminate()
+                process.wait()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Insert throughput and index size for random (uuid4) vs time-ordered (UUIDv7) Dare keys.
+
+Each key strategy runs in its own subprocess against a fresh SQLite file:
+
+    python benchmarks/dare_ids.py --dares 200000 --likes-per-dare 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django
+
+
+def index_sizes(connection):
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat "
+                "WHERE name LIKE '%dare%' GROUP BY name"
+            )
+        except Exception:
+            return {}
+        return {name: size for name, size in cursor.fetchall()}
+
+
+def run_mode(args):
+    setup_django(f'sqlite:///{args.database}', DARE_SEQUENTIAL_IDS=args.sequential)
+
+    from django.core.management import call_command
+    from django.db import connection
+    from dares.models import Category, Dare, DareLike, DifficultyLevel
+
+    call_command('migrate', verbosity=0)
+    category = Category.objects.first()
+    difficulty = DifficultyLevel.objects.first()
+
+    dare_seconds = like_seconds = 0.0
+    for start in range(0, args.dares, args.batch_size):
+        batch = [
+            Dare(
+                title=f'Benchmark dare {i}', slug=f'benchmark-dare-{i}', name='Bench',
+                email=f'bench{i}@example.com', phone_number='+911234567890', college='Bench U',
+                dare_text='Benchmark dare text', category=category, difficulty=difficulty,
+            )
+            for i in range(start, min(start + args.batch_size, args.dares))
+        ]
+        began = time.perf_counter()
+        Dare.objects.bulk_create(batch)
+        dare_seconds += time.perf_counter() - began
+
+        likes = [
+            DareLike(dare=dare, user_email=f'liker{n}@example.com')
+            for dare in batch for n in range(args.likes_per_dare)
+        ]
+        began = time.perf_counter()
+        DareLike.objects.bulk_create(likes)
+        like_seconds += time.perf_counter() - began
+
+    sizes = index_sizes(connection)
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA page_count')
+        pages = cursor.fetchone()[0]
+        cursor.execute('PRAGMA page_size')
+        page_size = cursor.fetchone()[0]
+
+    print(json.dumps({
+        'sequential': args.sequential,
+        'dares_per_sec': round(args.dares / dare_seconds, 1),
+        'likes_per_sec': round(args.dares * args.likes_per_dare / like_seconds, 1) if like_seconds else 0,
+        'database_kb': pages * page_size // 1024,
+        'index_kb': {name: size // 1024 for name, size in sorted(sizes.items())},
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dares', type=int, default=100000)
+    parser.add_argument('--likes-per-dare', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--mode', choices=['uuid4', 'uuid7'])
+    parser.add_argument('--database')
+    parser.add_argument('--output', help='Write the combined results as JSON to this path')
+    args = parser.parse_args()
+
+    if args.mode:
+        args.sequential = args.mode == 'uuid7'
+        return run_mode(args)
+
+    results = []
+    for mode in ('uuid4', 'uuid7'):
+        with tempfile.TemporaryDirectory() as tmp:
+            cmd = [
+                sys.executable, __file__, '--mode', mode, '--database', str(Path(tmp) / 'bench.sqlite3'),
+                '--dares', str(args.dares), '--likes-per-dare', str(args.likes_per_dare),
+                '--batch-size', str(args.batch_size),
+            ]
+            out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+    for result in results:
+        label = 'uuid7' if result['sequential'] else 'uuid4'
+        print(f"{label}: {result['dares_per_sec']} dares/s, {result['likes_per_sec']} likes/s, "
+              f"database {result['database_kb']} KB")
+        for name, size in result['index_kb'].items():
+            print(f"    {name:<60} {size:>8} KB")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
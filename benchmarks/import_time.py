@@ -0,0 +1,103 @@
+"""
+Import-time profile of worker startup.
+
+Runs a fresh interpreter under ``python -X importtime`` that sets Django up
+and loads the URL configuration (and with it every view module), as a
+worker does before its first request, and reports the total import time,
+the slowest top-level packages by cumulative time, and whether the
+--watch modules (heavy optional dependencies) were imported at all. Each
+figure is the median of --repeat runs. Record a run on one tree and
+compare it on another:
+
+    python benchmarks/import_time.py --output before.json
+    python benchmarks/import_time.py --compare before.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import BASE_DIR
+
+STARTUP = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$')
+
+
+def profile(statement):
+    """``{module: (self_us, cumulative_us, depth)}`` for one interpreter run."""
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'daredb.settings'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return modules
+
+
+def summarize(modules):
+    packages = defaultdict(int)
+    for name, (_, cumulative_us, depth) in modules.items():
+        if depth == 0:
+            packages[name.split('.')[0]] += cumulative_us
+    return {'total_ms': sum(packages.values()) / 1000, 'packages': {name: us / 1000 for name, us in packages.items()}}
+
+
+def run(repeat, watch):
+    runs = [profile(STARTUP) for _ in range(repeat)]
+    summaries = [summarize(modules) for modules in runs]
+    names = {name for summary in summaries for name in summary['packages']}
+    return {
+        'total_ms': round(statistics.median(summary['total_ms'] for summary in summaries), 1),
+        'packages': {
+            name: round(statistics.median(summary['packages'].get(name, 0) for summary in summaries), 1)
+            for name in names
+        },
+        'modules': len(runs[0]),
+        'watched': {module: module in runs[0] for module in watch},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15, help="Packages to list")
+    parser.add_argument(
+        '--watch', nargs='*', default=['google.generativeai', 'grpc'],
+        help="Modules reported as imported or not",
+    )
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    parser.add_argument('--compare', help="JSON from an earlier --output run")
+    args = parser.parse_args()
+
+    result = run(args.repeat, args.watch)
+    before = json.loads(Path(args.compare).read_text()) if args.compare else None
+
+    delta = f"  (was {before['total_ms']} ms)" if before else ''
+    print(f"startup imports: {result['total_ms']} ms, {result['modules']} modules{delta}")
+    for name, ms in sorted(result['packages'].items(), key=lambda item: -item[1])[:args.top]:
+        was = f"  (was {before['packages'].get(name, 0)})" if before else ''
+        print(f"  {name:<28} {ms:>9.1f} ms{was}")
+    for module, imported in result['watched'].items():
+        print(f"  {module}: {'imported' if imported else 'not imported'}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
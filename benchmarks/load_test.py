@@ -0,0 +1,214 @@
+"""
+HTTP load test for the public routes in dares/urls.py.
+
+Serves the project from an in-process threaded WSGI server (or targets
+--base-url), drives every GET route with a pool of concurrent clients and
+reports p50/p95/p99 latency, queries per request and throughput per endpoint.
+Create the schema and seed data first with `python manage.py migrate` and
+`python manage.py generate_dares`, then:
+
+    python benchmarks/load_test.py --requests 200 --concurrency 16 --output results.json
+    python benchmarks/load_test.py --compare results.json
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django, summarize
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def query_counting(application):
+    """Report the number of queries each request ran in an X-Query-Count header."""
+    from django.db import connection
+
+    def wrapped(environ, start_response):
+        count = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        def counted_start_response(status, headers, exc_info=None):
+            return start_response(status, headers + [('X-Query-Count', str(count))], exc_info)
+
+        with connection.execute_wrapper(counter):
+            return application(environ, counted_start_response)
+
+    return wrapped
+
+
+def start_server():
+    from django.core.wsgi import get_wsgi_application
+
+    server = make_server(
+        '127.0.0.1', 0, query_counting(get_wsgi_application()),
+        server_class=ThreadingWSGIServer, handler_class=QuietHandler,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def discover_endpoints(sample_dares):
+    """Every GET-capable named route in dares.urls, with sample arguments."""
+    from django.urls import reverse
+    from dares import urls as dare_urls
+    from dares.forms import DareSearchForm
+    from dares.models import Category, Dare
+
+    slugs = list(
+        Dare.objects.filter(is_approved=True).order_by('-views_count').values_list('slug', flat=True)[:sample_dares]
+    )
+    categories = list(Category.objects.filter(is_active=True).values_list('name', flat=True))
+    sample_kwargs = {
+        'slug': slugs,
+        'category_name': categories,
+    }
+
+    endpoints = {}
+    for pattern in dare_urls.urlpatterns:
+        view_class = getattr(pattern.callback, 'view_class', None)
+        if view_class is None or not hasattr(view_class, 'get'):
+            continue
+        if pattern.name in ('dare_create', 'dare_edit', 'dare_delete'):
+            continue
+        name = f'{dare_urls.app_name}:{pattern.name}'
+        params = list(pattern.pattern.converters)
+        if not params:
+            endpoints[pattern.name] = [reverse(name)]
+            continue
+        values = sample_kwargs.get(params[0], [])
+        if values:
+            endpoints[pattern.name] = [reverse(name, kwargs={params[0]: value}) for value in values]
+
+    dare_list = reverse('dares:dare_list')
+    for sort, _ in DareSearchForm.SORT_CHOICES:
+        endpoints[f'dare_list?sort_by={sort}'] = [f'{dare_list}?sort_by={sort}']
+    endpoints['search_suggestions'] = [f"{reverse('dares:search_suggestions')}?q=sing"]
+    return endpoints
+
+
+def fetch(url):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=60) as response:
+            response.read()
+            status, queries = response.status, response.headers.get('X-Query-Count')
+    except urllib.error.HTTPError as error:
+        error.read()
+        status, queries = error.code, error.headers.get('X-Query-Count')
+    except OSError:
+        status, queries = 0, None
+    return time.perf_counter() - started, status, queries
+
+
+def run_endpoint(base_url, paths, requests, concurrency):
+    urls = [base_url + paths[i % len(paths)] for i in range(requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, status, _ in results if 200 <= status < 400]
+    queries = [int(q) for _, status, q in results if q is not None and 200 <= status < 400]
+    summary = summarize(latencies)
+    summary.update({
+        'requests': requests,
+        'errors': sum(1 for _, status, _ in results if not 200 <= status < 400),
+        'throughput_rps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    })
+    return summary
+
+
+def compare(baseline, current, tolerance):
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        if before['p95_ms'] and result['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {result['p95_ms']} ms")
+        if (before.get('queries_per_request') or 0) < (result.get('queries_per_request') or 0):
+            regressions.append(
+                f"{name}: queries/request {before['queries_per_request']} -> {result['queries_per_request']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--base-url', help="Target a running server instead of the in-process one")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--sample-dares', type=int, default=20, help="Distinct detail pages to rotate through")
+    parser.add_argument('--only', nargs='*', help="Limit the run to these endpoint names")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    parser.add_argument('--compare', help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed p95 growth before flagging")
+    args = parser.parse_args()
+
+    setup_django()
+    endpoints = discover_endpoints(args.sample_dares)
+    if args.only:
+        endpoints = {name: paths for name, paths in endpoints.items() if name in args.only}
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = start_server()
+
+    results = {}
+    try:
+        for name, paths in endpoints.items():
+            fetch(base_url + paths[0])
+            results[name] = run_endpoint(base_url, paths, args.requests, args.concurrency)
+            r = results[name]
+            print(
+                f"{name:<32} {r['throughput_rps']:>8} req/s  p50 {r['p50_ms']:>8} ms  "
+                f"p95 {r['p95_ms']:>8} ms  p99 {r['p99_ms']:>8} ms  "
+                f"queries {r['queries_per_request']}  errors {r['errors']}"
+            )
+    finally:
+        if server:
+            server.shutdown()
+
+    report = {
+        'base_url': base_url,
+        'requests_per_endpoint': args.requests,
+        'concurrency': args.concurrency,
+        'endpoints': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['endpoints']
+        regressions = compare(baseline, results, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
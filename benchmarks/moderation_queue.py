@@ -0,0 +1,102 @@
+"""
+Moderation queue throughput as the number of concurrent reviewers grows.
+
+Each reviewer thread claims a batch, "reviews" each dare for --review-ms and
+approves it, until the queue is empty. Reports decisions per second, how
+many claims were lost to another reviewer and whether any dare was decided
+twice. Uses a fresh SQLite file unless --database-url points elsewhere
+(e.g. PostgreSQL, where claims use SKIP LOCKED):
+
+    python benchmarks/moderation_queue.py --dares 500 --reviewers 1 2 4 8
+"""
+import argparse
+import json
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django
+
+
+def run(reviewers, batch, review_seconds):
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from dares import moderation
+    from dares.models import Dare
+
+    Dare.objects.update(status='pending', is_approved=False, approved_at=None)
+    moderation.rebuild()
+    users = [User.objects.get_or_create(username=f'reviewer{n}')[0] for n in range(reviewers)]
+    connection.close()
+
+    decided, lost = Counter(), Counter()
+
+    def review(user):
+        while True:
+            claimed = moderation.claim(user, batch)
+            if not claimed:
+                break
+            for dare_id in claimed:
+                time.sleep(review_seconds)
+                if moderation.decide(user, dare_id, 'approved'):
+                    decided[dare_id] += 1
+                else:
+                    lost[user.pk] += 1
+        connection.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=review, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'reviewers': reviewers,
+        'decided': sum(decided.values()),
+        'decisions_per_sec': round(sum(decided.values()) / elapsed, 1),
+        'seconds': round(elapsed, 2),
+        'lost_claims': sum(lost.values()),
+        'decided_twice': sum(1 for count in decided.values() if count > 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url')
+    parser.add_argument('--dares', type=int, default=500)
+    parser.add_argument('--reviewers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--batch', type=int, default=10, help="Dares claimed at a time")
+    parser.add_argument('--review-ms', type=float, default=20, help="Simulated time spent on each dare")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(args.database_url or f"sqlite:///{Path(tmp) / 'moderation.sqlite3'}", SQLITE_TUNING=True)
+
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+        call_command('generate_dares', dares=args.dares, likes=0, completions=0, verbosity=0)
+
+        results = []
+        for reviewers in args.reviewers:
+            result = run(reviewers, args.batch, args.review_ms / 1000)
+            results.append(result)
+            print(
+                f"{reviewers:>3} reviewer(s): {result['decisions_per_sec']:>8} decisions/s  "
+                f"({result['decided']} in {result['seconds']}s)  lost claims {result['lost_claims']}  "
+                f"decided twice {result['decided_twice']}"
+            )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+Page weight and time-to-first-byte for the main public pages.
+
+Serves the project from an in-process threaded WSGI server (or targets
+--base-url) and, for each page, reports the HTML size as sent with
+``Accept-Encoding: gzip, br``, the inline <style>/<script> bytes it still
+carries, the size of the same-origin stylesheets and scripts it links
+(raw, gzip and brotli) and the median TTFB. Record a run on one tree and
+compare it on another (after `python manage.py migrate` and
+`python manage.py generate_dares`):
+
+    python benchmarks/page_weight.py --output before.json
+    python benchmarks/page_weight.py --compare before.json
+"""
+import argparse
+import gzip
+import http.client
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django
+from benchmarks.load_test import start_server
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+INLINE_BLOCK = re.compile(r'<(style|script)(?:\s[^>]*)?>(.*?)</\1>', re.S | re.I)
+LINKED_ASSET = re.compile(r'<(?:link[^>]+href|script[^>]+src)="([^"]+)"', re.I)
+
+
+def request(base_url, path, encoding='gzip, br'):
+    """``(ttfb_seconds, status, headers, body)`` for one GET."""
+    parts = urlsplit(urljoin(base_url, path))
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=60)
+    try:
+        started = time.perf_counter()
+        connection.request('GET', parts.path + (f'?{parts.query}' if parts.query else ''), headers={
+            'Accept-Encoding': encoding,
+        })
+        response = connection.getresponse()
+        ttfb = time.perf_counter() - started
+        return ttfb, response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+def decode(headers, body):
+    encoding = headers.get('Content-Encoding')
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    if encoding == 'br' and brotli:
+        return brotli.decompress(body)
+    return body
+
+
+def compressed_sizes(content):
+    return {
+        'bytes': len(content),
+        'gzip_bytes': len(gzip.compress(content, 9)),
+        'br_bytes': len(brotli.compress(content)) if brotli else None,
+    }
+
+
+def measure_page(base_url, path, samples):
+    ttfbs = []
+    for _ in range(samples):
+        ttfb, status, headers, body = request(base_url, path)
+        ttfbs.append(ttfb)
+    html = decode(headers, body)
+    text = html.decode('utf-8', 'replace')
+
+    assets = {}
+    for url in sorted(set(LINKED_ASSET.findall(text))):
+        if urlsplit(url).netloc:
+            continue  # third-party, not ours to shrink
+        _, asset_status, asset_headers, asset_body = request(base_url, url)
+        if asset_status != 200:
+            continue
+        assets[url] = dict(
+            compressed_sizes(decode(asset_headers, asset_body)),
+            transfer_bytes=len(asset_body),
+            cache_control=asset_headers.get('Cache-Control'),
+        )
+
+    return {
+        'status': status,
+        'html': dict(compressed_sizes(html), transfer_bytes=len(body), encoding=headers.get('Content-Encoding')),
+        'inline_bytes': sum(len(match.group(2)) for match in INLINE_BLOCK.finditer(text)),
+        'assets': assets,
+        'ttfb_p50_ms': round(statistics.median(ttfbs) * 1000, 3),
+    }
+
+
+def default_paths():
+    from django.urls import reverse
+    from dares.models import Dare
+
+    paths = [reverse(name) for name in ('dares:home', 'dares:dare_list', 'dares:community', 'dares:faq')]
+    dare = Dare.objects.filter(is_approved=True).order_by('-views_count').first()
+    if dare:
+        paths.append(dare.get_absolute_url())
+    return paths
+
+
+def first_view_bytes(result):
+    """Bytes over the wire for a cold first view: the HTML plus every linked asset."""
+    return result['html']['transfer_bytes'] + sum(asset['transfer_bytes'] for asset in result['assets'].values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--base-url', help="Target a running server instead of the in-process one")
+    parser.add_argument('--samples', type=int, default=20, help="Requests per page for the TTFB median")
+    parser.add_argument('--paths', nargs='*', help="Pages to measure (default: home, list, community, FAQ, a dare)")
+    parser.add_argument('--output', help="Write results as JSON to this path")
+    parser.add_argument('--compare', help="Earlier JSON to compare against")
+    args = parser.parse_args()
+
+    setup_django()
+    paths = args.paths or default_paths()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = start_server()
+
+    results = {}
+    try:
+        for path in paths:
+            request(base_url, path)
+            results[path] = r = measure_page(base_url, path, args.samples)
+            print(
+                f"{path:<40} html {r['html']['bytes']:>8} B (sent {r['html']['transfer_bytes']:>7} B)  "
+                f"inline {r['inline_bytes']:>7} B  assets {len(r['assets'])}  "
+                f"first view {first_view_bytes(r):>8} B  ttfb p50 {r['ttfb_p50_ms']:>8} ms"
+            )
+    finally:
+        if server:
+            server.shutdown()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({'base_url': base_url, 'pages': results}, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())['pages']
+        for path, result in results.items():
+            before = baseline.get(path)
+            if before:
+                print(
+                    f"{path:<40} html sent {before['html']['transfer_bytes']} -> {result['html']['transfer_bytes']} B  "
+                    f"first view {first_view_bytes(before)} -> {first_view_bytes(result)} B  "
+                    f"ttfb p50 {before['ttfb_p50_ms']} -> {result['ttfb_p50_ms']} ms"
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Concurrent read/write throughput on SQLite with and without SQLITE_TUNING.
+
+Each mode runs in a fresh subprocess against its own database file so the
+pragmas are applied from the first connection. The file is migrated on
+start, so unlike load_test.py this needs no `python manage.py migrate`:
+
+    python benchmarks/sqlite_tuning.py --dares 2000 --readers 8 --writers 4 --seconds 10
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django, summarize
+
+
+def run_mode(args):
+    setup_django(f'sqlite:///{args.database}', SQLITE_TUNING=args.tuned)
+
+    from django.core.management import call_command
+    from django.db import OperationalError, connection
+    from dares.models import Category, Dare, DifficultyLevel
+
+    call_command('migrate', verbosity=0)
+    category = Category.objects.first()
+    difficulty = DifficultyLevel.objects.first()
+    Dare.objects.bulk_create(
+        Dare(
+            title=f'Benchmark dare {i}', slug=f'benchmark-dare-{i}', name='Bench',
+            email=f'bench{i}@example.com', phone_number='+911234567890', college='Bench U',
+            dare_text='Benchmark dare text', category=category, difficulty=difficulty,
+            status='approved', is_approved=True,
+        )
+        for i in range(args.dares)
+    )
+    pks = list(Dare.objects.values_list('pk', flat=True))
+    connection.close()
+
+    deadline = time.perf_counter() + args.seconds
+    reads, writes, errors = [], [], []
+
+    def reader(n):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                list(Dare.objects.filter(is_approved=True).order_by('-views_count')[:12])
+                reads.append(time.perf_counter() - start)
+            except OperationalError:
+                errors.append('read')
+        connection.close()
+
+    def writer(n):
+        i = n
+        while time.perf_counter() < deadline:
+            dare = Dare(pk=pks[i % len(pks)], views_count=0)
+            start = time.perf_counter()
+            try:
+                dare.increment_views()
+                writes.append(time.perf_counter() - start)
+            except OperationalError:
+                errors.append('write')
+            i += args.writers
+        connection.close()
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps({
+        'tuned': args.tuned,
+        'reads_per_sec': round(len(reads) / args.seconds, 1),
+        'writes_per_sec': round(len(writes) / args.seconds, 1),
+        'read_latency': summarize(reads),
+        'write_latency': summarize(writes),
+        'errors': len(errors),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dares', type=int, default=2000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--mode', choices=['default', 'tuned'])
+    parser.add_argument('--database')
+    parser.add_argument('--output', help='Write the combined results as JSON to this path')
+    args = parser.parse_args()
+
+    if args.mode:
+        args.tuned = args.mode == 'tuned'
+        return run_mode(args)
+
+    results = []
+    for mode in ('default', 'tuned'):
+        with tempfile.TemporaryDirectory() as tmp:
+            cmd = [
+                sys.executable, __file__, '--mode', mode, '--database', str(Path(tmp) / 'bench.sqlite3'),
+                '--dares', str(args.dares), '--readers', str(args.readers),
+                '--writers', str(args.writers), '--seconds', str(args.seconds),
+            ]
+            out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+
+    for result in results:
+        label = 'tuned' if result['tuned'] else 'default'
+        print(
+            f"{label:>8}: {result['reads_per_sec']:>9} reads/s  {result['writes_per_sec']:>8} writes/s  "
+            f"read p99 {result['read_latency']['p99_ms']} ms  write p99 {result['write_latency']['p99_ms']} ms  "
+            f"errors {result['errors']}"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
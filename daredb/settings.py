@@ -56,7 +56,11 @@ INSTALLED_APPS = [
 SITE_ID = 1
 
 MIDDLEWARE = [
+    'dares.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Static files are answered here, before sessions/auth/allauth run
+    'dares.middleware.AsyncWhiteNoiseMiddleware',
+    'dares.middleware.StreamingGZipMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -64,7 +68,6 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'allauth.account.middleware.AccountMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
 ROOT_URLCONF = 'daredb.urls'
@@ -99,6 +102,110 @@ DATABASES = {
     )
 }
 
+# Opt-in SQLite performance profile for small single-host deployments.
+# Enables WAL so readers no longer block on like/view writes, and serializes
+# counter updates per process (see dares.db).
+#
+# It trades write throughput for reads: benchmarks/sqlite_tuning.py measured
+# about 749 vs 211 reads/s but 86 vs 241 writes/s against the default. Under
+# heavy write contention, transactions opened IMMEDIATE can still exceed the
+# 5 s lock timeout, raising "database is locked" and logging "Batch flush
+# failed" (the batch is retried). Dropping IMMEDIATE does not recover the
+# writes and lets deferred transactions fail on upgrade instead, so it stays;
+# write-heavy sites should leave this off or move to PostgreSQL.
+SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'False').lower() in ('1', 'true', 'yes')
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,
+    'cache_size': -65536,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
+if SQLITE_TUNING and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'timeout': 5,
+        'transaction_mode': 'IMMEDIATE',
+    })
+
+# Use time-ordered (UUIDv7) primary keys for new dares. Existing rows can be
+# converted with `python manage.py rekey_dares`.
+DARE_SEQUENTIAL_IDS = os.getenv('DARE_SEQUENTIAL_IDS', 'False').lower() in ('1', 'true', 'yes')
+
+
+# Cache. The default is per-process; point several workers at a shared
+# backend (e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache,
+# CACHE_LOCATION=redis://127.0.0.1:6379/1) so they share the homepage feed.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'dareora'),
+    }
+}
+
+# Upper bound in seconds on how long dares.caching keeps a built value when
+# the caller gives no timeout of its own.
+CACHE_TTL = int(os.getenv('CACHE_TTL', '300'))
+
+# Shared secret that marks `warm_cache --base-url` requests (sent as
+# X-Warmup-Token) so they are not counted as dare views; set the same value
+# on the site and wherever the command runs.
+WARMUP_TOKEN = os.getenv('WARMUP_TOKEN', '')
+
+# Sessions carry each visitor's like state (dares.likes), so they are read
+# on most page views; serve them from the cache, backed by the database.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Homepage feed (dares.feeds): list length and how long a build is reused
+# before trending is recomputed.
+HOME_FEED_SIZE = 6
+HOME_FEED_TIMEOUT = 300
+
+
+# Server-sent events (dares.events). The in-process broker only reaches
+# clients connected to the same worker; point this at a shared-broker
+# implementation of dares.events.Broker when running several nodes.
+DARES_EVENT_BROKER = os.getenv('DARES_EVENT_BROKER', 'dares.events.InProcessBroker')
+DARES_EVENT_COALESCE_SECONDS = 0.25
+DARES_EVENT_HEARTBEAT_SECONDS = 15
+
+
+# Trending sort (dares.trending). An engagement loses half its weight every
+# TRENDING_HALF_LIFE_HOURS; scores are merged into the database in batches.
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '24'))
+TRENDING_WEIGHTS = {'view': 1.0, 'like': 5.0, 'completion': 10.0}
+TRENDING_BUFFER_SIZE = 500
+TRENDING_BUFFER_SECONDS = 10
+
+# Batched writes (dares.batching: trending, unique viewers, daily series) are
+# flushed from a timer thread. The test runner turns this off so tests flush
+# explicitly.
+BATCH_FLUSH_IN_BACKGROUND = True
+TEST_RUNNER = 'dares.testing.TestRunner'
+
+
+# Per-request instrumentation (dares.middleware.RequestMetricsMiddleware).
+REQUEST_METRICS_SERVER_TIMING = True
+REQUEST_METRICS_SLOW_MS = int(os.getenv('REQUEST_METRICS_SLOW_MS', '1000'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'dares': {
+            'handlers': ['console'],
+            'level': os.getenv('DARES_LOG_LEVEL', 'WARNING'),
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -138,6 +245,26 @@ STATIC_URL = 'static/'
 
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# collectstatic writes content-hashed copies plus .gz/.br siblings, which
+# WhiteNoise serves with a far-future Cache-Control.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'dares.storage.StaticFilesStorage',
+    },
+}
+
+# Without a manifest (no collectstatic yet) {% static %} falls back to plain
+# file names only when this is on; in production a missing manifest must fail
+# loudly rather than serve unhashed files under far-future caching. It also
+# lets `check`/`collectstatic` pass before the icon sprite is built
+# (dares.icons). The test runner turns it on.
+STATIC_MANIFEST_OPTIONAL = DEBUG
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -153,8 +280,6 @@ AUTHENTICATION_BACKENDS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'mediafiles'
 
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
 SOCIALACCOUNT_ADAPTER = 'dares.adapters.CustomSocialAccountAdapter'
 
 SOCIALACCOUNT_AUTO_SIGNUP = True
@@ -0,0 +1,92 @@
+"""
+Per-identity activity: what one email address has submitted, completed
+and liked.
+
+Emails are the only identity keys in the data model. They are stored as
+entered, so lookups here match them ignoring case and surrounding spaces:
+``LOWER()`` of each of ``Dare.email``, ``DareCompletion.completer_email``
+and ``DareLike.user_email`` leads an index, and every lookup is a range
+scan of one person's rows. ``summary`` caches the counts per normalized
+email; saves and deletes of that email's dares, completions and likes drop
+the entry once they commit, and ``ACTIVITY_SUMMARY_TIMEOUT`` bounds
+staleness after bulk writes that send no signals.
+
+The submission quota (``SiteConfiguration.max_dares_per_user``, 0 for no
+limit) counts an email's dares that were not rejected. It is enforced, so
+it always counts in the database rather than trusting the cached summary.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+
+from .caching import get_or_build
+
+DEFAULT_TIMEOUT = 3600
+SUMMARY_KEY = 'dares:activity:{}'
+
+
+def normalize(email):
+    return (email or '').strip().lower()
+
+
+def for_email(queryset, field, email):
+    """Rows of ``queryset`` whose ``field`` is ``email``, ignoring case and surrounding spaces."""
+    return queryset.alias(email_lower=Lower(field)).filter(email_lower=normalize(email))
+
+
+def summary_key(email):
+    return SUMMARY_KEY.format(hashlib.sha1(normalize(email).encode()).hexdigest())
+
+
+def build_summary(email):
+    from .models import Dare, DareCompletion, DareLike
+
+    counts = for_email(Dare.objects, 'email', email).aggregate(
+        submitted=Count('pk'),
+        approved=Count('pk', filter=Q(is_approved=True)),
+        pending=Count('pk', filter=Q(status='pending')),
+        rejected=Count('pk', filter=Q(status='rejected')),
+    )
+    counts['completed'] = for_email(DareCompletion.objects, 'completer_email', email).count()
+    counts['liked'] = for_email(DareLike.objects, 'user_email', email).count()
+    return counts
+
+
+def summary(email):
+    """``{'submitted', 'approved', 'pending', 'rejected', 'completed', 'liked'}`` counts for ``email``."""
+    return get_or_build(
+        summary_key(email), lambda: build_summary(email),
+        getattr(settings, 'ACTIVITY_SUMMARY_TIMEOUT', DEFAULT_TIMEOUT),
+    )
+
+
+def quota_left(email, limit):
+    """Dares ``email`` may still submit under ``limit``; ``None`` when unlimited."""
+    from .models import Dare
+
+    if not limit:
+        return None
+    return max(0, limit - for_email(Dare.objects, 'email', email).exclude(status='rejected').count())
+
+
+def forget(*emails):
+    keys = [summary_key(email) for email in emails if email]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+# Receivers for post_save/post_delete of the models keyed by each email field
+def dare_changed(sender, instance, **kwargs):
+    forget(instance.email)
+
+
+def completion_changed(sender, instance, **kwargs):
+    forget(instance.completer_email)
+
+
+def like_changed(sender, instance, **kwargs):
+    forget(instance.user_email)
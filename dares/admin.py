@@ -1,5 +1,123 @@
-from django.contrib import admin
-from .models import Dare, Category, DifficultyLevel, DareCompletion, DareLike, SiteConfiguration
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Q
+from django.http import StreamingHttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils import timezone
+from . import bulk, conditional, events, feeds, moderation
+from .models import (
+    Dare, Category, DifficultyLevel, DareCompletion, DareLike, ModerationTask, ScreeningTerm, SiteConfiguration,
+)
+
+
+def publish_completion(completion):
+    events.publish(
+        'completion', completion.dare, id=completion.pk, title=completion.dare.title,
+        completer_name=completion.completer_name, completions_count=completion.dare.completions_count,
+    )
+
+class ScreeningFlagFilter(admin.SimpleListFilter):
+    title = 'screening'
+    parameter_name = 'flagged'
+
+    def lookups(self, request, model_admin):
+        return [('yes', 'Flagged'), ('no', 'Clean')]
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.exclude(screening_flags=[])
+        if self.value() == 'no':
+            return queryset.filter(screening_flags=[])
+        return queryset
+
+
+class StreamingExportMixin:
+    """
+    Adds an "Export CSV" button to the changelist that streams the rows
+    matching the current filters, search and date drill-down as gzipped
+    CSV, in the column layout of dares.bulk (so the file can be re-imported).
+    """
+    change_list_template = 'admin/dares/change_list_export.html'
+    export_kind = None
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'export/', self.admin_site.admin_view(self.export_view),
+                name=f'{opts.app_label}_{opts.model_name}_export',
+            ),
+        ] + super().get_urls()
+
+    def export_view(self, request):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        changelist = self.get_changelist_instance(request)
+        lines = bulk.export_lines(self.export_kind, 'csv', queryset=changelist.get_queryset(request))
+        response = StreamingHttpResponse(bulk.gzip_stream(lines), content_type='application/gzip')
+        filename = f'{self.export_kind}-{timezone.now():%Y%m%d-%H%M}.csv.gz'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+class ModerationQueueMixin:
+    """
+    A "Moderation queue" page where each reviewer claims a batch of pending
+    dares (leased for MODERATION_LEASE_SECONDS) and approves or rejects
+    them, without colliding with other reviewers; see dares.moderation.
+    """
+    change_list_template = 'admin/dares/dare/change_list.html'
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'moderation/', self.admin_site.admin_view(self.moderation_view),
+                name=f'{opts.app_label}_{opts.model_name}_moderation',
+            ),
+        ] + super().get_urls()
+
+    def moderation_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        if request.method == 'POST':
+            self.moderation_action(request)
+            return redirect(request.path)
+
+        now = timezone.now()
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Moderation queue',
+            'tasks': moderation.claimed_tasks(request.user),
+            'queued': ModerationTask.objects.count(),
+            'available': moderation.available(now).count(),
+            'lease_minutes': moderation.lease_seconds() // 60,
+        }
+        return TemplateResponse(request, 'admin/dares/moderation_queue.html', context)
+
+    def moderation_action(self, request):
+        action = request.POST.get('action')
+        if action == 'claim':
+            try:
+                count = max(1, min(int(request.POST.get('count', 10)), 50))
+            except ValueError:
+                count = 10
+            claimed = moderation.claim(request.user, count)
+            messages.info(request, f"Claimed {len(claimed)} dare(s).")
+        elif action == 'release':
+            released = moderation.release(request.user)
+            messages.info(request, f"Released {released} dare(s).")
+        elif action in ('approve', 'reject'):
+            status = 'approved' if action == 'approve' else 'rejected'
+            dare = moderation.decide(
+                request.user, request.POST.get('dare'), status, request.POST.get('reason', '').strip(),
+            )
+            if dare is None:
+                messages.warning(request, "Your claim on that dare has expired; claim it again to review it.")
+            else:
+                messages.success(request, f"{dare.title}: {dare.get_status_display().lower()}.")
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
@@ -7,37 +125,72 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ('is_active',)
     search_fields = ('name', 'description')
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _dare_count=Count('dares', filter=Q(dares__is_approved=True))
+        )
+
+    @admin.display(description='Dare count', ordering='_dare_count')
+    def dare_count(self, obj):
+        return obj._dare_count
+
 @admin.register(DifficultyLevel)
 class DifficultyLevelAdmin(admin.ModelAdmin):
     list_display = ('name', 'description', 'color')
     search_fields = ('name',)
 
 @admin.register(Dare)
-class DareAdmin(admin.ModelAdmin):
+class DareAdmin(ModerationQueueMixin, StreamingExportMixin, admin.ModelAdmin):
+    export_kind = 'dares'
     list_display = ('title', 'name', 'college', 'category', 'difficulty', 'status', 'is_featured', 'created_at')
-    list_filter = ('status', 'is_approved', 'is_featured', 'category', 'difficulty', 'created_at')
+    list_filter = ('status', 'is_approved', 'is_featured', ScreeningFlagFilter, 'category', 'difficulty', 'created_at')
     search_fields = ('title', 'name', 'college', 'dare_text')
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
-    readonly_fields = ('views_count', 'likes_count', 'completions_count', 'created_at', 'updated_at', 'approved_at')
+    readonly_fields = (
+        'views_count', 'likes_count', 'completions_count', 'created_at', 'updated_at', 'approved_at',
+        'screening_flags',
+    )
 
 @admin.register(DareCompletion)
-class DareCompletionAdmin(admin.ModelAdmin):
+class DareCompletionAdmin(StreamingExportMixin, admin.ModelAdmin):
+    export_kind = 'completions'
     list_display = ('dare', 'completer_name', 'completed_at', 'is_verified')
-    list_filter = ('is_verified', 'completed_at')
+    list_filter = ('is_verified', ScreeningFlagFilter, 'completed_at')
     search_fields = ('completer_name', 'dare__title')
+    readonly_fields = ('screening_flags',)
     actions = ['verify_completion']
 
     def verify_completion(self, request, queryset):
+        newly_verified = list(queryset.filter(is_verified=False).select_related('dare'))
         queryset.update(is_verified=True)
+        for completion in newly_verified:
+            publish_completion(completion)
+        if newly_verified:
+            feeds.schedule_rebuild()
+            conditional.schedule_bump('completions')
     verify_completion.short_description = "Mark selected completions as verified"
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if obj.is_verified and 'is_verified' in form.changed_data:
+            publish_completion(obj)
+
 @admin.register(DareLike)
-class DareLikeAdmin(admin.ModelAdmin):
+class DareLikeAdmin(StreamingExportMixin, admin.ModelAdmin):
+    export_kind = 'likes'
     list_display = ('dare', 'user_email', 'created_at')
+    list_filter = ('created_at',)
     search_fields = ('user_email', 'dare__title')
 
+@admin.register(ScreeningTerm)
+class ScreeningTermAdmin(admin.ModelAdmin):
+    list_display = ('term', 'whole_word', 'is_active', 'created_at')
+    list_editable = ('whole_word', 'is_active')
+    list_filter = ('is_active', 'whole_word')
+    search_fields = ('term',)
+
 @admin.register(SiteConfiguration)
 class SiteConfigurationAdmin(admin.ModelAdmin):
     list_display = ('site_name', 'allow_submissions', 'require_approval')
\ No newline at end of file
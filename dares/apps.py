@@ -4,3 +4,49 @@ from django.apps import AppConfig
 class DaresConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dares'
+
+    def ready(self):
+        from django.core.checks import Tags, register
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save
+        from . import activity, conditional, feeds, icons, moderation, series, similarity
+        from .db import configure_sqlite
+        from .metrics import install_query_wrapper
+        from .signals import dare_engaged
+        from .trending import record_engagement
+
+        # collectstatic runs the staticfiles checks, so a deploy without the sprite fails
+        register(icons.check_sprite, Tags.staticfiles)
+        connection_created.connect(configure_sqlite, dispatch_uid='dares.configure_sqlite')
+        connection_created.connect(install_query_wrapper, dispatch_uid='dares.install_query_wrapper')
+        dare_engaged.connect(record_engagement, dispatch_uid='dares.trending.record_engagement')
+        dare_engaged.connect(series.record_engagement, dispatch_uid='dares.series.record_engagement')
+        dare_engaged.connect(conditional.engagement_changed, dispatch_uid='dares.conditional.engagement_changed')
+
+        for model in ('Dare', 'Category', 'SiteConfiguration'):
+            for signal in (post_save, post_delete):
+                signal.connect(feeds.schedule_rebuild, sender=self.get_model(model))
+        for signal in (post_save, post_delete):
+            signal.connect(feeds.completion_changed, sender=self.get_model('DareCompletion'))
+        post_save.connect(similarity.dare_saved, sender=self.get_model('Dare'), dispatch_uid='dares.similarity.dare_saved')
+        activity_receivers = {
+            'Dare': activity.dare_changed,
+            'DareCompletion': activity.completion_changed,
+            'DareLike': activity.like_changed,
+        }
+        for model, receiver in activity_receivers.items():
+            for signal in (post_save, post_delete):
+                signal.connect(receiver, sender=self.get_model(model), dispatch_uid=f'dares.activity.{model}')
+        post_save.connect(moderation.dare_saved, sender=self.get_model('Dare'), dispatch_uid='dares.moderation.dare_saved')
+
+        # Content versions behind the public pages' ETags
+        bumpers = {
+            'Dare': conditional.version_bumper('dares'),
+            'Category': conditional.version_bumper('dares'),
+            'DareCompletion': conditional.version_bumper('completions'),
+            # Rebuilds the screening automaton in every process
+            'ScreeningTerm': conditional.version_bumper('screening'),
+        }
+        for model, receiver in bumpers.items():
+            for signal in (post_save, post_delete):
+                signal.connect(receiver, sender=self.get_model(model), weak=False)
@@ -0,0 +1,104 @@
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class BatchBuffer:
+    """
+    Accumulates values per key in memory and hands them to ``flush`` in one
+    batch once ``max_items`` keys are pending or the oldest pending value is
+    ``max_age`` seconds old. ``combine(old, new)`` merges two values for the
+    same key. Anything still pending is flushed when the process exits.
+
+    Flushes due from ``add`` run on a timer thread, never in the request that
+    happened to cross a threshold (or inside its transaction), and the timer
+    started by the first pending value flushes an idle buffer on time. A
+    batch whose flush fails is merged back and retried. ``flush()`` itself
+    runs synchronously, for commands and tests; with
+    ``BATCH_FLUSH_IN_BACKGROUND`` off nothing is flushed until it is called.
+    """
+
+    def __init__(self, flush, combine, max_items=500, max_age=5.0):
+        self._flush = flush
+        self._combine = combine
+        self.max_items = max_items
+        self.max_age = max_age
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        atexit.register(self._flush_at_exit)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def add(self, key, value):
+        with self._lock:
+            if key in self._pending:
+                self._pending[key] = self._combine(self._pending[key], value)
+            else:
+                self._pending[key] = value
+            self._schedule(0 if len(self._pending) >= self.max_items else self.max_age)
+
+    def _schedule(self, delay):
+        # Called with _lock held
+        if not getattr(settings, 'BATCH_FLUSH_IN_BACKGROUND', True):
+            return
+        if self._timer is not None:
+            if delay or self._timer.interval == 0:
+                return
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._background_flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _after_fork(self):
+        # Threads do not survive fork (gunicorn's preloaded master)
+        self._lock, self._flush_lock, self._timer = threading.Lock(), threading.Lock(), None
+        if self._pending:
+            with self._lock:
+                self._schedule(self.max_age)
+
+    def _background_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.warning("Batch flush failed; %d key(s) queued for retry", len(self), exc_info=True)
+        finally:
+            # The timer thread's connections would otherwise stay open
+            connections.close_all()
+
+    def _flush_at_exit(self):
+        if getattr(settings, 'BATCH_FLUSH_IN_BACKGROUND', True):
+            self.flush()
+
+    def drain(self):
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        return batch
+
+    def _requeue(self, batch):
+        with self._lock:
+            for key, value in batch.items():
+                self._pending[key] = self._combine(value, self._pending[key]) if key in self._pending else value
+            self._schedule(self.max_age)
+
+    def flush(self):
+        with self._flush_lock:
+            batch = self.drain()
+            if batch:
+                try:
+                    self._flush(batch)
+                except BaseException:
+                    self._requeue(batch)
+                    raise
+            return len(batch)
+
+    def __len__(self):
+        return len(self._pending)
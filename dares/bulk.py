@@ -0,0 +1,420 @@
+"""
+Streaming CSV / JSON Lines import and export of dares, completions and likes.
+
+Export reads ``values_list`` rows through ``iterator(chunk_size=...)`` and
+yields one encoded line at a time, so memory stays flat however many rows
+are written. CSV cells that a spreadsheet would run as a formula are
+prefixed with an apostrophe, which import strips again. Related rows refer to their dare by slug, which keeps files
+portable between databases.
+
+Import works a batch at a time: field values are converted and validated
+in Python, then categories, difficulty levels, dare slugs and existing
+rows are resolved with one query per batch each, and the survivors are
+written with a single ``bulk_create``. Rows whose slug (or, for likes and
+completions, whose dare/email pair) already exists are skipped, so
+re-running an import is harmless. Counters are taken from the file as-is;
+imported dares and completions are screened into ``screening_flags`` and
+pending dares join the moderation queue.
+"""
+import csv
+import json
+import zlib
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from . import conditional, feeds, moderation, screening
+from .models import Category, Dare, DareCompletion, DareLike, DifficultyLevel
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+# Column -> lookup used for export; import maps the same columns back.
+KINDS = {
+    'dares': (Dare, {
+        'slug': 'slug',
+        'title': 'title',
+        'name': 'name',
+        'email': 'email',
+        'phone_number': 'phone_number',
+        'college': 'college',
+        'dare_text': 'dare_text',
+        'category': 'category__name',
+        'difficulty': 'difficulty__name',
+        'estimated_time': 'estimated_time',
+        'required_items': 'required_items',
+        'safety_notes': 'safety_notes',
+        'status': 'status',
+        'rejection_reason': 'rejection_reason',
+        'views_count': 'views_count',
+        'likes_count': 'likes_count',
+        'completions_count': 'completions_count',
+        'created_at': 'created_at',
+        'approved_at': 'approved_at',
+    }),
+    'completions': (DareCompletion, {
+        'dare': 'dare__slug',
+        'completer_name': 'completer_name',
+        'completer_email': 'completer_email',
+        'completion_proof': 'completion_proof',
+        'completion_image': 'completion_image',
+        'is_verified': 'is_verified',
+        'completed_at': 'completed_at',
+    }),
+    'likes': (DareLike, {
+        'dare': 'dare__slug',
+        'user_email': 'user_email',
+        'created_at': 'created_at',
+    }),
+}
+
+
+def get_kind(kind):
+    try:
+        return KINDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown kind {kind!r}; expected one of {', '.join(KINDS)}") from None
+
+
+def create_keeping_timestamps(model, rows, batch_size=None):
+    """
+    ``bulk_create`` that keeps the rows' own ``auto_now``/``auto_now_add``
+    values (rows without one get the current time). bulk_create overwrites
+    them, so they are written back with a ``bulk_update`` of the inserted
+    rows; the model fields are left as they are, so requests saving in other
+    threads still get their automatic timestamps.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) or getattr(field, 'auto_now', False)
+    ]
+    given = [[getattr(row, field.attname) for field in fields] for row in rows]
+    model.objects.bulk_create(rows, batch_size=batch_size)
+    restored = []
+    for row, values in zip(rows, given):
+        if any(value is not None for value in values):
+            for field, value in zip(fields, values):
+                if value is not None:
+                    setattr(row, field.attname, value)
+            restored.append(row)
+    if restored:
+        model.objects.bulk_update(restored, [field.name for field in fields], batch_size=batch_size)
+    return rows
+
+
+# --- Export -----------------------------------------------------------------
+
+class Echo:
+    """File-like object whose ``write`` returns the data, for ``csv.writer``."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(kind, queryset=None, chunk_size=2000):
+    """``(header, rows)`` for ``kind``; ``rows`` is a lazy iterator of tuples."""
+    model, columns = get_kind(kind)
+    if queryset is None:
+        queryset = model.objects.all()
+    rows = queryset.order_by('pk').values_list(*columns.values()).iterator(chunk_size=chunk_size)
+    return list(columns), rows
+
+
+def serialize(value):
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+# Spreadsheets evaluate cells starting with these as formulas. A leading
+# apostrophe makes them text; apostrophes are escaped too, so import can
+# strip exactly one and get the original value back.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r', "'")
+
+
+def escape_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_cell(value):
+    if isinstance(value, str) and value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def csv_lines(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(['' if value is None else escape_cell(serialize(value)) for value in row])
+
+
+def jsonl_lines(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, map(serialize, row))), ensure_ascii=False) + '\n'
+
+
+def export_lines(kind, fmt='csv', queryset=None, chunk_size=2000):
+    """Lazily encoded lines of a ``kind`` export in ``fmt`` ('csv' or 'jsonl')."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    header, rows = export_rows(kind, queryset, chunk_size)
+    return csv_lines(header, rows) if fmt == 'csv' else jsonl_lines(header, rows)
+
+
+def gzip_stream(lines, level=6, buffer_size=64 * 1024):
+    """
+    Gzip-compress an iterable of text lines incrementally, yielding a
+    compressed chunk roughly every ``buffer_size`` bytes of input.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    pending, size = [], 0
+    for line in lines:
+        data = line.encode('utf-8')
+        pending.append(data)
+        size += len(data)
+        if size >= buffer_size:
+            chunk = compressor.compress(b''.join(pending))
+            pending, size = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b''.join(pending)) + compressor.flush()
+
+
+# --- Import -----------------------------------------------------------------
+
+def read_records(lines, fmt='csv'):
+    """Yield ``(line_number, dict)`` from an iterable of text lines."""
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, {key: unescape_cell(value) for key, value in record.items()}
+    elif fmt == 'jsonl':
+        for number, line in enumerate(lines, 1):
+            if line.strip():
+                yield number, json.loads(line)
+    else:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.errors.append((line, message))
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'skipped': self.skipped,
+            'errors': [{'line': line, 'error': message} for line, message in self.errors],
+        }
+
+
+def convert(model, record, exclude=()):
+    """Model field values from a record's strings, as ``to_python`` sees them."""
+    values = {}
+    for field in model._meta.concrete_fields:
+        if field.name in exclude or field.name not in record:
+            continue
+        value = record[field.name]
+        if value is None or value == '':
+            if field.null:
+                values[field.name] = None
+            elif field.empty_strings_allowed:
+                values[field.name] = ''
+            # otherwise leave it to the field default
+            continue
+        values[field.name] = field.to_python(value)
+    return values
+
+
+def validated(model, line, values, result, exclude=()):
+    instance = model(**values)
+    try:
+        instance.full_clean(exclude=exclude, validate_unique=False, validate_constraints=False)
+    except ValidationError as error:
+        result.error(line, '; '.join(
+            f'{field}: {" ".join(messages)}' for field, messages in error.message_dict.items()
+        ))
+        return None
+    return instance
+
+
+def normalize_status(dare, now):
+    # Mirrors Dare.save, which bulk_create bypasses
+    if dare.status in ('approved', 'featured'):
+        dare.is_approved = True
+        dare.is_featured = dare.status == 'featured'
+        dare.approved_at = dare.approved_at or now
+    else:
+        dare.is_approved = dare.is_featured = False
+    dare.updated_at = now
+    dare.created_at = dare.created_at or now
+
+
+def assign_slugs(dares, taken):
+    """
+    Give each dare without a slug a unique one, probing suffixes for every
+    colliding title in the batch with one query per round.
+    """
+    pending = []
+    for dare in dares:
+        base = slugify(dare.title)[:45] or 'dare'
+        pending.append((dare, base))
+    counter = 0
+    while pending:
+        candidates = {dare: base if counter == 0 else f'{base}-{counter}' for dare, base in pending}
+        in_use = set(Dare.objects.filter(slug__in=candidates.values()).values_list('slug', flat=True)) | taken
+        unresolved = []
+        for dare, base in pending:
+            slug = candidates[dare]
+            if slug in in_use:
+                unresolved.append((dare, base))
+            else:
+                dare.slug = slug
+                in_use.add(slug)
+                taken.add(slug)
+        pending = unresolved
+        counter += 1
+
+
+def import_dares(batch, result, state):
+    lookups = state.setdefault('lookups', {
+        'category': {c.name: c for c in Category.objects.all()},
+        'difficulty': {d.name: d for d in DifficultyLevel.objects.all()},
+    })
+    taken = state.setdefault('slugs', set())
+    now = timezone.now()
+    automaton = screening.get_automaton()
+
+    dares = []
+    for line, record in batch:
+        try:
+            values = convert(Dare, record, exclude=('category', 'difficulty'))
+        except ValidationError as error:
+            result.error(line, ' '.join(error.messages))
+            continue
+        related = {}
+        for name in ('category', 'difficulty'):
+            related[name] = lookups[name].get(record.get(name))
+            if related[name] is None:
+                result.error(line, f'{name}: unknown {name} {record.get(name)!r}')
+        if None in related.values():
+            continue
+        # The foreign keys are already resolved; validating them would query per row
+        exclude = ('category', 'difficulty') if values.get('slug') else ('slug', 'category', 'difficulty')
+        dare = validated(Dare, line, {**values, **related}, result, exclude=exclude)
+        if dare is not None:
+            normalize_status(dare, now)
+            dare.screening_flags = screening.flags_for(dare, screening.DARE_FIELDS, automaton)
+            dares.append(dare)
+
+    given = [dare for dare in dares if dare.slug]
+    existing = set(
+        Dare.objects.filter(slug__in=[dare.slug for dare in given]).values_list('slug', flat=True)
+    ) | taken
+    fresh = []
+    for dare in given:
+        if dare.slug in existing:
+            result.skipped += 1
+        else:
+            existing.add(dare.slug)
+            taken.add(dare.slug)
+            fresh.append(dare)
+    unnamed = [dare for dare in dares if not dare.slug]
+    assign_slugs(unnamed, taken)
+    return Dare, fresh + unnamed
+
+
+def import_related(model, email_field, screened_fields=()):
+    """
+    Importer for completions or likes, unique on ``(dare, email_field)``;
+    ``screened_fields`` are screened into ``screening_flags``.
+    """
+
+    def importer(batch, result, state):
+        slugs = {record.get('dare') for _, record in batch}
+        dare_ids = dict(Dare.objects.filter(slug__in=slugs).values_list('slug', 'pk'))
+        automaton = screening.get_automaton() if screened_fields else None
+
+        rows = []
+        for line, record in batch:
+            dare_id = dare_ids.get(record.get('dare'))
+            if dare_id is None:
+                result.error(line, f"dare: unknown dare {record.get('dare')!r}")
+                continue
+            try:
+                values = convert(model, record, exclude=('dare',))
+            except ValidationError as error:
+                result.error(line, ' '.join(error.messages))
+                continue
+            row = validated(model, line, {**values, 'dare_id': dare_id}, result, exclude=('dare',))
+            if row is not None:
+                if screened_fields:
+                    row.screening_flags = screening.flags_for(row, screened_fields, automaton)
+                rows.append(row)
+
+        existing = set(model.objects.filter(
+            dare_id__in={row.dare_id for row in rows},
+            **{f'{email_field}__in': {getattr(row, email_field) for row in rows}},
+        ).values_list('dare_id', email_field))
+        fresh = []
+        for row in rows:
+            key = (row.dare_id, getattr(row, email_field))
+            if key in existing:
+                result.skipped += 1
+            else:
+                existing.add(key)
+                fresh.append(row)
+        return model, fresh
+
+    return importer
+
+
+IMPORTERS = {
+    'dares': import_dares,
+    'completions': import_related(DareCompletion, 'completer_email', screening.COMPLETION_FIELDS),
+    'likes': import_related(DareLike, 'user_email'),
+}
+
+
+def import_records(kind, records, batch_size=2000, progress=None):
+    """
+    Import ``(line_number, dict)`` records of ``kind`` in batches of
+    ``batch_size``, one transaction per batch. Returns an ``ImportResult``.
+    """
+    get_kind(kind)
+    importer = IMPORTERS[kind]
+    result, state = ImportResult(), {}
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        with transaction.atomic():
+            model, rows = importer(batch, result, state)
+            create_keeping_timestamps(model, rows, batch_size)
+            if model is Dare:
+                moderation.enqueue([dare for dare in rows if dare.status == 'pending'])
+        result.created += len(rows)
+        if progress:
+            progress(result)
+
+    if result.created:
+        # bulk_create sends no signals; refresh what the save hooks would have
+        feeds.schedule_rebuild()
+        conditional.schedule_bump('dares', 'completions', 'engagement')
+    return result
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+_MISSING = object()
+DEFAULT_TTL = 300
+
+
+def default_ttl():
+    return getattr(settings, 'CACHE_TTL', DEFAULT_TTL)
+
+
+def get_or_build(key, builder, timeout=None):
+    """
+    Return the cached value for ``key``, building and storing it on a miss.
+    Hits and misses are recorded in the per-request metrics. Entries always
+    expire: ``timeout`` defaults to ``CACHE_TTL`` seconds, because with a
+    per-process cache an invalidation only reaches the worker that made it.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        metrics.record_cache(hit=True)
+        return value
+    metrics.record_cache(hit=False)
+    value = builder()
+    cache.set(key, value, default_ttl() if timeout is None else timeout)
+    return value
+
+
+async def aget_or_build(key, builder, timeout=None):
+    """Async ``get_or_build``; ``builder`` is a coroutine function."""
+    value = await cache.aget(key, _MISSING)
+    if value is not _MISSING:
+        metrics.record_cache(hit=True)
+        return value
+    metrics.record_cache(hit=False)
+    value = await builder()
+    await cache.aset(key, value, default_ttl() if timeout is None else timeout)
+    return value
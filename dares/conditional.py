@@ -0,0 +1,216 @@
+"""
+Conditional GET and shared-cache headers for the public pages.
+
+Each view supplies cheap validators (a version string and a last-modified
+time) through ``get_validators``; ``CachePolicyMixin`` answers
+``If-None-Match`` / ``If-Modified-Since`` from them before the view does
+any real work, and stamps ``ETag``, ``Last-Modified`` and ``Cache-Control``
+on full responses according to the view's ``cache_*`` attributes.
+
+Content versions are tokens stored in ``ContentVersion`` rows and replaced
+by model signals once the change commits. A list page validates with one
+primary-key lookup instead of its real queries, and every worker sees a
+bump at once, which a process-local cache could not guarantee.
+"""
+import hashlib
+import uuid
+
+from django.contrib import messages
+from django.db import transaction
+from django.template.response import SimpleTemplateResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+def new_version():
+    return uuid.uuid4().hex[:12], timezone.now().replace(microsecond=0)
+
+
+def content_versions(*names):
+    """
+    Combined ``(token, changed_at)`` of several content areas, read in one
+    query; areas seen for the first time are created.
+    """
+    from .models import ContentVersion
+
+    versions = {
+        name: (token, changed_at)
+        for name, token, changed_at in ContentVersion.objects.filter(name__in=names).values_list(
+            'name', 'token', 'changed_at',
+        )
+    }
+    missing = [name for name in names if name not in versions]
+    if missing:
+        token, changed_at = new_version()
+        ContentVersion.objects.bulk_create(
+            [ContentVersion(name=name, token=token, changed_at=changed_at) for name in missing],
+            ignore_conflicts=True,
+        )
+        versions.update(
+            (name, (token, changed_at))
+            for name, token, changed_at in ContentVersion.objects.filter(name__in=missing).values_list(
+                'name', 'token', 'changed_at',
+            )
+        )
+    return '-'.join(versions[name][0] for name in names), max(versions[name][1] for name in names)
+
+
+def content_version(name):
+    """``(token, changed_at)`` for a named content area, created on first use."""
+    return content_versions(name)
+
+
+def bump_version(name):
+    from .models import ContentVersion
+
+    token, changed_at = new_version()
+    if not ContentVersion.objects.filter(name=name).update(token=token, changed_at=changed_at):
+        ContentVersion.objects.bulk_create(
+            [ContentVersion(name=name, token=token, changed_at=changed_at)], ignore_conflicts=True,
+        )
+
+
+def schedule_bump(*names):
+    """
+    Bump ``names`` once the current transaction commits, so no request can
+    pair the new version with the old data.
+    """
+    transaction.on_commit(lambda: [bump_version(name) for name in names])
+
+
+def version_bumper(*names):
+    """Signal receiver factory that bumps ``names`` on any save or delete."""
+    def receiver(sender, **kwargs):
+        schedule_bump(*names)
+    return receiver
+
+
+def engagement_changed(sender, dare, kind, **kwargs):
+    # Views are too frequent to invalidate on; pages show them as of the
+    # last other change.
+    if kind != 'view':
+        schedule_bump('engagement')
+
+
+def make_etag(request, version, per_user=True):
+    # Authenticated pages differ per user (navigation, ownership), so is the tag
+    owner = 'anon'
+    if per_user:
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            owner = user.pk
+    return quote_etag(hashlib.sha1(f'{version}|{owner}'.encode()).hexdigest()[:20])
+
+
+def has_pending_messages(request):
+    return bool(len(messages.get_messages(request)))
+
+
+def is_personal(request, response):
+    """
+    Whether ``response`` must not be stored by shared caches: it was made
+    for a logged-in user, sets a cookie, or embeds a CSRF token.
+    """
+    user = getattr(request, 'user', None)
+    return bool(
+        (user is not None and user.is_authenticated)
+        or response.cookies
+        or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    )
+
+
+def apply_cache_policy(response, request, max_age=0, s_maxage=None, stale_while_revalidate=None, personal=False):
+    """
+    Anonymous responses may be stored by shared caches for ``s_maxage``
+    seconds and served stale while they revalidate; personal ones are
+    marked private and must be revalidated.
+    """
+    if personal or is_personal(request, response):
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        return response
+    directives = {'public': True, 'max_age': max_age}
+    if s_maxage is not None:
+        directives['s_maxage'] = s_maxage
+    if stale_while_revalidate is not None:
+        directives['stale_while_revalidate'] = stale_while_revalidate
+    patch_cache_control(response, **directives)
+    return response
+
+
+def conditional(request, version, last_modified=None, per_user=True):
+    """
+    Return ``(not_modified_response_or_None, headers)`` for the given
+    validators; ``headers`` should be set on the eventual full response.
+    """
+    headers = {}
+    if version is not None:
+        headers['ETag'] = make_etag(request, version, per_user)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    if timestamp is not None:
+        headers['Last-Modified'] = http_date(timestamp)
+    if not headers:
+        return None, {}
+    response = get_conditional_response(request, etag=headers.get('ETag'), last_modified=timestamp)
+    if response is not None:
+        for header, value in headers.items():
+            response[header] = value
+    return response, headers
+
+
+class CachePolicyMixin:
+    """
+    Conditional GET plus ``Cache-Control`` for a class-based view.
+
+    Override ``get_validators`` to return ``(version, last_modified)``
+    without rendering anything, and set ``cache_max_age`` (browser),
+    ``cache_s_maxage`` (shared caches) and ``cache_stale_while_revalidate``
+    per view. ``not_modified`` is called when a 304 is sent, and
+    ``get_personal_token`` names per-visitor state the page shows: a
+    non-empty token joins the ETag and makes the response private.
+    """
+    cache_max_age = 0
+    cache_s_maxage = 60
+    cache_stale_while_revalidate = 300
+
+    def get_validators(self):
+        return None, None
+
+    def get_personal_token(self):
+        return ''
+
+    def not_modified(self, response):
+        pass
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+
+        # Flash messages are consumed while rendering, so look before that
+        pending_messages = has_pending_messages(request)
+        validators = self.get_validators()
+        personal_token = self.get_personal_token()
+        if personal_token and validators[0] is not None:
+            validators = (f'{validators[0]}|{personal_token}', *validators[1:])
+        response, headers = None, {}
+        if not pending_messages:
+            response, headers = conditional(request, *validators)
+        if response is not None:
+            self.not_modified(response)
+        else:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                for header, value in headers.items():
+                    response[header] = value
+
+        policy = {
+            'max_age': self.cache_max_age,
+            's_maxage': self.cache_s_maxage,
+            'stale_while_revalidate': self.cache_stale_while_revalidate,
+            'personal': pending_messages or bool(personal_token),
+        }
+        if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+            # Rendering may ask for a CSRF token, so decide after it.
+            response.add_post_render_callback(lambda rendered: apply_cache_policy(rendered, request, **policy))
+        else:
+            apply_cache_policy(response, request, **policy)
+        return response
@@ -0,0 +1,150 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+def sqlite_tuning_enabled(connection):
+    return connection.vendor == 'sqlite' and getattr(settings, 'SQLITE_TUNING', False)
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply ``SQLITE_PRAGMAS`` to every new SQLite connection when tuning is on."""
+    if not sqlite_tuning_enabled(connection):
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+
+
+class CounterWriteQueue:
+    """
+    Serializes counter updates within a process.
+
+    Callers enqueue their delta and then compete for the single writer slot.
+    Whoever holds it drains every pending delta in one transaction, so under
+    load many increments share one write lock acquisition on SQLite instead of
+    each request fighting for it (and hitting ``database is locked``).
+
+    The drain never runs inside a caller's transaction: a delta submitted
+    there is queued when that transaction commits (and dropped with it on
+    rollback), so one request's rollback cannot take other requests'
+    increments with it. A batch that fails to write is put back and retried
+    by the next drain.
+    """
+
+    def __init__(self):
+        self._pending = defaultdict(int)
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def submit(self, model, pk, field, delta):
+        connection = connections[router.db_for_write(model)]
+        if connection.in_atomic_block:
+            transaction.on_commit(lambda: self._enqueue(model, pk, field, delta), using=connection.alias)
+        else:
+            self._enqueue(model, pk, field, delta)
+
+    def _enqueue(self, model, pk, field, delta):
+        with self._pending_lock:
+            self._pending[(model, pk, field)] += delta
+        self.drain()
+
+    def drain(self):
+        with self._write_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, defaultdict(int)
+            if not batch:
+                return
+            try:
+                self._apply(batch)
+            except DatabaseError:
+                self._requeue(batch)
+                logger.warning("Counter batch of %d update(s) failed; queued for retry", len(batch), exc_info=True)
+
+    def _requeue(self, batch):
+        with self._pending_lock:
+            for key, delta in batch.items():
+                self._pending[key] += delta
+
+    def _apply(self, batch):
+        with transaction.atomic():
+            for (model, pk, field), delta in batch.items():
+                if delta:
+                    model.objects.filter(pk=pk).update(**{field: F(field) + delta})
+
+
+counter_queue = CounterWriteQueue()
+
+
+def increment_counter(instance, field, delta=1):
+    """Atomically add ``delta`` to a counter column and mirror it on ``instance``."""
+    model = type(instance)
+    if sqlite_tuning_enabled(connections[router.db_for_write(model)]):
+        counter_queue.submit(model, instance.pk, field, delta)
+    else:
+        model.objects.filter(pk=instance.pk).update(**{field: F(field) + delta})
+    setattr(instance, field, getattr(instance, field) + delta)
+
+
+async def aincrement_counter(instance, field, delta=1):
+    """Async counterpart of ``increment_counter``."""
+    model = type(instance)
+    if sqlite_tuning_enabled(connections[router.db_for_write(model)]):
+        await sync_to_async(counter_queue.submit)(model, instance.pk, field, delta)
+    else:
+        await model.objects.filter(pk=instance.pk).aupdate(**{field: F(field) + delta})
+    setattr(instance, field, getattr(instance, field) + delta)
+
+
+_uuid7_lock = threading.Lock()
+_uuid7_last = (0, 0)
+
+
+def uuid7(timestamp_ms=None):
+    """
+    Time-ordered UUID (RFC 9562 version 7).
+
+    The top 48 bits are the Unix time in milliseconds, so new ids land at the
+    right-hand edge of the primary key B-tree instead of at a random leaf. The
+    12-bit ``rand_a`` field is used as a counter within the same millisecond
+    to keep ids generated by this process strictly increasing.
+    """
+    global _uuid7_last
+    if timestamp_ms is None:
+        with _uuid7_lock:
+            timestamp_ms = time.time_ns() // 1_000_000
+            last_ms, counter = _uuid7_last
+            if timestamp_ms <= last_ms:
+                timestamp_ms, counter = last_ms, counter + 1
+                if counter > 0xFFF:
+                    timestamp_ms, counter = last_ms + 1, 0
+            else:
+                counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+            _uuid7_last = (timestamp_ms, counter)
+    else:
+        counter = int.from_bytes(os.urandom(2), 'big') & 0xFFF
+
+    rand_b = int.from_bytes(os.urandom(8), 'big') & 0x3FFFFFFFFFFFFFFF
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76
+    value |= counter << 64
+    value |= 0x2 << 62
+    value |= rand_b
+    return uuid.UUID(int=value)
+
+
+def new_dare_id():
+    """Primary key default for ``Dare``; see ``DARE_SEQUENTIAL_IDS``."""
+    if getattr(settings, 'DARE_SEQUENTIAL_IDS', False):
+        return uuid7()
+    return uuid.uuid4()
@@ -0,0 +1,186 @@
+"""
+Server-sent events for live counters and the community wall.
+
+Events are small dicts such as ``{'type': 'like', 'dare': slug,
+'likes_count': 12}``. They are published through the broker named in
+``DARES_EVENT_BROKER`` once the surrounding transaction commits, and
+streamed to browsers by ``EventStreamView`` when the site runs under ASGI
+(under WSGI the view answers 204 and pages simply show no live updates).
+
+Events carry absolute values rather than increments, so only the latest
+event per ``(type, dare)`` matters. The broker buffers events for
+``DARES_EVENT_COALESCE_SECONDS`` and then fans out one batch, and each
+subscriber coalesces again while it is busy writing. A dare liked a
+thousand times a second therefore costs one message per window per client.
+"""
+import asyncio
+import json
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+def event_key(event):
+    return event['type'], event.get('dare')
+
+
+class Subscription:
+    """
+    One connected client. ``deliver`` may be called from any thread; the
+    events are handed to the subscriber's event loop and merged into a dict
+    keyed by ``event_key``, so a slow client holds at most one pending event
+    per key.
+    """
+
+    def __init__(self, broker, dares=None, types=None):
+        self.broker = broker
+        self.dares = set(dares or ())
+        self.types = set(types or ())
+        self.loop = asyncio.get_running_loop()
+        self._pending = {}
+        self._ready = asyncio.Event()
+
+    def wants(self, event):
+        if self.types and event['type'] not in self.types:
+            return False
+        return not self.dares or event.get('dare') in self.dares
+
+    def deliver(self, events):
+        events = [event for event in events if self.wants(event)]
+        if events:
+            try:
+                self.loop.call_soon_threadsafe(self._merge, events)
+            except RuntimeError:
+                # The stream's event loop has shut down.
+                self.close()
+
+    def _merge(self, events):
+        for event in events:
+            key = event_key(event)
+            self._pending.pop(key, None)
+            self._pending[key] = event
+        self._ready.set()
+
+    async def get(self, timeout=None):
+        """Wait up to ``timeout`` seconds and return the pending events (possibly none)."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        events, self._pending = list(self._pending.values()), {}
+        return events
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker(ABC):
+    """
+    Interface for event brokers. ``publish`` is called from request threads
+    after commit; ``subscribe`` from the event loop serving a stream. A
+    multi-node deployment implements these on top of a shared pub/sub (and
+    calls ``Subscription.deliver`` for messages it receives).
+    """
+
+    @abstractmethod
+    def publish(self, event):
+        """Queue ``event`` for every interested subscriber."""
+
+    @abstractmethod
+    def subscribe(self, dares=None, types=None):
+        """Return a ``Subscription`` for the calling event loop."""
+
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        """Stop delivering to ``subscription``."""
+
+
+class InProcessBroker(Broker):
+    """Fans events out to the subscribers of this process only."""
+
+    def __init__(self, window=None):
+        if window is None:
+            window = getattr(settings, 'DARES_EVENT_COALESCE_SECONDS', 0.25)
+        self.window = window
+        self.subscribers = set()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def publish(self, event):
+        key = event_key(event)
+        with self._lock:
+            self._pending.pop(key, None)
+            self._pending[key] = event
+            if self.window > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def flush(self):
+        with self._lock:
+            events, self._pending = list(self._pending.values()), {}
+            self._timer = None
+            subscribers = list(self.subscribers)
+        if events:
+            for subscription in subscribers:
+                subscription.deliver(events)
+
+    def subscribe(self, dares=None, types=None):
+        subscription = Subscription(self, dares, types)
+        with self._lock:
+            self.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self.subscribers.discard(subscription)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    return import_string(getattr(settings, 'DARES_EVENT_BROKER', 'dares.events.InProcessBroker'))()
+
+
+def publish(event_type, dare, **data):
+    """Broadcast an event about ``dare`` once the current transaction commits."""
+    event = {'type': event_type, 'dare': dare.slug, **data}
+    transaction.on_commit(lambda: get_broker().publish(event))
+
+
+async def apublish(event_type, dare, **data):
+    """``publish`` for async views, which always run in autocommit mode."""
+    get_broker().publish({'type': event_type, 'dare': dare.slug, **data})
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def stream(dares=None, types=None, heartbeat=None):
+    """
+    Async iterator of SSE frames. The subscription is opened on first
+    iteration and closed when the client goes away. Only served under ASGI:
+    Django buffers async iterators completely under WSGI.
+    """
+    if heartbeat is None:
+        heartbeat = getattr(settings, 'DARES_EVENT_HEARTBEAT_SECONDS', 15)
+    subscription = get_broker().subscribe(dares, types)
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            events = await subscription.get(timeout=heartbeat)
+            if not events:
+                yield ': keepalive\n\n'
+            for event in events:
+                yield format_event(event)
+    finally:
+        subscription.close()
@@ -0,0 +1,105 @@
+"""
+Precomputed homepage feed.
+
+The featured, trending and recently completed lists (plus per-category
+counts for the hero) are assembled into plain dicts and stored in the cache
+under ``HOME_FEED_KEY``, so a warm homepage renders without touching the
+database. The feed is rebuilt after any change to dares, completions,
+categories or the site configuration is committed, and otherwise expires
+after ``HOME_FEED_TIMEOUT`` seconds so trending stays fresh.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .caching import get_or_build
+
+HOME_FEED_KEY = 'dares:home-feed'
+
+
+def feed_size():
+    return getattr(settings, 'HOME_FEED_SIZE', 6)
+
+
+def feed_timeout():
+    return getattr(settings, 'HOME_FEED_TIMEOUT', 300)
+
+
+def dare_card(dare):
+    return {
+        'title': dare.title,
+        'url': dare.get_absolute_url(),
+        'excerpt': dare.dare_text[:160],
+        'category': str(dare.category),
+        'category_color': dare.category.color,
+        'difficulty': str(dare.difficulty),
+        'likes_count': dare.likes_count,
+        'completions_count': dare.completions_count,
+    }
+
+
+def build_home_feed():
+    from .models import Category, Dare, DareCompletion, SiteConfiguration, TrendingScore
+
+    size = feed_size()
+    featured = Dare.objects.filter(is_approved=True, is_featured=True).select_related(
+        'category', 'difficulty'
+    ).order_by('-created_at')[:SiteConfiguration.get_config().featured_dares_count]
+    trending = TrendingScore.objects.filter(dare__is_approved=True).select_related(
+        'dare__category', 'dare__difficulty'
+    ).order_by('-score')[:size]
+    completions = DareCompletion.objects.filter(is_verified=True).select_related('dare').order_by(
+        '-completed_at'
+    )[:size]
+
+    feed = {
+        'featured': [dare_card(dare) for dare in featured],
+        'trending': [dare_card(row.dare) for row in trending],
+        'recent_completions': [
+            {
+                'completer_name': completion.completer_name,
+                'title': completion.dare.title,
+                'url': completion.dare.get_absolute_url(),
+                'completed_at': completion.completed_at,
+            }
+            for completion in completions
+        ],
+        'categories': dict(Category.objects.filter(is_active=True).annotate(
+            approved_dares=Count('dares', filter=Q(dares__is_approved=True))
+        ).values_list('name', 'approved_dares')),
+    }
+    feed['version'] = hashlib.sha1(
+        json.dumps(feed, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+    feed['generated_at'] = timezone.now().replace(microsecond=0)
+    return feed
+
+
+def get_home_feed():
+    return get_or_build(HOME_FEED_KEY, build_home_feed, feed_timeout())
+
+
+def rebuild_home_feed():
+    feed = build_home_feed()
+    previous = cache.get(HOME_FEED_KEY)
+    if previous and previous['version'] == feed['version']:
+        # Nothing visible changed; keep Last-Modified stable for conditional GETs.
+        feed['generated_at'] = previous['generated_at']
+    cache.set(HOME_FEED_KEY, feed, feed_timeout())
+    return feed
+
+
+def schedule_rebuild(sender=None, **kwargs):
+    """Signal receiver: rebuild the feed once the current transaction commits."""
+    transaction.on_commit(rebuild_home_feed)
+
+
+def completion_changed(sender, instance, **kwargs):
+    # Unverified submissions never appear on the homepage.
+    if instance.is_verified:
+        schedule_rebuild()
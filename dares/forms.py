@@ -1,9 +1,26 @@
 from django import forms
 from django.core.exceptions import ValidationError
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
+from django.db.models import Value
+from django.db.models.functions import Lower
+from . import activity, screening, similarity
 from .models import Dare, Category, DifficultyLevel, DareCompletion, DareLike
 
-class DareForm(forms.ModelForm):
+class ScreenedFormMixin:
+    """Rejects text fields containing an active ScreeningTerm; see dares.screening"""
+    screened_fields = ()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for name, terms in screening.screen_fields(cleaned_data, self.screened_fields).items():
+            self.add_error(name, ValidationError(
+                f"{self.fields[name].label} contains inappropriate content: '{terms[0]}'"
+            ))
+        return cleaned_data
+
+class DareForm(ScreenedFormMixin, forms.ModelForm):
+    screened_fields = screening.DARE_FIELDS
+    
     class Meta:
         model = Dare
         fields = [
@@ -84,8 +101,10 @@ class DareForm(forms.ModelForm):
             'safety_notes': 'Any important safety information or warnings',
         }
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, submission_limit=None, **kwargs):
         super().__init__(*args, **kwargs)
+        # SiteConfiguration.max_dares_per_user, passed in by DareCreateView
+        self.submission_limit = submission_limit
         
         self.fields['category'].empty_label = "Select a category"
         self.fields['difficulty'].empty_label = "Select difficulty level"
@@ -101,19 +120,36 @@ class DareForm(forms.ModelForm):
 
     def clean_title(self):
         title = self.cleaned_data.get('title')
-        if title:
-            inappropriate_words = ['hate', 'violence', 'illegal', 'drugs']
-            title_lower = title.lower()
-            for word in inappropriate_words:
-                if word in title_lower:
-                    raise ValidationError(f"Title contains inappropriate content: '{word}'")
-            
-            if not self.instance.pk:
-                if Dare.objects.filter(title__iexact=title).exists():
-                    raise ValidationError("A dare with this title already exists. Please choose a different title.")
+        # Dare ids have a default, so a new instance already has a pk
+        if title and self.instance._state.adding:
+            # Compared as LOWER(title) so dare_title_lower_idx serves it
+            if Dare.objects.alias(title_lower=Lower('title')).filter(title_lower=Lower(Value(title))).exists():
+                raise ValidationError("A dare with this title already exists. Please choose a different title.")
         
         return title
 
+    def clean_email(self):
+        email = self.cleaned_data.get('email')
+        if email and self.instance._state.adding and activity.quota_left(email, self.submission_limit) == 0:
+            raise ValidationError(
+                f"You have already submitted {self.submission_limit} dares, the most allowed per person."
+            )
+        return email
+
+    def clean(self):
+        cleaned_data = super().clean()
+        title, dare_text = cleaned_data.get('title'), cleaned_data.get('dare_text')
+        if title and dare_text and self.instance._state.adding:
+            similar = similarity.find_similar(title, dare_text, limit=1)
+            if similar:
+                dare = similar[0][1]
+                # Pending dares are not public yet, so their titles are not shown
+                existing = f'the existing dare "{dare.title}"' if dare.is_approved else 'a dare awaiting review'
+                self.add_error('dare_text', ValidationError(
+                    f"This looks like a copy of {existing}. Please submit something new."
+                ))
+        return cleaned_data
+
     def clean_phone_number(self):
         phone = self.cleaned_data.get('phone_number')
         if phone:
@@ -132,6 +168,7 @@ class DareForm(forms.ModelForm):
 class DareSearchForm(forms.Form):
     SORT_CHOICES = [
         ('newest', 'Newest First'),
+        ('trending', 'Trending'),
         ('oldest', 'Oldest First'),
         ('most_viewed', 'Most Viewed'),
         ('most_liked', 'Most Liked'),
@@ -173,7 +210,9 @@ class DareSearchForm(forms.Form):
         widget=forms.CheckboxInput(attrs={'class': 'form-check-input'})
     )
 
-class DareCompletionForm(forms.ModelForm):
+class DareCompletionForm(ScreenedFormMixin, forms.ModelForm):
+    screened_fields = screening.COMPLETION_FIELDS
+    
     class Meta:
         model = DareCompletion
         fields = ['completer_name', 'completer_email', 'completion_proof', 'completion_image']
@@ -318,7 +357,7 @@ class CustomUserCreationForm(UserCreationForm):
             'class': 'form-control', 
             'placeholder': 'Enter your username'
         })
-        self.fields['password'].widget.attrs.update({
+        self.fields['password1'].widget.attrs.update({
             'class': 'form-control', 
             'placeholder': 'Enter your password'
         })
@@ -0,0 +1,128 @@
+"""
+Self-hosted Phosphor icon sprite.
+
+``build_icon_sprite`` scans the templates for ``{% icon %}`` tags (plus
+``Category.CATEGORY_ICONS``, whose names are only known at runtime), copies
+the matching SVGs out of the ``@phosphor-icons/core`` package into
+``<symbol>`` elements and writes them to ``static/icons/sprite.svg``.
+``collectstatic`` then gives the sprite a content hash and WhiteNoise serves
+it with far-future caching, so pages render icons with
+``<svg><use href="sprite#id">`` and no third-party script.
+
+There is no fallback to the Phosphor CDN: ``check_sprite`` is a
+``staticfiles`` system check, so ``collectstatic`` (and ``check``) fail
+while the sprite is missing, unless ``STATIC_MANIFEST_OPTIONAL`` allows
+unbuilt static files (development checkouts, the test runner).
+"""
+import re
+import tarfile
+from pathlib import Path
+
+from django.conf import settings
+
+SPRITE_PATH = 'icons/sprite.svg'
+WEIGHTS = ('thin', 'light', 'regular', 'bold', 'fill', 'duotone')
+
+# {% icon 'name' %}, {% icon 'name' 'bold' %} or {% icon some.variable 'bold' %}
+ICON_TAG = re.compile(r"""{%\s*icon\s+(?:(['"])([\w-]+)\1|[\w.]+)(?:\s+(['"])(\w+)\3)?""")
+SVG_ROOT = re.compile(r'<svg\b([^>]*)>(.*)</svg>', re.S)
+VIEWBOX = re.compile(r'viewBox="([^"]+)"')
+
+
+def icon_name(name):
+    """``'ph-heart'`` and ``'heart'`` both name the heart icon."""
+    return name[3:] if name.startswith('ph-') else name
+
+
+def symbol_id(name, weight='regular'):
+    # Mirrors the file names in the Phosphor package: heart.svg, heart-bold.svg
+    name = icon_name(name)
+    return name if weight == 'regular' else f'{name}-{weight}'
+
+
+def find_icons(template_dirs, dynamic_names=()):
+    """
+    ``{(name, weight)}`` used by the templates under ``template_dirs``.
+    Tags whose name is a variable pull in every name in ``dynamic_names``
+    at that weight.
+    """
+    icons = set()
+    for directory in template_dirs:
+        for path in Path(directory).rglob('*.html'):
+            for match in ICON_TAG.finditer(path.read_text(encoding='utf-8')):
+                weight = match.group(4) or 'regular'
+                names = [match.group(2)] if match.group(2) else dynamic_names
+                icons.update((icon_name(name), weight) for name in names)
+    return icons
+
+
+def default_dynamic_names():
+    from .models import Category
+    return [*Category.CATEGORY_ICONS.values(), 'ph-question']
+
+
+class IconSource:
+    """
+    SVGs from the ``assets`` directory of ``@phosphor-icons/core``, either
+    unpacked (``node_modules/@phosphor-icons/core/assets``) or as the npm
+    tarball (``npm pack @phosphor-icons/core``).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.archive = tarfile.open(self.path) if self.path.is_file() else None
+
+    def read(self, name, weight):
+        relative = f'{weight}/{symbol_id(name, weight)}.svg'
+        if self.archive is None:
+            file = self.path / relative
+            return file.read_text(encoding='utf-8') if file.exists() else None
+        try:
+            member = self.archive.extractfile(f'package/assets/{relative}')
+        except KeyError:
+            return None
+        return member.read().decode('utf-8')
+
+
+def to_symbol(svg, name, weight):
+    match = SVG_ROOT.search(svg)
+    if match is None:
+        raise ValueError(f'{symbol_id(name, weight)} is not an SVG document')
+    viewbox = VIEWBOX.search(match.group(1))
+    viewbox = viewbox.group(1) if viewbox else '0 0 256 256'
+    body = re.sub(r'>\s+<', '><', match.group(2).strip())
+    return f'<symbol id="{symbol_id(name, weight)}" viewBox="{viewbox}">{body}</symbol>'
+
+
+def build_sprite(icons, source):
+    """Return ``(sprite_svg, missing)`` for the ``(name, weight)`` pairs in ``icons``."""
+    symbols, missing = [], []
+    for name, weight in sorted(icons):
+        svg = source.read(name, weight)
+        if svg is None:
+            missing.append(symbol_id(name, weight))
+        else:
+            symbols.append(to_symbol(svg, name, weight))
+    sprite = (
+        '<svg xmlns="http://www.w3.org/2000/svg" style="display:none">\n'
+        + ''.join(f'{symbol}\n' for symbol in symbols)
+        + '</svg>\n'
+    )
+    return sprite, missing
+
+
+def sprite_file():
+    return Path(settings.BASE_DIR) / 'static' / SPRITE_PATH
+
+
+def check_sprite(app_configs=None, **kwargs):
+    from django.contrib.staticfiles import finders
+    from django.core.checks import Error
+
+    if finders.find(SPRITE_PATH) or getattr(settings, 'STATIC_MANIFEST_OPTIONAL', settings.DEBUG):
+        return []
+    return [Error(
+        f"The icon sprite static/{SPRITE_PATH} has not been built, so no page would show its icons.",
+        hint="Run `python manage.py build_icon_sprite` (see README) and commit the sprite before collectstatic.",
+        id='dares.E001',
+    )]
@@ -0,0 +1,163 @@
+"""
+Which dares has the current visitor liked?
+
+Likes are keyed by email: the account email of a logged-in user, or the
+email an anonymous visitor last liked with. The session keeps that email
+and a Bloom filter of the slugs of the dares liked under it (about 10 bits
+per like, so a handful of bytes for most visitors). Slugs never change, so
+the filters stay valid when primary keys are rewritten (``rekey_dares``).
+
+A logged-in user's filter is built with one query over their account's
+likes and updated as they like. Anyone can type any email, so an
+anonymous visitor's state only ever covers the likes made in that session:
+it keeps their slugs as a list next to the filter and never reads the
+email's earlier likes.
+
+``liked_ids`` tests each dare on the page against the filter. A visitor
+with no likes (or none among the dares shown) costs no query at all; the
+rest get one query on the ``(lower(user_email), dare)`` index, restricted to
+the dares the filter could not rule out, which also discards false
+positives. Emails match ignoring case, as on the activity page.
+Unliking rebuilds the filter, since Bloom filters cannot forget.
+"""
+import base64
+import hashlib
+import math
+
+SESSION_KEY = 'dares_liked_slugs'
+BITS_PER_LIKE = 10
+HASHES = 4
+MIN_BITS = 256
+
+
+class BloomFilter:
+    def __init__(self, size, data=None):
+        self.size = size
+        self.data = bytearray(data) if data is not None else bytearray(math.ceil(size / 8))
+
+    @classmethod
+    def for_items(cls, items):
+        items = list(items)
+        size = max(MIN_BITS, len(items) * BITS_PER_LIKE)
+        bloom = cls(size)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def positions(self, item):
+        digest = hashlib.blake2b(str(item).encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little')
+        return [(first + n * second) % self.size for n in range(HASHES)]
+
+    def add(self, item):
+        for position in self.positions(item):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+    def encode(self):
+        return base64.b64encode(bytes(self.data)).decode('ascii')
+
+    @classmethod
+    def decode(cls, size, encoded):
+        return cls(size, base64.b64decode(encoded))
+
+
+def make_state(email, slugs):
+    """Session value for ``email``; ``bloom`` is ``None`` when nothing is liked."""
+    slugs = list(slugs)
+    if not slugs:
+        return {'email': email, 'size': 0, 'bloom': None}
+    bloom = BloomFilter.for_items(slugs)
+    return {'email': email, 'size': bloom.size, 'bloom': bloom.encode()}
+
+
+def session_state(email, slugs):
+    """State of an anonymous visitor, covering only the ``slugs`` liked in this session."""
+    slugs = sorted(set(slugs))
+    return {**make_state(email, slugs), 'slugs': slugs}
+
+
+def build_state(email):
+    from .activity import for_email
+    from .models import DareLike
+    return make_state(email, for_email(DareLike.objects, 'user_email', email).values_list('dare__slug', flat=True))
+
+
+async def abuild_state(email):
+    from .activity import for_email
+    from .models import DareLike
+    slugs = for_email(DareLike.objects, 'user_email', email).values_list('dare__slug', flat=True)
+    return make_state(email, [slug async for slug in slugs])
+
+
+def visitor_state(request):
+    """The visitor's like state, identifying logged-in users by their account email."""
+    session = getattr(request, 'session', None)
+    if session is None:
+        return None
+    state = session.get(SESSION_KEY)
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated and user.email and (
+        state is None or state['email'] != user.email or 'slugs' in state
+    ):
+        state = session[SESSION_KEY] = build_state(user.email)
+    return state
+
+
+def has_likes(request):
+    state = visitor_state(request)
+    return bool(state and state['bloom'])
+
+
+def state_token(request):
+    """Short digest of the visitor's like state, for ETags; empty without likes."""
+    state = visitor_state(request)
+    if not (state and state['bloom']):
+        return ''
+    return hashlib.sha1(f"{state['email']}|{state['bloom']}".encode()).hexdigest()[:12]
+
+
+def liked_ids(request, dares):
+    """Primary keys of the ``dares`` the visitor has liked."""
+    state = visitor_state(request)
+    if not (state and state['bloom']):
+        return set()
+    if 'slugs' in state:
+        slugs = set(state['slugs'])
+        candidates = [dare.pk for dare in dares if dare.slug in slugs]
+    else:
+        bloom = BloomFilter.decode(state['size'], state['bloom'])
+        candidates = [dare.pk for dare in dares if dare.slug in bloom]
+    if not candidates:
+        return set()
+    from .activity import for_email
+    from .models import DareLike
+    likes = for_email(DareLike.objects, 'user_email', state['email']).filter(dare_id__in=candidates)
+    return set(likes.values_list('dare_id', flat=True))
+
+
+async def arecord(request, email, slug, liked):
+    """Update the session's like state after ``email`` liked (or unliked) a dare."""
+    state = await request.session.aget(SESSION_KEY)
+    user = await request.auser()
+    if not (user.is_authenticated and user.email == email):
+        slugs = state['slugs'] if state is not None and state['email'] == email and 'slugs' in state else []
+        slugs = [*slugs, slug] if liked else [other for other in slugs if other != slug]
+        await request.session.aset(SESSION_KEY, session_state(email, slugs))
+        return
+    if state is None or 'slugs' in state or state['email'] != email or not liked:
+        # A new identity, or an unlike the filter cannot take back
+        state = await abuild_state(email)
+    elif state['bloom'] is None:
+        state = make_state(email, [slug])
+    else:
+        bloom = BloomFilter.decode(state['size'], state['bloom'])
+        bloom.add(slug)
+        if state['size'] < MIN_BITS * 64 and sum(bin(byte).count('1') for byte in bloom.data) > state['size'] // 2:
+            # Half the bits set: grow the filter before false positives climb
+            state = await abuild_state(email)
+        else:
+            state = {**state, 'bloom': bloom.encode()}
+    await request.session.aset(SESSION_KEY, state)
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from dares import icons
+
+
+class Command(BaseCommand):
+    help = (
+        "Build static/icons/sprite.svg from the Phosphor icons the templates use. "
+        "Re-run after adding an {% icon %} tag or a category icon, then collectstatic."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', default=str(Path(settings.BASE_DIR) / 'node_modules' / '@phosphor-icons' / 'core' / 'assets'),
+            help="Unpacked @phosphor-icons/core assets directory, or the package tarball from `npm pack`",
+        )
+        parser.add_argument('--output', default=str(icons.sprite_file()))
+        parser.add_argument(
+            '--check', action='store_true',
+            help="Fail if the sprite on disk is out of date instead of writing it",
+        )
+
+    def handle(self, *args, **options):
+        source_path = Path(options['source'])
+        if not source_path.exists():
+            raise CommandError(
+                f"{source_path} not found; run `npm install @phosphor-icons/core` or pass --source."
+            )
+
+        template_dirs = [Path(directory) for engine in settings.TEMPLATES for directory in engine['DIRS']]
+        used = icons.find_icons(template_dirs, icons.default_dynamic_names())
+        sprite, missing = icons.build_sprite(used, icons.IconSource(source_path))
+        if missing:
+            raise CommandError(f"Unknown icon(s) in templates: {', '.join(missing)}")
+
+        output = Path(options['output'])
+        if options['check']:
+            if not output.exists() or output.read_text(encoding='utf-8') != sprite:
+                raise CommandError(f"{output} is out of date; run build_icon_sprite.")
+            self.stdout.write(self.style.SUCCESS(f"{output} is up to date ({len(used)} icons)."))
+            return
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(sprite, encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(used)} icons ({len(sprite)} bytes) to {output}."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from dares import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the 'people who did this also did' recommendations from likes "
+        "and completions. By default only dares engaged with since the last "
+        "build and the dares co-engaged with them are recomputed, with a full "
+        "build once the oldest list is RECOMMENDATION_FULL_BUILD_SECONDS old "
+        "(unlikes and deletions only show up then); --full recomputes every dare now."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Recompute every dare")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['full']:
+            built = recommendations.build(batch_size=options['batch_size'])
+        else:
+            built = recommendations.refresh(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed recommendations for {built} dare(s)."))
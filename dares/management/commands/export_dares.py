@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from dares import bulk
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream dares, completions or likes to CSV or JSON Lines at constant "
+        "memory. Related rows name their dare by slug."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=list(bulk.KINDS), default='dares')
+        parser.add_argument('--format', choices=list(bulk.FORMATS), default='csv')
+        parser.add_argument('--output', default='-', help="File to write, or - for stdout")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        lines = bulk.export_lines(options['kind'], options['format'], chunk_size=options['chunk_size'])
+        if options['output'] == '-':
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        count = 0
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stderr.write(f"Wrote {count} line(s) to {options['output']}.")
@@ -0,0 +1,68 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from dares import similarity
+from dares.models import Dare
+
+
+class Command(BaseCommand):
+    help = (
+        "Index dares for near-duplicate detection (only those not indexed yet "
+        "unless --rebuild), then list pairs of dares whose title and text look "
+        "like copies of each other."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Recompute every signature")
+        parser.add_argument('--index-only', action='store_true', help="Index without reporting pairs")
+        parser.add_argument(
+            '--threshold', type=float, default=None,
+            help="Minimum estimated similarity to report (default: DUPLICATE_SIMILARITY_THRESHOLD)",
+        )
+        parser.add_argument(
+            '--status', choices=[status for status, _ in Dare.STATUS_CHOICES],
+            help="Only report pairs where at least one dare has this status, e.g. pending",
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        self.index(options['rebuild'], options['batch_size'])
+        if options['index_only']:
+            return
+
+        pairs = list(similarity.duplicate_pairs(options['threshold'], chunk_size=options['batch_size']))
+        ids = {dare_id for _, first, second in pairs for dare_id in (first, second)}
+        dares = {}
+        ids = list(ids)
+        for start in range(0, len(ids), options['batch_size']):
+            dares.update(
+                (dare['pk'], dare) for dare in Dare.objects.filter(
+                    pk__in=ids[start:start + options['batch_size']],
+                ).values('pk', 'slug', 'status')
+            )
+
+        reported = 0
+        for score, first, second in sorted(pairs, key=lambda pair: -pair[0]):
+            first, second = dares[first], dares[second]
+            if options['status'] and options['status'] not in (first['status'], second['status']):
+                continue
+            self.stdout.write(
+                f"{score:.2f}  {first['slug']} ({first['status']})  ~  {second['slug']} ({second['status']})"
+            )
+            reported += 1
+        self.stdout.write(self.style.SUCCESS(f"{reported} near-duplicate pair(s)."))
+
+    def index(self, rebuild, batch_size):
+        queryset = Dare.objects.only('pk', 'title', 'dare_text').order_by('pk')
+        if not rebuild:
+            queryset = queryset.filter(signature__isnull=True)
+        dares = queryset.iterator(chunk_size=batch_size)
+        indexed = 0
+        while True:
+            batch = list(islice(dares, batch_size))
+            if not batch:
+                break
+            indexed += similarity.index_dares(batch)
+            self.stderr.write(f"Indexed {indexed} dare(s)")
+        self.stdout.write(f"Indexed {indexed} dare(s).")
@@ -0,0 +1,189 @@
+import math
+import random
+import re
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from dares.bulk import create_keeping_timestamps
+from dares.models import Category, Dare, DareCompletion, DareLike, DifficultyLevel
+
+VERBS = ['Sing', 'Dance', 'Climb', 'Paint', 'Cook', 'Juggle', 'Recite', 'Build', 'Sketch', 'Film']
+OBJECTS = ['a song', 'a poem', 'a paper plane', 'a sandcastle', 'a portrait', 'a limerick', 'a tower', 'a mural']
+PLACES = ['in the cafeteria', 'in the library', 'on the quad', 'at the bus stop', 'in class', 'at the gym']
+
+STATUS_WEIGHTS = [('approved', 70), ('featured', 5), ('pending', 20), ('rejected', 5)]
+
+
+def zipf_counts(total, buckets, skew, cap):
+    """Split ``total`` over ``buckets`` following a Zipf-like popularity curve."""
+    if not buckets or not total:
+        return [0] * buckets
+    weights = [1 / (rank + 10) ** skew for rank in range(buckets)]
+    scale = total / sum(weights)
+    shares = [weight * scale for weight in weights]
+    counts = [min(cap, int(share)) for share in shares]
+    # Hand out the rounding remainder by largest fractional part.
+    remainder = total - sum(counts)
+    by_fraction = sorted(range(buckets), key=lambda i: shares[i] - int(shares[i]), reverse=True)
+    for i in by_fraction:
+        if remainder <= 0:
+            break
+        if counts[i] < cap:
+            counts[i] += 1
+            remainder -= 1
+    return counts
+
+
+SLUG_NUMBER = re.compile(r'-(\d+)$')
+
+
+def coprime_step(modulus):
+    step = 7919
+    while math.gcd(step, modulus) != 1:
+        step += 2
+    return step
+
+
+def next_number():
+    """One past the highest numeric slug suffix, so reruns never reuse a slug after deletions."""
+    highest = -1
+    for slug in Dare.objects.values_list('slug', flat=True).iterator(chunk_size=10000):
+        match = SLUG_NUMBER.search(slug)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest + 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate a synthetic dataset (dares, likes, completions) for load "
+        "testing. Popularity follows a Zipf-like curve and users overlap across "
+        "dares, so list sorts, stats and recommendations see realistic data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dares', type=int, default=10000)
+        parser.add_argument('--likes', type=int, default=100000)
+        parser.add_argument('--completions', type=int, default=20000)
+        parser.add_argument('--users', type=int, help="Distinct liker/completer identities (default: likes / 10)")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--days', type=int, default=365, help="Spread created_at over this many days")
+        parser.add_argument('--skew', type=float, default=1.0, help="Zipf exponent for likes/completions/views")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        categories = list(Category.objects.all())
+        difficulties = list(DifficultyLevel.objects.all())
+        if not categories or not difficulties:
+            raise CommandError("Categories and difficulty levels must exist; run migrate first.")
+
+        rng = random.Random(options['seed'])
+        dare_total = options['dares']
+        batch_size = options['batch_size']
+        users = options['users'] or max(1000, options['likes'] // 10)
+
+        # Popularity rank -> dare position is shuffled so hot dares are spread
+        # across categories and creation dates.
+        order = list(range(dare_total))
+        rng.shuffle(order)
+        likes = [0] * dare_total
+        completions = [0] * dare_total
+        views = [0] * dare_total
+        for rank, count in enumerate(zipf_counts(options['likes'], dare_total, options['skew'], users)):
+            likes[order[rank]] = count
+        for rank, count in enumerate(zipf_counts(options['completions'], dare_total, options['skew'], users)):
+            completions[order[rank]] = count
+        for rank, count in enumerate(zipf_counts(options['likes'] * 20, dare_total, options['skew'], 10 ** 9)):
+            views[order[rank]] = count
+
+        offset = next_number()
+        now = timezone.now()
+        statuses = [status for status, weight in STATUS_WEIGHTS for _ in range(weight)]
+        started = time.perf_counter()
+        dare_ids = []
+
+        for start in range(0, dare_total, batch_size):
+            batch = []
+            for position in range(start, min(start + batch_size, dare_total)):
+                number = offset + position
+                title = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(PLACES)}"
+                status = rng.choice(statuses)
+                created_at = now - timedelta(seconds=rng.randrange(options['days'] * 86400))
+                is_approved = status in ('approved', 'featured')
+                batch.append(Dare(
+                    title=f"{title} #{number}",
+                    slug=f"{slugify(title)}-{number}",
+                    name=f"Student {number % 5000}",
+                    email=f"student{number % 5000}@example.edu",
+                    phone_number=f"+91{9000000000 + number % 999999999}",
+                    college=f"College {number % 300}",
+                    dare_text=f"{title}. Record it and share the proof with the community.",
+                    category=categories[number % len(categories)],
+                    difficulty=difficulties[rng.randrange(len(difficulties))],
+                    status=status,
+                    is_approved=is_approved,
+                    is_featured=status == 'featured',
+                    approved_at=created_at if is_approved else None,
+                    views_count=views[position],
+                    likes_count=likes[position],
+                    completions_count=completions[position],
+                    created_at=created_at,
+                    updated_at=created_at,
+                ))
+            with transaction.atomic():
+                create_keeping_timestamps(Dare, batch, batch_size)
+            dare_ids.extend((dare.pk, dare.created_at) for dare in batch)
+            self.stdout.write(f"Dares: {len(dare_ids)}/{dare_total}")
+
+        like_total = self.generate_related(
+            DareLike, dare_ids, likes, users, batch_size, rng,
+            lambda dare_id, user, at: DareLike(dare_id=dare_id, user_email=f"user{user}@example.edu", created_at=at),
+        )
+        completion_total = self.generate_related(
+            DareCompletion, dare_ids, completions, users, batch_size, rng,
+            lambda dare_id, user, at: DareCompletion(
+                dare_id=dare_id,
+                completer_name=f"User {user}",
+                completer_email=f"user{user}@example.edu",
+                completion_proof="Completed it and posted the video.",
+                is_verified=user % 4 != 0,
+                completed_at=at,
+            ),
+        )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {dare_total} dares, {like_total} likes and {completion_total} completions "
+            f"in {elapsed:.1f}s."
+        ))
+
+    def generate_related(self, model, dare_ids, counts, users, batch_size, rng, build):
+        # For each dare, the j-th row goes to user (j * step + offset) % users;
+        # step is coprime with users so a dare never sees the same user twice
+        # while users still overlap across dares.
+        step = coprime_step(users)
+        now = timezone.now()
+        batch, total = [], 0
+        for (dare_id, created_at), count in zip(dare_ids, counts):
+            offset = rng.randrange(users)
+            window = max(1, int((now - created_at).total_seconds()))
+            for j in range(count):
+                at = created_at + timedelta(seconds=rng.randrange(window))
+                batch.append(build(dare_id, (j * step + offset) % users, at))
+                if len(batch) >= batch_size:
+                    total += self.flush(model, batch)
+                    batch = []
+        if batch:
+            total += self.flush(model, batch)
+        return total
+
+    def flush(self, model, batch):
+        with transaction.atomic():
+            create_keeping_timestamps(model, batch, len(batch))
+        self.stdout.write(f"{model._meta.verbose_name_plural.capitalize()}: +{len(batch)}")
+        return len(batch)
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dares import bulk
+
+
+class Command(BaseCommand):
+    help = (
+        "Load dares, completions or likes from CSV or JSON Lines in batched "
+        "bulk inserts. Rows that already exist are skipped; invalid rows are "
+        "reported with their line number."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--kind', choices=list(bulk.KINDS), default='dares')
+        parser.add_argument('--format', choices=list(bulk.FORMATS), help="Default: from the file extension")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--max-errors', type=int, default=20, help="Error lines to print")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        fmt = options['format'] or path.suffix.lstrip('.')
+        if fmt not in bulk.FORMATS:
+            raise CommandError(f"Cannot tell the format of {path}; pass --format.")
+
+        with path.open(encoding='utf-8', newline='') as source:
+            result = bulk.import_records(
+                options['kind'], bulk.read_records(source, fmt), options['batch_size'],
+                progress=lambda result: self.stdout.write(f"Imported {result.created} row(s)..."),
+            )
+
+        for line, message in result.errors[:options['max_errors']]:
+            self.stderr.write(f"line {line}: {message}")
+        summary = f"Created {result.created}, skipped {result.skipped} existing, {len(result.errors)} invalid."
+        self.stdout.write(self.style.WARNING(summary) if result.errors else self.style.SUCCESS(summary))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from dares import moderation
+from dares.models import ModerationTask
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the state of the moderation queue. With --rebuild, re-queue every "
+        "pending dare with its current priority (after imports or re-screening)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            queued = moderation.rebuild(options['batch_size'])
+            self.stdout.write(f"Queued {queued} pending dare(s).")
+
+        now = timezone.now()
+        total = ModerationTask.objects.count()
+        claimed = ModerationTask.objects.filter(lease_expires_at__gt=now).count()
+        expired = ModerationTask.objects.filter(lease_expires_at__lte=now).count()
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} dare(s) in the queue: {claimed} claimed, {expired} with a lapsed claim."
+        ))
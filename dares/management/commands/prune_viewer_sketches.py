@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from dares import viewers
+from dares.models import ViewerSketch
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete per-dare daily unique-viewer sketches older than the retention "
+        "period. All-time and site-wide sketches are kept."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            help=f"Retention in days (default VIEWER_SKETCH_RETENTION_DAYS, {viewers.DEFAULT_RETENTION_DAYS})",
+        )
+
+    def handle(self, *args, **options):
+        viewers.buffer.flush()
+        pruned = viewers.prune(options['days'])
+        remaining = ViewerSketch.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"{remaining} viewer sketch(es), pruned {pruned}."))
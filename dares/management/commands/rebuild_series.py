@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from dares import series
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the daily like and completion series of every dare from the "
+        "like and completion timestamps, e.g. after importing data. Views carry "
+        "no timestamp and keep the counts recorded as they happened."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        series.buffer.flush()
+        events = series.rebuild_history(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Counted {events} like(s) and completion(s)."))
@@ -0,0 +1,58 @@
+import math
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from dares import trending
+from dares.models import DareCompletion, DareLike, TrendingScore
+
+
+class Command(BaseCommand):
+    help = (
+        "Maintain the trending scores: optionally rebuild them from like and "
+        "completion history, then drop dares whose decayed score is negligible. "
+        "Views carry no timestamp and are only counted as they happen."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help="Recompute every score from history")
+        parser.add_argument('--days', type=int, default=30, help="History window used by --rebuild")
+        parser.add_argument(
+            '--prune-below', type=float, default=0.05,
+            help="Delete scores whose current decayed weight is below this",
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            self.rebuild(options['days'], options['batch_size'])
+
+        threshold = math.log2(options['prune_below']) + trending.now_score()
+        pruned, _ = TrendingScore.objects.filter(score__lt=threshold).delete()
+        remaining = TrendingScore.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"{remaining} trending dare(s), pruned {pruned}."))
+
+    def rebuild(self, days, batch_size):
+        since = timezone.now() - timedelta(days=days)
+        weights = trending.weights()
+        scores = {}
+        sources = [
+            (DareLike.objects.filter(created_at__gte=since), 'created_at', weights.get('like')),
+            (DareCompletion.objects.filter(completed_at__gte=since), 'completed_at', weights.get('completion')),
+        ]
+        for queryset, timestamp_field, weight in sources:
+            if not weight:
+                continue
+            rows = queryset.filter(dare__is_approved=True).values_list('dare_id', timestamp_field)
+            for dare_id, when in rows.iterator(chunk_size=batch_size):
+                scores[dare_id] = trending.log2_add(scores.get(dare_id), trending.event_score(weight, when))
+
+        with transaction.atomic():
+            TrendingScore.objects.all().delete()
+            TrendingScore.objects.bulk_create(
+                (TrendingScore(dare_id=dare_id, score=score) for dare_id, score in scores.items()),
+                batch_size=batch_size,
+            )
+        self.stdout.write(f"Rebuilt scores for {len(scores)} dare(s) from the last {days} day(s).")
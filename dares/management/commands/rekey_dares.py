@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dares import conditional, feeds, viewers
+from dares.db import uuid7
+from dares.models import Dare, ViewerSketch
+
+
+class Command(BaseCommand):
+    help = (
+        "Rewrite existing random (uuid4) Dare primary keys as time-ordered "
+        "UUIDv7 values derived from created_at, updating every foreign key "
+        "that points at Dare and the unique-viewer sketch keys that embed it, "
+        "then rebuilding the cached home feed. Stop the web workers first: "
+        "engagement they still hold in memory under the old keys is dropped. "
+        "Like state in sessions holds slugs, which do not change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help="Only report how many rows would change")
+
+    def handle(self, *args, **options):
+        relations = [rel for rel in Dare._meta.related_objects if not rel.many_to_many]
+        pending = [
+            (pk, created_at)
+            for pk, created_at in Dare.objects.order_by('created_at').values_list('pk', 'created_at').iterator()
+            if pk.version != 7
+        ]
+        if options['dry_run']:
+            self.stdout.write(f"{len(pending)} dare(s) would be rekeyed.")
+            return
+
+        batch_size = options['batch_size']
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            # Foreign keys are created DEFERRABLE INITIALLY DEFERRED on SQLite
+            # and PostgreSQL, so parent and children can be updated in any
+            # order as long as it happens inside one transaction.
+            with transaction.atomic():
+                new_pks = []
+                for old_pk, created_at in batch:
+                    new_pk = uuid7(int(created_at.timestamp() * 1000))
+                    Dare._base_manager.filter(pk=old_pk).update(id=new_pk)
+                    for rel in relations:
+                        rel.related_model._base_manager.filter(
+                            **{rel.field.attname: old_pk}
+                        ).update(**{rel.field.attname: new_pk})
+                    new_pks.append(new_pk)
+                # Sketch keys embed the pk as text, outside the foreign keys
+                sketches = list(ViewerSketch.objects.filter(dare_id__in=new_pks))
+                for sketch in sketches:
+                    sketch.key = viewers.sketch_key(sketch.dare_id, sketch.day)
+                ViewerSketch.objects.bulk_update(sketches, ['key'])
+            self.stdout.write(f"Rekeyed {start + len(batch)}/{len(pending)} dares")
+
+        if pending:
+            # Cached pages and the home feed refer to dares by their old keys
+            conditional.schedule_bump('dares', 'completions', 'engagement', 'trending')
+            feeds.rebuild_home_feed()
+        self.stdout.write(self.style.SUCCESS(f"Rekeyed {len(pending)} dare(s)."))
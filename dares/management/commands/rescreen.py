@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from dares import moderation, screening
+from dares.models import Dare, DareCompletion
+
+KINDS = {
+    'dares': (Dare, screening.DARE_FIELDS),
+    'completions': (DareCompletion, screening.COMPLETION_FIELDS),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-screen stored dares and completions against the active screening "
+        "terms, e.g. after the term list changed, and record the matches in "
+        "screening_flags. Nothing is rejected; filter the admin by 'screening'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=[*KINDS, 'all'], default='all')
+        parser.add_argument(
+            '--status', choices=[status for status, _ in Dare.STATUS_CHOICES],
+            help="Only re-screen dares with this status (and completions of them)",
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        kinds = list(KINDS) if options['kind'] == 'all' else [options['kind']]
+        for kind in kinds:
+            model, fields = KINDS[kind]
+            queryset = model.objects.all()
+            if options['status']:
+                lookup = 'status' if model is Dare else 'dare__status'
+                queryset = queryset.filter(**{lookup: options['status']})
+            scanned, flagged, changed = screening.rescreen(
+                queryset, fields, options['batch_size'],
+                progress=lambda scanned: self.stderr.write(f"{kind}: {scanned}"),
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{kind}: screened {scanned}, {flagged} flagged, {changed} changed."
+            ))
+            if model is Dare and changed:
+                # Screening flags feed the queue priority
+                moderation.rebuild(options['batch_size'])
@@ -0,0 +1,51 @@
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from dares import warmup
+
+
+class Command(BaseCommand):
+    help = (
+        "Request the hottest pages after a deploy so the first visitors find "
+        "warm caches: the dare list in every sort order, every category, the "
+        "most viewed dares, stats and the stats APIs. Runs in-process unless "
+        "--base-url points at the deployed site."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=50, help="Most viewed dares to warm")
+        parser.add_argument('--pages', type=int, default=1, help="List pages per sort order and category")
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--base-url', help="Warm over HTTP, e.g. https://dareora.example")
+        parser.add_argument('--host', help="Host header for in-process requests (default: first ALLOWED_HOSTS entry)")
+        parser.add_argument('--timeout', type=float, default=30, help="Seconds per HTTP request")
+
+    def handle(self, *args, **options):
+        if not options['base_url'] and settings.CACHES['default']['BACKEND'].endswith('LocMemCache'):
+            self.stderr.write(self.style.WARNING(
+                "The local-memory cache is private to this process, so an in-process run warms "
+                "nothing the web workers can see. Pass --base-url, or set WARM_CACHE=1 for gunicorn."
+            ))
+        if options['base_url'] and not warmup.token():
+            self.stderr.write(self.style.WARNING(
+                "WARMUP_TOKEN is not set, so the site counts these requests as dare views."
+            ))
+
+        paths = warmup.hot_paths(options['top'], options['pages'])
+        result = warmup.warm(
+            paths, options['concurrency'], options['base_url'], options['host'], options['timeout'],
+        )
+
+        warmed = [entry for entry in result['results'] if 200 <= entry['status'] < 400]
+        failed = [entry for entry in result['results'] if not 200 <= entry['status'] < 400]
+        for entry in result['results']:
+            if options['verbosity'] > 1 or entry in failed:
+                self.stdout.write(f"  {entry['status'] or '---'}  {entry['seconds']:>7.3f}s  {entry['path']}")
+        kinds = ', '.join(f'{kind} {count}' for kind, count in Counter(entry['kind'] for entry in warmed).items())
+        slowest = max(result['results'], key=lambda entry: entry['seconds'], default=None)
+        summary = f"Warmed {len(warmed)} of {len(paths)} URL(s) in {result['seconds']}s ({kinds})."
+        if slowest:
+            summary += f" Slowest: {slowest['path']} ({slowest['seconds']}s)."
+        self.stdout.write(self.style.SUCCESS(summary) if not failed else self.style.WARNING(summary))
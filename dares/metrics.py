@@ -0,0 +1,179 @@
+import contextvars
+import threading
+import time
+from collections import Counter, defaultdict
+
+_current = contextvars.ContextVar('dares_request_metrics', default=None)
+
+# Upper bounds (seconds) shared by every latency histogram.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class RequestMetrics:
+    """Timings and counters collected while serving a single request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.db_time = 0.0
+        self.queries = 0
+        self.statements = Counter()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.template_time = 0.0
+
+    @property
+    def duplicate_queries(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+
+
+def start_request():
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+def query_wrapper(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+        metrics.statements[(sql, repr(params))] += 1
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """
+    Attach ``query_wrapper`` to every new database connection. The wrapper
+    reads the collector from a context variable, so it also sees queries run
+    by async views through ``sync_to_async``.
+    """
+    if query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(query_wrapper)
+
+
+def record_cache(hit):
+    metrics = _current.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteRegistry:
+    """
+    In-memory per-route aggregates for this process. Each worker keeps its
+    own registry; the metrics endpoint reports the worker that served it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.durations = defaultdict(lambda: Histogram(DURATION_BUCKETS))
+        self.db_durations = defaultdict(lambda: Histogram(DURATION_BUCKETS))
+        self.template_durations = defaultdict(lambda: Histogram(DURATION_BUCKETS))
+        self.query_counts = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))
+        self.duplicate_queries = Counter()
+        self.cache_hits = Counter()
+        self.cache_misses = Counter()
+        self.responses = Counter()
+
+    def observe(self, route, method, status, metrics):
+        key = (route, method)
+        with self._lock:
+            self.durations[key].observe(metrics.duration)
+            self.db_durations[key].observe(metrics.db_time)
+            self.template_durations[key].observe(metrics.template_time)
+            self.query_counts[key].observe(metrics.queries)
+            self.duplicate_queries[key] += metrics.duplicate_queries
+            self.cache_hits[key] += metrics.cache_hits
+            self.cache_misses[key] += metrics.cache_misses
+            self.responses[key + (str(status),)] += 1
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            self._render_histogram(
+                lines, 'dares_request_duration_seconds', 'Wall time spent serving the request.', self.durations
+            )
+            self._render_histogram(
+                lines, 'dares_request_db_duration_seconds', 'Time spent in database queries.', self.db_durations
+            )
+            self._render_histogram(
+                lines, 'dares_request_template_duration_seconds', 'Time spent rendering templates.',
+                self.template_durations,
+            )
+            self._render_histogram(
+                lines, 'dares_request_queries', 'Database queries issued per request.', self.query_counts
+            )
+            self._render_counter(
+                lines, 'dares_request_duplicate_queries_total',
+                'Queries repeated with identical SQL and parameters within a request.', self.duplicate_queries,
+            )
+            self._render_counter(lines, 'dares_cache_hits_total', 'Application cache hits.', self.cache_hits)
+            self._render_counter(lines, 'dares_cache_misses_total', 'Application cache misses.', self.cache_misses)
+            lines.append('# HELP dares_responses_total Responses by route, method and status.')
+            lines.append('# TYPE dares_responses_total counter')
+            for (route, method, status), value in sorted(self.responses.items()):
+                lines.append(f'dares_responses_total{{{_labels(route, method)},status="{status}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histogram(lines, name, help_text, histograms):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} histogram')
+        for (route, method), histogram in sorted(histograms.items()):
+            labels = _labels(route, method)
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+            lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+    @staticmethod
+    def _render_counter(lines, name, help_text, counter):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for (route, method), value in sorted(counter.items()):
+            lines.append(f'{name}{{{_labels(route, method)}}} {value}')
+
+
+def _labels(route, method):
+    route = route.replace('\\', '\\\\').replace('"', '\\"')
+    return f'route="{route}",method="{method}"'
+
+
+registry = RouteRegistry()
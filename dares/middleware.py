@@ -0,0 +1,143 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+
+logger = logging.getLogger('dares.metrics')
+
+
+class RequestMetricsMiddleware:
+    """
+    Records wall time, DB time, query count, duplicate queries, cache hits and
+    misses and template render time for every request. The numbers are sent
+    back in a ``Server-Timing`` header, written as one JSON log line and
+    aggregated per route for the Prometheus endpoint.
+
+    Keep this first in ``MIDDLEWARE`` so the timings cover the whole stack.
+    Works under both WSGI and ASGI without an extra thread hop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request_metrics, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        request_metrics.finish()
+        self.report(request, response, request_metrics)
+        return response
+
+    async def __acall__(self, request):
+        request_metrics, token = metrics.start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        request_metrics.finish()
+        self.report(request, response, request_metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        request_metrics = metrics.current()
+        if request_metrics is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                request_metrics.template_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def report(self, request, response, request_metrics):
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else '<unresolved>'
+        metrics.registry.observe(route, request.method, response.status_code, request_metrics)
+
+        if getattr(settings, 'REQUEST_METRICS_SERVER_TIMING', True):
+            response['Server-Timing'] = ', '.join([
+                f'total;dur={request_metrics.duration * 1000:.1f}',
+                f'db;dur={request_metrics.db_time * 1000:.1f};desc="{request_metrics.queries} queries"',
+                f'tpl;dur={request_metrics.template_time * 1000:.1f}',
+                f'cache;desc="{request_metrics.cache_hits} hits {request_metrics.cache_misses} misses"',
+            ])
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'duration_ms': round(request_metrics.duration * 1000, 2),
+            'db_ms': round(request_metrics.db_time * 1000, 2),
+            'queries': request_metrics.queries,
+            'duplicate_queries': request_metrics.duplicate_queries,
+            'cache_hits': request_metrics.cache_hits,
+            'cache_misses': request_metrics.cache_misses,
+            'template_ms': round(request_metrics.template_time * 1000, 2),
+        }
+        slow_ms = getattr(settings, 'REQUEST_METRICS_SLOW_MS', 1000)
+        level = logging.WARNING if record['duration_ms'] >= slow_ms else logging.INFO
+        logger.log(level, json.dumps(record))
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise is sync-only, which makes Django run the whole middleware chain
+    (and every async view) through a thread under ASGI. Static lookups are an
+    in-memory dict hit, so the async path can do them inline.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = self.find_file(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class StreamingGZipMiddleware(GZipMiddleware):
+    """
+    Gzip for HTML and JSON responses, streamed chunk by chunk for streaming
+    responses. Server-sent events are left alone: compressing them would
+    hold events back in the compressor's buffer. So are downloads that are
+    already gzip files.
+
+    Place it after WhiteNoise, which serves its own pre-compressed files.
+    """
+
+    skip_content_types = ('text/event-stream', 'application/gzip')
+
+    def process_response(self, request, response):
+        if response.get('Content-Type', '').startswith(self.skip_content_types):
+            return response
+        return super().process_response(request, response)
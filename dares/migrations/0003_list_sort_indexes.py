@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0002_populate_initial_data'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-created_at'], name='dare_approved_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-views_count', '-created_at'], name='dare_approved_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-likes_count', '-created_at'], name='dare_approved_likes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['-completions_count'], name='dare_approved_completions_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['title'], name='dare_approved_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['category', '-created_at'], name='dare_approved_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True)), fields=['difficulty', '-created_at'], name='dare_approved_difficulty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(condition=models.Q(('is_approved', True), ('is_featured', True)), fields=['-created_at'], name='dare_featured_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='darecompletion',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['-completed_at'], name='completion_verified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='darecompletion',
+            index=models.Index(condition=models.Q(('is_verified', True)), fields=['dare', '-completed_at'], name='completion_dare_verified_idx'),
+        ),
+    ]
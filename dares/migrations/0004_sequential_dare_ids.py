@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:32
+
+import dares.db
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0003_list_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dare',
+            name='id',
+            field=models.UUIDField(default=dares.db.new_dare_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:20
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0005_trending_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DareSignature',
+            fields=[
+                ('dare', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='dares.dare')),
+                ('signature', models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DareSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band_hash', models.BigIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='dare_title_lower_idx'),
+        ),
+        migrations.AddField(
+            model_name='daresignatureband',
+            name='dare',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='dares.dare'),
+        ),
+        migrations.AddIndex(
+            model_name='daresignatureband',
+            index=models.Index(fields=['band_hash', 'dare'], name='signature_band_idx'),
+        ),
+    ]
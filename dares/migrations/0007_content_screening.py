@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:26
+
+from django.db import migrations, models
+
+
+def populate_screening_terms(apps, schema_editor):
+    # The words DareForm.clean_title used to reject
+    ScreeningTerm = apps.get_model('dares', 'ScreeningTerm')
+    for term in ('hate', 'violence', 'illegal', 'drugs'):
+        ScreeningTerm.objects.get_or_create(term=term)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0006_near_duplicate_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScreeningTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100, unique=True)),
+                ('whole_word', models.BooleanField(default=True, help_text='Only match the term as a whole word or phrase')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['term'],
+            },
+        ),
+        migrations.AddField(
+            model_name='dare',
+            name='screening_flags',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.AddField(
+            model_name='darecompletion',
+            name='screening_flags',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+        migrations.RunPython(populate_screening_terms, migrations.RunPython.noop),
+    ]
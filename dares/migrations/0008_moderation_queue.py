@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def queue_pending_dares(apps, schema_editor):
+    # Oldest first; `moderation_queue --rebuild` applies the full priorities
+    Dare = apps.get_model('dares', 'Dare')
+    ModerationTask = apps.get_model('dares', 'ModerationTask')
+    pending = Dare.objects.filter(status='pending').values_list('pk', 'created_at')
+    ModerationTask.objects.bulk_create(
+        (ModerationTask(dare_id=pk, priority_at=created_at) for pk, created_at in pending.iterator()),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0007_content_screening'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationTask',
+            fields=[
+                ('dare', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='moderation_task', serialize=False, to='dares.dare')),
+                ('priority_at', models.DateTimeField()),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('claimed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='moderation_claims', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['priority_at'], name='moderation_priority_idx'), models.Index(fields=['claimed_by', 'lease_expires_at'], name='moderation_claims_idx')],
+            },
+        ),
+        migrations.RunPython(queue_pending_dares, migrations.RunPython.noop),
+    ]
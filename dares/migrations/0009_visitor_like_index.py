@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0008_moderation_queue'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='darelike',
+            index=models.Index(fields=['user_email', 'dare'], name='like_email_dare_idx'),
+        ),
+    ]
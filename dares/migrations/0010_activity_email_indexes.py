@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0009_visitor_like_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(fields=['email', '-created_at'], name='dare_email_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='darecompletion',
+            index=models.Index(fields=['completer_email', '-completed_at'], name='completion_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='darelike',
+            index=models.Index(fields=['user_email', '-created_at'], name='like_email_created_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0010_activity_email_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewerSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('day', models.DateField(blank=True, null=True)),
+                ('registers', models.BinaryField()),
+                ('estimate', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dare', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='viewer_sketches', to='dares.dare')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('dare__isnull', False), ('day__isnull', True)), fields=['-estimate'], name='viewer_sketch_dare_total_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0011_viewer_sketches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DareSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('counts', models.BinaryField()),
+                ('dare', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='series', to='dares.dare')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('dare', 'year'), name='dare_series_unique'), models.UniqueConstraint(condition=models.Q(('dare__isnull', True)), fields=('year',), name='site_series_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0012_engagement_series'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DareRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('computed_at', models.DateTimeField()),
+                ('dare', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='dares.dare')),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_for', to='dares.dare')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['computed_at'], name='recommendation_computed_idx')],
+                'constraints': [models.UniqueConstraint(fields=('dare', 'rank'), name='dare_recommendation_rank_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:20
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0014_content_versions'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='darecompletion',
+            name='completion_email_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='darelike',
+            name='like_email_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='dare',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.OrderBy(models.F('created_at'), descending=True), name='dare_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='darecompletion',
+            index=models.Index(django.db.models.functions.text.Lower('completer_email'), models.OrderBy(models.F('completed_at'), descending=True), name='completion_email_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='darelike',
+            index=models.Index(django.db.models.functions.text.Lower('user_email'), models.OrderBy(models.F('created_at'), descending=True), name='like_email_lower_idx'),
+        ),
+    ]
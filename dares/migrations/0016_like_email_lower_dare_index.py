@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:40
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dares', '0015_activity_email_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='darelike',
+            name='like_email_dare_idx',
+        ),
+        migrations.AddIndex(
+            model_name='darelike',
+            index=models.Index(django.db.models.functions.text.Lower('user_email'), models.F('dare'), name='like_email_dare_idx'),
+        ),
+    ]
@@ -1,9 +1,15 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.urls import reverse
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import User
 from django.utils.text import slugify
-import uuid
+from django.core.cache import cache
+
+from . import events
+from .caching import get_or_build
+from .db import aincrement_counter, increment_counter, new_dare_id
+from .signals import dare_engaged
 
 class Category(models.Model):
     CATEGORY_CHOICES = [
@@ -82,7 +88,7 @@ class Dare(models.Model):
         message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
     )
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_dare_id, editable=False)
     title = models.CharField(max_length=200, help_text="Give your dare a catchy title")
     slug = models.SlugField(unique=True, blank=True)
     
@@ -127,6 +133,7 @@ class Dare(models.Model):
     is_approved = models.BooleanField(default=False)
     is_featured = models.BooleanField(default=False)
     rejection_reason = models.TextField(blank=True)
+    screening_flags = models.JSONField(default=list, blank=True, editable=False)
     
     views_count = models.PositiveIntegerField(default=0)
     likes_count = models.PositiveIntegerField(default=0)
@@ -142,6 +149,46 @@ class Dare(models.Model):
             models.Index(fields=['status', 'is_approved']),
             models.Index(fields=['category', 'difficulty']),
             models.Index(fields=['-created_at']),
+            # Submitters' dares (moderation's reputation lookup)
+            models.Index(fields=['email', '-created_at'], name='dare_email_created_idx'),
+            # A submitter's dares, newest first, matched ignoring case (activity, quota)
+            models.Index(Lower('email'), models.F('created_at').desc(), name='dare_email_lower_idx'),
+            # Partial indexes for the public list/sort paths, which always
+            # filter on is_approved.
+            models.Index(
+                fields=['-created_at'], name='dare_approved_created_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            models.Index(
+                fields=['-views_count', '-created_at'], name='dare_approved_views_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            models.Index(
+                fields=['-likes_count', '-created_at'], name='dare_approved_likes_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            models.Index(
+                fields=['-completions_count'], name='dare_approved_completions_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            models.Index(
+                fields=['title'], name='dare_approved_title_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            models.Index(
+                fields=['category', '-created_at'], name='dare_approved_category_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            models.Index(
+                fields=['difficulty', '-created_at'], name='dare_approved_difficulty_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            models.Index(
+                fields=['-created_at'], name='dare_featured_created_idx',
+                condition=models.Q(is_approved=True, is_featured=True),
+            ),
+            # Exact-title duplicate checks compare LOWER(title)
+            models.Index(Lower('title'), name='dare_title_lower_idx'),
         ]
 
     def __str__(self):
@@ -156,22 +203,31 @@ class Dare(models.Model):
                 self.slug = f"{original_slug}-{counter}"
                 counter += 1
         
+        newly_approved = False
         if self.status == 'approved':
             self.is_approved = True
             if not self.approved_at:
                 from django.utils import timezone
                 self.approved_at = timezone.now()
+                newly_approved = True
         elif self.status == 'featured':
             self.is_approved = True
             self.is_featured = True
             if not self.approved_at:
                 from django.utils import timezone
                 self.approved_at = timezone.now()
+                newly_approved = True
         else:
             self.is_approved = False
             self.is_featured = False
             
         super().save(*args, **kwargs)
+        
+        if newly_approved:
+            events.publish(
+                'dare_approved', self, title=self.title, category=self.category.name,
+                url=self.get_absolute_url(),
+            )
 
     def get_absolute_url(self):
         return reverse('dares:dare_detail', kwargs={'slug': self.slug})
@@ -187,16 +243,160 @@ class Dare(models.Model):
         return colors.get(self.difficulty.name, '#6B7280')
     
     def increment_views(self):
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        increment_counter(self, 'views_count')
+        dare_engaged.send(sender=self.__class__, dare=self, kind='view')
     
     def increment_likes(self):
-        self.likes_count += 1
-        self.save(update_fields=['likes_count'])
+        increment_counter(self, 'likes_count')
+        dare_engaged.send(sender=self.__class__, dare=self, kind='like')
+    
+    def decrement_likes(self):
+        increment_counter(self, 'likes_count', -1)
     
     def increment_completions(self):
-        self.completions_count += 1
-        self.save(update_fields=['completions_count'])
+        increment_counter(self, 'completions_count')
+        dare_engaged.send(sender=self.__class__, dare=self, kind='completion')
+    
+    async def aincrement_likes(self):
+        await aincrement_counter(self, 'likes_count')
+        await dare_engaged.asend(sender=self.__class__, dare=self, kind='like')
+    
+    async def adecrement_likes(self):
+        await aincrement_counter(self, 'likes_count', -1)
+    
+    async def aincrement_completions(self):
+        await aincrement_counter(self, 'completions_count')
+        await dare_engaged.asend(sender=self.__class__, dare=self, kind='completion')
+
+class TrendingScore(models.Model):
+    """Time-decayed engagement score of an approved dare; see dares.trending"""
+    dare = models.OneToOneField(Dare, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score'], name='trending_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.dare_id}: {self.score:.3f}"
+
+class ViewerSketch(models.Model):
+    """HyperLogLog sketch of the visitors of a dare or the site, per day or all time; see dares.viewers"""
+    key = models.CharField(max_length=64, unique=True)
+    dare = models.ForeignKey(Dare, on_delete=models.CASCADE, null=True, blank=True, related_name='viewer_sketches')
+    day = models.DateField(null=True, blank=True)
+    registers = models.BinaryField()
+    estimate = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # Dares with the most unique viewers (stats page)
+            models.Index(
+                fields=['-estimate'], name='viewer_sketch_dare_total_idx',
+                condition=models.Q(day__isnull=True, dare__isnull=False),
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.key}: ~{self.estimate}"
+
+class DareSeries(models.Model):
+    """A year of daily engagement counters for one dare (or the site, with no dare); see dares.series"""
+    dare = models.ForeignKey(Dare, on_delete=models.CASCADE, null=True, blank=True, related_name='series')
+    year = models.PositiveSmallIntegerField()
+    counts = models.BinaryField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dare', 'year'], name='dare_series_unique'),
+            models.UniqueConstraint(fields=['year'], condition=models.Q(dare__isnull=True), name='site_series_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.dare_id or 'site'}: {self.year}"
+
+class DareRecommendation(models.Model):
+    """A dare ranked among the co-engagement recommendations of another; see dares.recommendations"""
+    dare = models.ForeignKey(Dare, on_delete=models.CASCADE, related_name='recommendations')
+    recommended = models.ForeignKey(Dare, on_delete=models.CASCADE, related_name='recommended_for')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dare', 'rank'], name='dare_recommendation_rank_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['computed_at'], name='recommendation_computed_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.dare_id} -> {self.recommended_id} ({self.score:.3f})"
+
+class DareSignature(models.Model):
+    """MinHash signature of a dare's title and text; see dares.similarity"""
+    dare = models.OneToOneField(Dare, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+    
+    def __str__(self):
+        return str(self.dare_id)
+
+class DareSignatureBand(models.Model):
+    """One LSH band hash of a dare's signature; dares sharing one are duplicate candidates"""
+    dare = models.ForeignKey(Dare, on_delete=models.CASCADE, related_name='signature_bands')
+    band_hash = models.BigIntegerField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['band_hash', 'dare'], name='signature_band_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.dare_id}: {self.band_hash}"
+
+class ModerationTask(models.Model):
+    """A pending dare in the moderation queue and its reviewer claim; see dares.moderation"""
+    dare = models.OneToOneField(Dare, on_delete=models.CASCADE, primary_key=True, related_name='moderation_task')
+    priority_at = models.DateTimeField()
+    claimed_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='moderation_claims',
+    )
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['priority_at'], name='moderation_priority_idx'),
+            models.Index(fields=['claimed_by', 'lease_expires_at'], name='moderation_claims_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.dare_id} ({self.claimed_by or 'unclaimed'})"
+
+class ScreeningTerm(models.Model):
+    """A word or phrase that user-submitted text may not contain; see dares.screening"""
+    term = models.CharField(max_length=100, unique=True)
+    whole_word = models.BooleanField(default=True, help_text="Only match the term as a whole word or phrase")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['term']
+    
+    def __str__(self):
+        return self.term
+
+class ContentVersion(models.Model):
+    """Current version of a named content area, for conditional GETs; see dares.conditional"""
+    name = models.CharField(max_length=32, primary_key=True)
+    token = models.CharField(max_length=12)
+    changed_at = models.DateTimeField()
+    
+    def __str__(self):
+        return f"{self.name}: {self.token}"
 
 class DareCompletion(models.Model):
     dare = models.ForeignKey(Dare, on_delete=models.CASCADE, related_name='completions')
@@ -206,10 +406,23 @@ class DareCompletion(models.Model):
     completion_image = models.URLField(blank=True, help_text="Link to image/video proof (optional)")
     completed_at = models.DateTimeField(auto_now_add=True)
     is_verified = models.BooleanField(default=False)
+    screening_flags = models.JSONField(default=list, blank=True, editable=False)
     
     class Meta:
         ordering = ['-completed_at']
         unique_together = ['dare', 'completer_email']
+        indexes = [
+            models.Index(
+                fields=['-completed_at'], name='completion_verified_idx',
+                condition=models.Q(is_verified=True),
+            ),
+            models.Index(
+                fields=['dare', '-completed_at'], name='completion_dare_verified_idx',
+                condition=models.Q(is_verified=True),
+            ),
+            # An email's completions, newest first, matched ignoring case (activity)
+            models.Index(Lower('completer_email'), models.F('completed_at').desc(), name='completion_email_lower_idx'),
+        ]
     
     def __str__(self):
         return f"{self.completer_name} completed '{self.dare.title}'"
@@ -221,6 +434,12 @@ class DareLike(models.Model):
     
     class Meta:
         unique_together = ['dare', 'user_email']
+        indexes = [
+            # "Which of these dares has this visitor liked?", ignoring case
+            models.Index(Lower('user_email'), models.F('dare'), name='like_email_dare_idx'),
+            # A visitor's likes, newest first, matched ignoring case (activity)
+            models.Index(Lower('user_email'), models.F('created_at').desc(), name='like_email_lower_idx'),
+        ]
     
     def __str__(self):
         return f"Like on '{self.dare.title}'"
@@ -237,6 +456,10 @@ class SiteConfiguration(models.Model):
     max_dares_per_user = models.PositiveIntegerField(default=5)
     featured_dares_count = models.PositiveIntegerField(default=6)
     
+    CACHE_KEY = 'dares:site-configuration'
+    # Saving clears only this process's copy; others catch up within this
+    CACHE_TIMEOUT = 60
+    
     class Meta:
         verbose_name = "Site Configuration"
         verbose_name_plural = "Site Configuration"
@@ -247,8 +470,13 @@ class SiteConfiguration(models.Model):
     def save(self, *args, **kwargs):
         self.pk = 1
         super().save(*args, **kwargs)
+        cache.delete(self.CACHE_KEY)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.delete(self.CACHE_KEY)
+        return result
     
     @classmethod
     def get_config(cls):
-        config, created = cls.objects.get_or_create(pk=1)
-        return config
\ No newline at end of file
+        return get_or_build(cls.CACHE_KEY, lambda: cls.objects.get_or_create(pk=1)[0], cls.CACHE_TIMEOUT)
\ No newline at end of file
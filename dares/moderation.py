@@ -0,0 +1,191 @@
+"""
+Moderation queue for pending dares.
+
+Every pending dare has a ``ModerationTask`` row; the row goes away as soon
+as the dare is approved, rejected or deleted, so the queue never scans the
+rest of the Dare table. Tasks are served in ``priority_at`` order: the
+dare's submission time moved earlier by a few hours per screening flag and
+per earlier approval of the submitter, and later per earlier rejection.
+Because every task ages at the same rate, that ordering matches "oldest
+first, adjusted for risk and trust" at any moment without recomputing it.
+
+Reviewers claim a batch of tasks for ``MODERATION_LEASE_SECONDS``. On
+PostgreSQL the claim is ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent
+reviewers each take different rows without waiting on one another. SQLite
+has no row locks; there each candidate is claimed with an UPDATE that only
+succeeds if the lease is still the one that was read, and a reviewer who
+loses that race moves on to the next row. An expired lease simply makes
+the task claimable again.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+DEFAULT_LEASE_SECONDS = 600
+
+# Hours a dare moves up (or down, if negative) the queue per occurrence
+DEFAULT_PRIORITY_HOURS = {'screening_flag': 6, 'approved_before': 2, 'rejected_before': -2}
+HISTORY_CAP = 5
+
+
+def lease_seconds():
+    return getattr(settings, 'MODERATION_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)
+
+
+def priority_hours():
+    return getattr(settings, 'MODERATION_PRIORITY_HOURS', DEFAULT_PRIORITY_HOURS)
+
+
+def submitter_history(emails):
+    """``{email: (approved, rejected)}`` counts of earlier reviewed dares."""
+    from .models import Dare
+
+    rows = Dare.objects.filter(email__in=emails, status__in=('approved', 'featured', 'rejected')).values(
+        'email',
+    ).annotate(
+        approved=Count('pk', filter=~Q(status='rejected')),
+        rejected=Count('pk', filter=Q(status='rejected')),
+    )
+    return {row['email']: (row['approved'], row['rejected']) for row in rows}
+
+
+def priority_at(dare, approved=0, rejected=0):
+    hours = priority_hours()
+    shift = (
+        len(dare.screening_flags or ()) * hours.get('screening_flag', 0)
+        + min(approved, HISTORY_CAP) * hours.get('approved_before', 0)
+        + min(rejected, HISTORY_CAP) * hours.get('rejected_before', 0)
+    )
+    return (dare.created_at or timezone.now()) - timedelta(hours=shift)
+
+
+def enqueue(dares):
+    """
+    Queue the pending ``dares`` (refreshing the priority of ones already
+    queued, without touching their claims) and drop the rest from the queue.
+    """
+    from .models import ModerationTask
+
+    pending = [dare for dare in dares if dare.status == 'pending']
+    done = [dare.pk for dare in dares if dare.status != 'pending']
+    if done:
+        ModerationTask.objects.filter(dare_id__in=done).delete()
+    if pending:
+        history = submitter_history({dare.email for dare in pending})
+        ModerationTask.objects.bulk_create(
+            [
+                ModerationTask(dare_id=dare.pk, priority_at=priority_at(dare, *history.get(dare.email, (0, 0))))
+                for dare in pending
+            ],
+            update_conflicts=True, unique_fields=['dare'], update_fields=['priority_at'],
+        )
+    return len(pending)
+
+
+def rebuild(batch_size=2000):
+    """Re-queue every pending dare with its current priority and drop stale tasks."""
+    from .models import Dare, ModerationTask
+
+    ModerationTask.objects.exclude(dare__status='pending').delete()
+    pending = Dare.objects.filter(status='pending').only('pk', 'email', 'status', 'created_at', 'screening_flags')
+    queued = 0
+    last = None
+    while True:
+        page = list((pending if last is None else pending.filter(pk__gt=last)).order_by('pk')[:batch_size])
+        if not page:
+            return queued
+        last = page[-1].pk
+        queued += enqueue(page)
+
+
+def dare_saved(sender, instance, raw=False, **kwargs):
+    """post_save receiver keeping the queue in step with dare statuses."""
+    if not raw:
+        enqueue([instance])
+
+
+def available(now=None):
+    from .models import ModerationTask
+
+    now = now or timezone.now()
+    return ModerationTask.objects.filter(
+        Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now),
+    ).order_by('priority_at')
+
+
+def claim(user, limit=10):
+    """Claim up to ``limit`` of the highest-priority unclaimed tasks for ``user``; returns their dare ids."""
+    from .models import ModerationTask
+
+    now = timezone.now()
+    lease = {'claimed_by': user, 'lease_expires_at': now + timedelta(seconds=lease_seconds())}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(available(now).select_for_update(skip_locked=True).values_list('pk', flat=True)[:limit])
+            ModerationTask.objects.filter(pk__in=ids).update(**lease)
+        return ids
+
+    claimed, skipped = [], set()
+    while len(claimed) < limit:
+        wanted = limit - len(claimed)
+        candidates = list(
+            available(now).exclude(pk__in=skipped).values_list('pk', 'lease_expires_at')[:wanted * 2]
+        )
+        if not candidates:
+            break
+        for pk, expires in candidates:
+            if len(claimed) == limit:
+                break
+            # Compare-and-set on the lease that was read; a concurrent claim changes it
+            won = ModerationTask.objects.filter(pk=pk).filter(
+                Q(lease_expires_at__isnull=True) if expires is None else Q(lease_expires_at=expires),
+            ).update(**lease)
+            if won:
+                claimed.append(pk)
+            else:
+                skipped.add(pk)
+    return claimed
+
+
+def claimed_tasks(user):
+    """``user``'s live claims, highest priority first."""
+    from .models import ModerationTask
+
+    return ModerationTask.objects.filter(
+        claimed_by=user, lease_expires_at__gt=timezone.now(),
+    ).select_related('dare__category', 'dare__difficulty').order_by('priority_at')
+
+
+def release(user, dare_ids=None):
+    from .models import ModerationTask
+
+    tasks = ModerationTask.objects.filter(claimed_by=user)
+    if dare_ids is not None:
+        tasks = tasks.filter(pk__in=dare_ids)
+    return tasks.update(claimed_by=None, lease_expires_at=None)
+
+
+def decide(user, dare_id, status, reason=''):
+    """
+    Approve or reject a dare ``user`` holds a live claim on. Returns the dare,
+    or ``None`` if the claim has lapsed (someone else may have it now).
+    """
+    from .models import Dare, ModerationTask
+
+    # Renewing the lease is the claim check: a write first, so SQLite never
+    # has to upgrade a read lock that another reviewer is also holding.
+    now = timezone.now()
+    held = ModerationTask.objects.filter(pk=dare_id, claimed_by=user, lease_expires_at__gt=now).update(
+        lease_expires_at=now + timedelta(seconds=lease_seconds()),
+    )
+    if not held:
+        return None
+    dare = Dare.objects.select_related('category').get(pk=dare_id)
+    dare.status = status
+    dare.rejection_reason = reason if status == 'rejected' else ''
+    dare.save()  # dare_saved drops the task
+    return dare
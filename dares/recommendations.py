@@ -0,0 +1,168 @@
+"""
+"People who did this also did" recommendations, built offline.
+
+Every like and completion is an (email, dare) entry of a sparse
+dare-by-visitor matrix, held as a set of dares per email. For a target
+dare, walking its engagers' sets counts co-occurrences with every other
+dare; the similarity is their cosine, ``common / sqrt(n_a * n_b)`` with
+``n`` the number of distinct engagers, so popular dares do not crowd out
+everything else. Visitors with more than ``MAX_VISITOR_DARES`` dares are
+skipped: they add quadratic work and little signal. Pairs sharing fewer
+than ``RECOMMENDATION_MIN_COMMON`` visitors are ignored.
+
+The top ``RECOMMENDATION_TOP_K`` approved dares per dare are stored as
+``DareRecommendation`` rows, ranked, so the detail page reads them in one
+indexed query. A refresh recomputes the dares engaged with since the
+previous build together with every dare sharing an engager with them,
+since a new like or completion changes both sides' scores. Unlikes and
+deleted rows leave no timestamp to find, so a refresh turns into a full
+build once the oldest stored list is ``RECOMMENDATION_FULL_BUILD_SECONDS``
+old (a day by default).
+"""
+import heapq
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+DEFAULT_TOP_K = 8
+DEFAULT_MIN_COMMON = 2
+DEFAULT_FULL_BUILD_SECONDS = 24 * 3600
+MAX_VISITOR_DARES = 500
+
+
+def top_k():
+    return getattr(settings, 'RECOMMENDATION_TOP_K', DEFAULT_TOP_K)
+
+
+def min_common():
+    return getattr(settings, 'RECOMMENDATION_MIN_COMMON', DEFAULT_MIN_COMMON)
+
+
+def full_build_seconds():
+    return getattr(settings, 'RECOMMENDATION_FULL_BUILD_SECONDS', DEFAULT_FULL_BUILD_SECONDS)
+
+
+def load_matrix(batch_size=5000):
+    """``({email: {dare_id}}, {dare_id: {email}})`` from every like and completion."""
+    from .models import DareCompletion, DareLike
+
+    by_visitor, by_dare = defaultdict(set), defaultdict(set)
+    for rows in (
+        DareLike.objects.values_list('user_email', 'dare_id'),
+        DareCompletion.objects.values_list('completer_email', 'dare_id'),
+    ):
+        for email, dare_id in rows.iterator(chunk_size=batch_size):
+            by_visitor[email].add(dare_id)
+            by_dare[dare_id].add(email)
+    return by_visitor, by_dare
+
+
+def similar(dare_id, by_visitor, by_dare, candidates, limit, minimum):
+    """``[(other_id, score), ...]`` best first, restricted to ``candidates``."""
+    common = defaultdict(int)
+    for email in by_dare.get(dare_id, ()):
+        dares = by_visitor[email]
+        if len(dares) > MAX_VISITOR_DARES:
+            continue
+        for other in dares:
+            common[other] += 1
+    common.pop(dare_id, None)
+    size = len(by_dare.get(dare_id, ()))
+    scored = (
+        (other, count / math.sqrt(size * len(by_dare[other])))
+        for other, count in common.items()
+        if count >= minimum and other in candidates
+    )
+    # Ties go to the lower id so rebuilds are stable
+    return heapq.nsmallest(limit, scored, key=lambda pair: (-pair[1], str(pair[0])))
+
+
+def co_engaged(dare_ids, by_visitor, by_dare):
+    """``dare_ids`` and every dare sharing a (not skipped) engager with one of them."""
+    expanded = set(dare_ids)
+    for dare_id in dare_ids:
+        for email in by_dare.get(dare_id, ()):
+            dares = by_visitor[email]
+            if len(dares) <= MAX_VISITOR_DARES:
+                expanded |= dares
+    return expanded
+
+
+def changed_since(since):
+    """Dares liked or completed after ``since``."""
+    from .models import DareCompletion, DareLike
+
+    return (
+        set(DareLike.objects.filter(created_at__gt=since).values_list('dare_id', flat=True))
+        | set(DareCompletion.objects.filter(completed_at__gt=since).values_list('dare_id', flat=True))
+    )
+
+
+def built_range():
+    """``(oldest, latest)`` ``computed_at`` of the stored lists, ``None`` for both before the first build."""
+    from .models import DareRecommendation
+    built = DareRecommendation.objects.aggregate(oldest=Min('computed_at'), latest=Max('computed_at'))
+    return built['oldest'], built['latest']
+
+
+def build(targets=None, batch_size=500, neighbours=False):
+    """
+    Recompute the recommendations of ``targets`` (every engaged dare when
+    ``None``) and replace their rows; with ``neighbours``, also of every dare
+    co-engaged with a target. Returns the number of dares written.
+    """
+    from .models import Dare, DareRecommendation
+
+    if targets is not None and not targets:
+        return 0
+    # Taken first, so engagement arriving during the build is picked up next time
+    now = timezone.now()
+    by_visitor, by_dare = load_matrix()
+    candidates = set(Dare.objects.filter(is_approved=True).values_list('pk', flat=True))
+    if neighbours and targets is not None:
+        targets = co_engaged(targets, by_visitor, by_dare)
+    if targets is None:
+        targets = set(by_dare)
+        # Dares nobody engages with any more lose their stale lists
+        stale = sorted(set(DareRecommendation.objects.values_list('dare_id', flat=True).distinct()) - targets, key=str)
+        for start in range(0, len(stale), batch_size):
+            DareRecommendation.objects.filter(dare_id__in=stale[start:start + batch_size]).delete()
+    targets = sorted(targets, key=str)
+    limit, minimum = top_k(), min_common()
+
+    for start in range(0, len(targets), batch_size):
+        batch = targets[start:start + batch_size]
+        rows = [
+            DareRecommendation(dare_id=dare_id, recommended_id=other, rank=rank, score=score, computed_at=now)
+            for dare_id in batch
+            for rank, (other, score) in enumerate(similar(dare_id, by_visitor, by_dare, candidates, limit, minimum))
+        ]
+        with transaction.atomic():
+            DareRecommendation.objects.filter(dare_id__in=batch).delete()
+            DareRecommendation.objects.bulk_create(rows)
+    return len(targets)
+
+
+def refresh(batch_size=500):
+    """
+    Rebuild the dares engaged with since the last build and their co-engaged
+    dares; everything on the first run or once the oldest list is due for a
+    full build.
+    """
+    oldest, latest = built_range()
+    if oldest is None or timezone.now() - oldest >= timedelta(seconds=full_build_seconds()):
+        return build(batch_size=batch_size)
+    return build(changed_since(latest), batch_size, neighbours=True)
+
+
+def recommended_for(dare, limit=4):
+    """Approved recommendations for ``dare``, best first, in one query."""
+    from .models import Dare
+    return Dare.objects.filter(recommended_for__dare=dare, is_approved=True).select_related(
+        'category', 'difficulty',
+    ).order_by('recommended_for__rank')[:limit]
@@ -0,0 +1,170 @@
+"""
+Content screening of user-submitted text against ``ScreeningTerm`` rows.
+
+Text and terms go through the same normalization (case and accents folded,
+common leetspeak digits and symbols mapped back to letters, runs of three
+or more of a character squeezed to two, punctuation turned into single
+spaces), then all active terms are compiled into one Aho-Corasick
+automaton. A scan walks each text once whatever the number of terms, and
+whole-word terms only match between spaces of the normalized text, so
+"hate" does not fire on "whatever".
+
+The automaton is built once per process and rebuilt when the ``screening``
+content version changes, which any save or delete of a term bumps. The
+version lives in the database, so every worker picks up a change on its
+next scan.
+"""
+import re
+import threading
+import unicodedata
+from collections import deque
+
+from django.db import transaction
+
+from . import conditional
+
+DARE_FIELDS = ('title', 'name', 'college', 'dare_text', 'required_items', 'safety_notes')
+COMPLETION_FIELDS = ('completer_name', 'completion_proof')
+
+LEET = str.maketrans({
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b', '@': 'a', '$': 's',
+})
+# Squeezed to two, not one, so doubled letters in terms ("kill") still match
+REPEATS = re.compile(r'(.)\1{2,}')
+NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = text.casefold().translate(LEET)
+    return NON_WORD.sub(' ', REPEATS.sub(r'\1\1', text)).strip()
+
+
+class Automaton:
+    """Aho-Corasick matcher over ``(term, whole_word)`` pairs."""
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for term, whole_word in terms:
+            pattern = normalize(term)
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                following = self.goto[state].get(char)
+                if following is None:
+                    following = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                    self.goto[state][char] = following
+                state = following
+            self.output[state] += ((len(pattern), whole_word, term),)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(char, 0)
+                self.output[following] += self.output[self.fail[following]]
+
+    def search(self, text):
+        """Terms found in ``text``, in order of first appearance."""
+        goto, fail, output = self.goto, self.fail, self.output
+        # Padding makes the word-boundary test a plain character check
+        text = f' {normalize(text)} '
+        found = {}
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, whole_word, term in output[state]:
+                if whole_word and (text[end - length] != ' ' or text[end + 1] != ' '):
+                    continue
+                found.setdefault(term, None)
+        return list(found)
+
+
+_lock = threading.Lock()
+_compiled = (None, Automaton(()))
+
+
+def get_automaton():
+    """The automaton for the active terms, rebuilt after the list changes."""
+    global _compiled
+    from .models import ScreeningTerm
+
+    token, _ = conditional.content_version('screening')
+    version, automaton = _compiled
+    if version != token:
+        with _lock:
+            version, automaton = _compiled
+            if version != token:
+                terms = ScreeningTerm.objects.filter(is_active=True).values_list('term', 'whole_word')
+                automaton = Automaton(terms.iterator())
+                _compiled = (token, automaton)
+    return automaton
+
+
+def screen(text):
+    return get_automaton().search(text)
+
+
+def screen_fields(values, fields, automaton=None):
+    """
+    ``{field: [term, ...]}`` for the fields of ``values`` that contain a term.
+    Loops over many rows fetch ``automaton`` once and pass it in.
+    """
+    automaton = automaton or get_automaton()
+    found = {}
+    for name in fields:
+        terms = automaton.search(values.get(name) or '')
+        if terms:
+            found[name] = terms
+    return found
+
+
+def flags_for(instance, fields, automaton=None):
+    """Sorted terms found anywhere in ``instance``'s screened fields."""
+    found = screen_fields({name: getattr(instance, name) for name in fields}, fields, automaton)
+    return sorted({term for terms in found.values() for term in terms})
+
+
+def rescreen(queryset, fields, batch_size=2000, progress=None):
+    """
+    Re-screen every row of ``queryset`` and store the terms it now matches
+    in ``screening_flags``. Returns ``(scanned, flagged, changed)``.
+    """
+    scanned = flagged = changed = 0
+    queryset = queryset.order_by('pk').only('pk', 'screening_flags', *fields)
+    last = None
+    while True:
+        # Keyset pages, so the writes never overlap an open read cursor
+        page = list((queryset if last is None else queryset.filter(pk__gt=last))[:batch_size])
+        if not page:
+            break
+        last = page[-1].pk
+        updated = []
+        automaton = get_automaton()
+        for row in page:
+            flags = flags_for(row, fields, automaton)
+            flagged += bool(flags)
+            if flags != row.screening_flags:
+                row.screening_flags = flags
+                updated.append(row)
+        if updated:
+            with transaction.atomic():
+                queryset.model.objects.bulk_update(updated, ['screening_flags'], batch_size=batch_size)
+        scanned += len(page)
+        changed += len(updated)
+        if progress:
+            progress(scanned)
+    return scanned, flagged, changed
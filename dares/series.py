@@ -0,0 +1,234 @@
+"""
+Daily engagement counts per dare, packed into one binary row per dare and year.
+
+A ``DareSeries`` row holds an ``array('I')`` of ``len(METRICS) * DAYS``
+unsigned counters, metric-major: the counter for metric ``m`` on day-of-year
+``d`` (1-based) sits at ``m * DAYS + d - 1``. That is 4.3 KB per dare per
+year whatever the traffic, stored little-endian so rows move between
+machines. Rows with no dare hold the site-wide totals, so site charts read
+one row per year instead of summing every dare.
+
+Engagements arrive through the ``dare_engaged`` signal and are counted per
+slot in a ``BatchBuffer``; a flush locks the affected rows, creating any
+that are missing, adds the pending counts and writes them back. Range
+reads slice the arrays, and sums across dares add whole arrays
+element-wise before slicing.
+"""
+import sys
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from operator import add
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .batching import BatchBuffer
+
+# dare_engaged kinds, in storage order; new metrics may only be appended
+METRICS = ('view', 'like', 'completion')
+DAYS = 366
+SLOTS = len(METRICS) * DAYS
+TYPECODE = 'I'
+
+
+def empty():
+    return array(TYPECODE, bytes(array(TYPECODE).itemsize * SLOTS))
+
+
+def unpack(blob):
+    counts = array(TYPECODE)
+    counts.frombytes(blob)
+    if sys.byteorder == 'big':
+        counts.byteswap()
+    if len(counts) < SLOTS:
+        counts.extend(bytes(SLOTS - len(counts)))
+    return counts
+
+
+def pack(counts):
+    if sys.byteorder == 'big':
+        counts = array(TYPECODE, counts)
+        counts.byteswap()
+    return counts.tobytes()
+
+
+def slot(metric, day):
+    return METRICS.index(metric) * DAYS + day.timetuple().tm_yday - 1
+
+
+def locked_rows(keys):
+    """``{(dare_id, year): row}`` for the existing rows among ``keys``, locked for update."""
+    from .models import DareSeries
+
+    rows = DareSeries.objects.select_for_update().filter(year__in={year for _, year in keys}).filter(
+        Q(dare_id__in={dare_id for dare_id, _ in keys if dare_id is not None}) | Q(dare__isnull=True),
+    )
+    return {(row.dare_id, row.year): row for row in rows if (row.dare_id, row.year) in keys}
+
+
+def merge(increments):
+    """
+    Add ``{(dare_id, year): {slot: count}}`` to the matching rows and to the
+    site rows, creating rows as needed.
+    """
+    from .models import Dare, DareSeries
+
+    live = set(Dare.objects.filter(pk__in={dare_id for dare_id, _ in increments}).values_list('pk', flat=True))
+    combined = {}
+    for (dare_id, year), counts in increments.items():
+        if dare_id not in live:
+            continue
+        for key in ((dare_id, year), (None, year)):
+            combined.setdefault(key, Counter()).update(counts)
+    if not combined:
+        return
+
+    with transaction.atomic():
+        rows = locked_rows(combined)
+        missing = combined.keys() - rows.keys()
+        if missing:
+            # Another worker's flush may create some of these rows first;
+            # insert empty rows past it, then lock and add to whichever won
+            DareSeries.objects.bulk_create([
+                DareSeries(dare_id=dare_id, year=year, counts=pack(empty())) for dare_id, year in missing
+            ], ignore_conflicts=True)
+            rows.update(locked_rows(missing))
+        for key, counts in combined.items():
+            values = unpack(rows[key].counts)
+            for position, count in counts.items():
+                values[position] += count
+            rows[key].counts = pack(values)
+        DareSeries.objects.bulk_update(rows.values(), ['counts'])
+
+
+def reset(metrics, batch_size=5000):
+    """Zero ``metrics`` in every stored row."""
+    from .models import DareSeries
+
+    zeros = array(TYPECODE, bytes(array(TYPECODE).itemsize * DAYS))
+    batch = []
+    for row in DareSeries.objects.select_for_update().order_by('pk').iterator(chunk_size=batch_size):
+        values = unpack(row.counts)
+        for metric in metrics:
+            start = METRICS.index(metric) * DAYS
+            values[start:start + DAYS] = zeros
+        row.counts = pack(values)
+        batch.append(row)
+        if len(batch) >= batch_size:
+            DareSeries.objects.bulk_update(batch, ['counts'])
+            batch = []
+    DareSeries.objects.bulk_update(batch, ['counts'])
+
+
+def apply_counts(batch):
+    """Flush ``{(dare_id, year, slot): count}`` from the buffer."""
+    increments = {}
+    for (dare_id, year, position), count in batch.items():
+        increments.setdefault((dare_id, year), Counter())[position] += count
+    merge(increments)
+
+
+buffer = BatchBuffer(
+    apply_counts, add,
+    max_items=getattr(settings, 'SERIES_BUFFER_SIZE', 2000),
+    max_age=getattr(settings, 'SERIES_BUFFER_SECONDS', 10),
+)
+
+
+def record_engagement(sender, dare, kind, **kwargs):
+    if kind in METRICS:
+        today = timezone.localdate()
+        buffer.add((dare.pk, today.year, slot(kind, today)), 1)
+
+
+def rebuild_history(batch_size=5000):
+    """
+    Recount likes and completions from their timestamps (views carry none
+    and are left as recorded). Every stored row is reset first, so days
+    whose likes or completions have since been deleted drop to zero too.
+    Returns the number of events counted.
+    """
+    from .models import DareCompletion, DareLike
+
+    increments = {}
+    events = 0
+    for metric, queryset, field in (
+        ('like', DareLike.objects.all(), 'created_at'),
+        ('completion', DareCompletion.objects.all(), 'completed_at'),
+    ):
+        for dare_id, when in queryset.values_list('dare_id', field).iterator(chunk_size=batch_size):
+            day = timezone.localdate(when)
+            increments.setdefault((dare_id, day.year), Counter())[slot(metric, day)] += 1
+            events += 1
+    with transaction.atomic():
+        reset(('like', 'completion'), batch_size)
+        merge(increments)
+    return events
+
+
+def days_between(start, end):
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def window(rows, metric, start, end):
+    """Daily counts of ``metric`` from ``start`` to ``end`` out of ``{year: array}``."""
+    counts = []
+    day = start
+    while day <= end:
+        last = min(end, date(day.year, 12, 31))
+        values = rows.get(day.year)
+        length = (last - day).days + 1
+        if values is None:
+            counts.extend([0] * length)
+        else:
+            first = slot(metric, day)
+            counts.extend(values[first:first + length])
+        day = last + timedelta(days=1)
+    return counts
+
+
+def load(dare_ids, start, end):
+    """``{dare_id: {year: array}}`` for the dares (``None`` for the site) over the range."""
+    from .models import DareSeries
+
+    ids = [dare_id for dare_id in dare_ids if dare_id is not None]
+    lookup = Q(dare_id__in=ids)
+    if None in dare_ids:
+        lookup |= Q(dare__isnull=True)
+    rows = {}
+    for dare_id, year, blob in DareSeries.objects.filter(lookup, year__range=(start.year, end.year)).values_list(
+        'dare_id', 'year', 'counts',
+    ):
+        rows.setdefault(dare_id, {})[year] = unpack(blob)
+    return rows
+
+
+def total(rows_by_dare):
+    """Element-wise sum of several dares' ``{year: array}``."""
+    summed = {}
+    for rows in rows_by_dare:
+        for year, values in rows.items():
+            summed[year] = array('Q', map(add, summed[year], values)) if year in summed else array('Q', values)
+    return summed
+
+
+def query(dare_ids, metrics, start, end):
+    """
+    Daily counts for ``dare_ids`` (``None`` for site-wide) from ``start`` to
+    ``end`` inclusive: ``{'days': [...], 'series': {dare_id: {metric: [...]}},
+    'total': {metric: [...]}}``, ``total`` summing the requested dares.
+    """
+    rows = load(dare_ids, start, end)
+    series = {
+        dare_id: {metric: window(rows.get(dare_id, {}), metric, start, end) for metric in metrics}
+        for dare_id in dare_ids
+    }
+    summed = total(rows.get(dare_id, {}) for dare_id in dare_ids)
+    return {
+        'days': [day.isoformat() for day in days_between(start, end)],
+        'series': series,
+        'total': {metric: window(summed, metric, start, end) for metric in metrics},
+    }
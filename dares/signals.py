@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent with ``dare`` and ``kind`` ('view', 'like' or 'completion') whenever a
+# visitor engages with an approved dare.
+dare_engaged = Signal()
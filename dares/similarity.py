@@ -0,0 +1,207 @@
+"""
+Near-duplicate detection for dares.
+
+A dare's title and text are normalized (case, accents, punctuation and
+whitespace folded away) and cut into overlapping character shingles. The
+MinHash signature of that shingle set keeps, for each of ``NUM_PERM``
+random hash permutations, the smallest hashed shingle; two signatures agree
+in a given position with probability equal to the Jaccard similarity of
+the shingle sets, so the fraction of agreeing positions estimates it.
+
+Signatures are cut into ``BANDS`` bands of ``ROWS`` values and each band is
+hashed into a ``DareSignatureBand`` row. Dares sharing any band hash are
+candidate duplicates; with 32 bands of 3 rows a pair at similarity ``s``
+shares a band with probability ``1 - (1 - s^3)^32`` (0.99 at s=0.5, under
+0.01 for unrelated text at s=0.05), so an indexed ``band_hash IN (...)``
+lookup finds likely copies without comparing against every dare. Candidates are then checked against
+``DUPLICATE_SIMILARITY_THRESHOLD`` using their stored signatures.
+"""
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+import zlib
+from itertools import combinations
+
+from django.conf import settings
+from django.db import transaction
+
+NUM_PERM = 96
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.5
+# Bounds the work done for text that many dares share (templated dares)
+MAX_CANDIDATES = 200
+MAX_BUCKET_PAIRS = 50
+
+# Universal hashing (a * x + b) mod p; the seed is fixed so signatures stay
+# comparable across processes and deployments.
+PRIME = (1 << 61) - 1
+_rng = random.Random(20260101)
+PERMUTATIONS = [(_rng.randrange(1, PRIME), _rng.randrange(0, PRIME)) for _ in range(NUM_PERM)]
+SIGNATURE = struct.Struct(f'<{NUM_PERM}Q')
+BAND = struct.Struct(f'<B{ROWS}Q')
+
+NON_WORD = re.compile(r'[\W_]+')
+
+
+def threshold():
+    return getattr(settings, 'DUPLICATE_SIMILARITY_THRESHOLD', DEFAULT_THRESHOLD)
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return NON_WORD.sub(' ', text.casefold()).strip()
+
+
+def shingles(title, dare_text):
+    text = normalize(f'{title} {dare_text}')
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(title, dare_text):
+    """MinHash signature of a dare as a tuple of ``NUM_PERM`` integers."""
+    hashes = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles(title, dare_text)]
+    if not hashes:
+        return (PRIME,) * NUM_PERM
+    return tuple(min((a * x + b) % PRIME for x in hashes) for a, b in PERMUTATIONS)
+
+
+def pack(signature):
+    return SIGNATURE.pack(*signature)
+
+
+def unpack(data):
+    return SIGNATURE.unpack(bytes(data))
+
+
+def band_hashes(signature):
+    """One signed 64-bit hash per band, salted with the band number."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(BAND.pack(band, *signature[band * ROWS:(band + 1) * ROWS]), digest_size=8).digest(),
+            'little', signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(a == b for a, b in zip(first, second)) / NUM_PERM
+
+
+# --- Index maintenance ------------------------------------------------------
+
+def index_dares(dares):
+    """(Re)write the signature and band rows of ``dares``; returns how many were written."""
+    from .models import DareSignature, DareSignatureBand
+
+    signatures, bands = [], []
+    for dare in dares:
+        signature = minhash(dare.title, dare.dare_text)
+        signatures.append(DareSignature(dare_id=dare.pk, signature=pack(signature)))
+        bands.extend(
+            DareSignatureBand(dare_id=dare.pk, band_hash=band_hash) for band_hash in band_hashes(signature)
+        )
+    if not signatures:
+        return 0
+    ids = [signature.dare_id for signature in signatures]
+    with transaction.atomic():
+        DareSignatureBand.objects.filter(dare_id__in=ids).delete()
+        DareSignature.objects.filter(dare_id__in=ids).delete()
+        DareSignature.objects.bulk_create(signatures)
+        DareSignatureBand.objects.bulk_create(bands)
+    return len(signatures)
+
+
+def dare_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    """post_save receiver keeping a dare's signature in step with its text."""
+    from .models import DareSignature
+
+    if raw or (update_fields is not None and not {'title', 'dare_text'} & set(update_fields)):
+        return
+    signature = pack(minhash(instance.title, instance.dare_text))
+    stored = DareSignature.objects.filter(dare_id=instance.pk).values_list('signature', flat=True).first()
+    if stored is None or bytes(stored) != signature:
+        index_dares([instance])
+
+
+# --- Lookups ----------------------------------------------------------------
+
+def find_similar(title, dare_text, exclude=None, limit=5):
+    """
+    ``[(similarity, dare), ...]`` for indexed dares that look like a copy of
+    ``title`` + ``dare_text``, most similar first. Rejected dares are not
+    candidates; when more than ``MAX_CANDIDATES`` share a band, approved
+    dares are checked first.
+    """
+    from .models import DareSignature, DareSignatureBand
+
+    signature = minhash(title, dare_text)
+    candidates = DareSignature.objects.filter(
+        dare_id__in=DareSignatureBand.objects.filter(band_hash__in=band_hashes(signature)).values('dare_id'),
+    ).exclude(dare__status='rejected').select_related('dare').order_by('-dare__is_approved', 'dare_id')
+    if exclude is not None:
+        candidates = candidates.exclude(dare_id=exclude)
+
+    found = []
+    for candidate in candidates[:MAX_CANDIDATES]:
+        score = similarity(signature, unpack(candidate.signature))
+        if score >= threshold():
+            found.append((score, candidate.dare))
+    found.sort(key=lambda item: -item[0])
+    return found[:limit]
+
+
+def duplicate_pairs(min_similarity=None, chunk_size=5000):
+    """
+    Yield ``(similarity, dare_id, other_id)`` for every indexed pair of dares
+    sharing a band and at least ``min_similarity`` alike. Reads the band rows
+    in bucket order, so only dares with a colliding band are ever compared.
+    Members of a bucket holding more than ``MAX_BUCKET_PAIRS`` dares are only
+    compared with its first member.
+    """
+    from .models import DareSignature, DareSignatureBand
+
+    min_similarity = threshold() if min_similarity is None else min_similarity
+    candidates = set()
+
+    def add_bucket(members):
+        members = sorted(members)
+        if len(members) <= MAX_BUCKET_PAIRS:
+            candidates.update(combinations(members, 2))
+        else:
+            candidates.update((members[0], member) for member in members[1:])
+
+    bucket, members = None, []
+    rows = DareSignatureBand.objects.order_by('band_hash', 'dare_id').values_list('band_hash', 'dare_id')
+    for band_hash, dare_id in rows.iterator(chunk_size=chunk_size):
+        if band_hash != bucket:
+            add_bucket(members)
+            bucket, members = band_hash, []
+        members.append(dare_id)
+    add_bucket(members)
+    if not candidates:
+        return
+
+    involved = {dare_id for pair in candidates for dare_id in pair}
+    signatures = {}
+    ids = list(involved)
+    for start in range(0, len(ids), chunk_size):
+        signatures.update(
+            (dare_id, unpack(signature))
+            for dare_id, signature in DareSignature.objects.filter(
+                dare_id__in=ids[start:start + chunk_size],
+            ).values_list('dare_id', 'signature')
+        )
+    for first, second in sorted(candidates):
+        score = similarity(signatures[first], signatures[second])
+        if score >= min_similarity:
+            yield score, first, second
+
@@ -0,0 +1,17 @@
+from django.conf import settings
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    Hashed, gzip- and brotli-compressed files once ``collectstatic`` has
+    written the manifest. Before that (development checkouts, the test
+    runner) ``{% static %}`` falls back to the plain file names when
+    ``STATIC_MANIFEST_OPTIONAL`` is on; otherwise a missing or unloaded
+    manifest raises, as ``manifest_strict`` intends.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files and getattr(settings, 'STATIC_MANIFEST_OPTIONAL', settings.DEBUG):
+            return name
+        return super().stored_name(name)
@@ -0,0 +1,24 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from ..icons import SPRITE_PATH, icon_name, symbol_id
+
+register = template.Library()
+
+
+@register.simple_tag
+def icon(name, weight='regular', **attrs):
+    """
+    Inline ``<svg>`` referencing the icon in the self-hosted sprite, e.g.
+    ``{% icon 'heart' 'bold' style='color: red' %}``. Extra keyword
+    arguments become attributes; ``class`` is appended to ``ph-icon``.
+    """
+    name = icon_name(name)
+    css_class = ' '.join(filter(None, ['ph-icon', attrs.pop('class', '')]))
+    extra = format_html_join('', ' {}="{}"', attrs.items())
+    return format_html(
+        '<svg class="{}" aria-hidden="true"{}><use href="{}#{}"></use></svg>',
+        css_class, extra, static(SPRITE_PATH), symbol_id(name, weight),
+    )
+
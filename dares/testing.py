@@ -0,0 +1,115 @@
+"""
+Helpers for the query-budget regression tests in ``dares.tests``, and the
+project's test runner.
+
+``iter_named_routes`` walks the routes defined in ``daredb.urls`` and
+``dares.urls``; ``QueryRecorder`` captures each query together with the
+project call site (or template) that issued it.
+"""
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib import admin
+from django.conf import settings
+from django.db import connections
+from django.test.runner import DiscoverRunner
+from django.urls import URLPattern, URLResolver
+
+BUDGET_FILE = Path(__file__).resolve().parent / 'query_budgets.json'
+
+PROJECT_DIR = str(Path(settings.BASE_DIR).resolve())
+IGNORED_FILES = {__file__, str(Path(__file__).resolve().parent / 'metrics.py')}
+
+
+def iter_named_routes():
+    """
+    Yield ``(name, pattern)`` for every named route in ``daredb.urls`` and
+    the included ``dares.urls``, plus the changelists of the ``dares`` models
+    registered in the admin (``pattern`` is ``None`` for those). Third-party
+    includes such as allauth and the rest of the admin are skipped.
+    """
+    from daredb import urls as project_urls
+    from dares import urls as dare_urls
+
+    for entry in project_urls.urlpatterns:
+        if isinstance(entry, URLPattern) and entry.name:
+            yield entry.name, entry
+        elif isinstance(entry, URLResolver) and entry.urlconf_module is dare_urls:
+            namespace = entry.namespace or dare_urls.app_name
+            for pattern in entry.url_patterns:
+                if isinstance(pattern, URLPattern) and pattern.name:
+                    yield f'{namespace}:{pattern.name}', pattern
+
+    for model in apps.get_app_config('dares').get_models():
+        if admin.site.is_registered(model):
+            yield f'admin:dares_{model._meta.model_name}_changelist', None
+
+
+def call_site():
+    """Innermost project source line (or template) responsible for the current query."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_DIR) and filename not in IGNORED_FILES and 'site-packages' not in filename:
+            relative = Path(filename).relative_to(PROJECT_DIR)
+            return f'{relative}:{frame.f_lineno} in {frame.f_code.co_name}'
+        template = frame.f_locals.get('self') if frame.f_code.co_name == 'render' else None
+        origin = getattr(template, 'origin', None)
+        if origin is not None and getattr(origin, 'template_name', None):
+            return f'template {origin.template_name}'
+        frame = frame.f_back
+    return '<unknown>'
+
+
+class QueryRecorder:
+    """Context manager recording ``(sql, call_site)`` for each query on ``using``."""
+
+    def __init__(self, using='default'):
+        self.connection = connections[using]
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, call_site()))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.queries = []
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def report(self):
+        sites = Counter(site for _, site in self.queries)
+        return '\n'.join(f'    {count:>3} x {site}' for site, count in sites.most_common())
+
+
+def load_budgets():
+    if BUDGET_FILE.exists():
+        return json.loads(BUDGET_FILE.read_text())
+    return {}
+
+
+def save_budgets(budgets):
+    BUDGET_FILE.write_text(json.dumps(dict(sorted(budgets.items())), indent=2) + '\n')
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Flushes batched writes only when a test asks: a timer thread would hit
+    the test database from outside the test's transaction. Static files
+    resolve without a collectstatic manifest.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.BATCH_FLUSH_IN_BACKGROUND = False
+        settings.STATIC_MANIFEST_OPTIONAL = True
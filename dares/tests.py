@@ -1,3 +1,1367 @@
-from django.test import TestCase
+import csv
+import gzip
+import hashlib
+import operator
+import os
+import tempfile
+import re
+import threading
+import unittest
+import uuid
+import warnings
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.management.base import SystemCheckError
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+from django.db.models.query import QuerySet
+from django.http import StreamingHttpResponse
+from django.template import Context, Template
+from django.test import AsyncClient, Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import activity, bulk, conditional, events, icons, likes, metrics, moderation, preload, recommendations, screening, series, similarity, trending, viewers, warmup
+from .batching import BatchBuffer
+from .db import counter_queue, uuid7
+from .forms import DareCompletionForm, DareForm
+from .middleware import StreamingGZipMiddleware
+from .storage import StaticFilesStorage
+from .views import APIStatsView, StatsView
+from .testing import QueryRecorder, iter_named_routes, load_budgets, save_budgets
+from .models import (
+    Category, Dare, DareCompletion, DareLike, DareRecommendation, DareSeries, DareSignature, DareSignatureBand, DifficultyLevel,
+    ModerationTask, ScreeningTerm, TrendingScore, ViewerSketch,
+)
+
+
+def seed_dares(count, start=0, completions_per_dare=1, likes_per_dare=2):
+    """Bulk-insert a synthetic dataset; roughly two thirds of the dares are approved."""
+    categories = list(Category.objects.all())
+    difficulties = list(DifficultyLevel.objects.all())
+    dares = Dare.objects.bulk_create([
+        Dare(
+            title=f'Seeded dare {i}', slug=f'seeded-dare-{i}', name=f'Seeder {i}',
+            email=f'seeder{i}@example.com', phone_number='+911234567890', college='Seed University',
+            dare_text=f'Do seeded thing number {i}.',
+            category=categories[i % len(categories)], difficulty=difficulties[i % len(difficulties)],
+            status='approved' if i % 3 else 'pending', is_approved=bool(i % 3), is_featured=i % 10 == 1,
+            views_count=i % 97, likes_count=likes_per_dare, completions_count=completions_per_dare,
+        )
+        for i in range(start, start + count)
+    ])
+    DareCompletion.objects.bulk_create([
+        DareCompletion(
+            dare=dare, completer_name='Completer', completer_email=f'completer{n}@example.com',
+            completion_proof='Done.', is_verified=bool(n % 2),
+        )
+        for dare in dares for n in range(completions_per_dare)
+    ])
+    DareLike.objects.bulk_create([
+        DareLike(dare=dare, user_email=f'liker{n}@example.com')
+        for dare in dares for n in range(likes_per_dare)
+    ])
+    return dares
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'plan checks parse SQLite EXPLAIN QUERY PLAN output')
+class QueryPlanTests(TestCase):
+    """
+    Renders every public list/sort path against a large dataset and runs
+    EXPLAIN on each query it issues (plus any unevaluated querysets left in
+    the context). A full table scan of a dare, completion or like table fails.
+    """
+
+    DATASET_SIZE = 3000
+    WATCHED_TABLES = {'dares_dare', 'dares_darecompletion', 'dares_darelike', 'dares_trendingscore'}
+    FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)$')
+
+    @classmethod
+    def setUpTestData(cls):
+        dares = seed_dares(cls.DATASET_SIZE)
+        TrendingScore.objects.bulk_create([
+            TrendingScore(dare=dare, score=float(n % 500)) for n, dare in enumerate(dares[::2])
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.dare = Dare.objects.filter(is_approved=True).first()
+        cls.category = Category.objects.get(name='extreme')
+        cls.difficulty = DifficultyLevel.objects.get(name='hard')
+
+    def setUp(self):
+        cache.clear()
+
+    def get_paths(self):
+        dare_list = reverse('dares:dare_list')
+        return [
+            dare_list,
+            *(f'{dare_list}?sort_by={sort}' for sort in ('oldest', 'most_viewed', 'most_liked', 'title', 'trending')),
+            f'{dare_list}?featured_only=on',
+            f'{dare_list}?category={self.category.pk}',
+            f'{dare_list}?difficulty={self.difficulty.pk}',
+            f'{dare_list}?category={self.category.pk}&sort_by=most_viewed',
+            reverse('dares:dare_detail', args=[self.dare.slug]),
+            reverse('dares:category_detail', args=[self.category.name]),
+            reverse('dares:community'),
+            reverse('dares:stats'),
+            reverse('dares:api_stats'),
+        ]
+
+    def explain(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def full_scans(self, plan):
+        scans = []
+        for step in plan:
+            match = self.FULL_SCAN.match(step)
+            if match and match.group(1) in self.WATCHED_TABLES:
+                scans.append(step)
+        return scans
+
+    def collect_plans(self, path):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, path)
+
+        plans = [
+            (query['sql'], self.explain(query['sql']))
+            for query in captured.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        for context in response.context or []:
+            for value in context.flatten().values():
+                if isinstance(value, QuerySet) and value._result_cache is None:
+                    sql, params = value.query.sql_with_params()
+                    plans.append((sql, self.explain(sql, params)))
+        return plans
+
+    def test_duplicate_checks_use_indexes(self):
+        similarity.index_dares(Dare.objects.order_by('slug')[:200])
+        screening.get_automaton()
+        with CaptureQueriesContext(connection) as captured:
+            DareForm(data={'title': 'Seeded copy', 'dare_text': 'Do seeded thing number 7.'}).is_valid()
+        failures = [
+            f'{query["sql"]}\n  {plan}'
+            for query in captured.captured_queries
+            for plan in [self.explain(query['sql'])]
+            if self.full_scans(plan) or any(step.startswith('SCAN dares_daresignatureband') for step in plan)
+        ]
+        # The screening version, then the band lookup and the signatures
+        self.assertEqual(len(captured.captured_queries), 3)
+        if failures:
+            self.fail('Full table scans:\n' + '\n'.join(failures))
+
+    def test_activity_lookups_use_indexes(self):
+        self.client.force_login(User.objects.create_user('seeder5', 'seeder5@example.com', 'pw'))
+        failures = [
+            f'{sql}\n  {plan}'
+            for sql, plan in self.collect_plans(reverse('dares:my_activity'))
+            if self.full_scans(plan)
+        ]
+        if failures:
+            self.fail('Full table scans:\n' + '\n'.join(failures))
+
+    def test_no_full_scans_on_list_and_sort_paths(self):
+        failures = []
+        for path in self.get_paths():
+            for sql, plan in self.collect_plans(path):
+                scans = self.full_scans(plan)
+                if scans:
+                    failures.append(f'{path}\n  {sql}\n  {plan}')
+        if failures:
+            self.fail('Full table scans:\n' + '\n'.join(failures))
+
+
+class RequestMetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(5)
+
+    def setUp(self):
+        metrics.registry.reset()
+
+    def test_server_timing_reports_queries(self):
+        response = self.client.get(reverse('dares:category_detail', args=['extreme']))
+        timing = response['Server-Timing']
+        self.assertIn('total;dur=', timing)
+        self.assertIn('tpl;dur=', timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.client.get(reverse('dares:dare_list'))
+        response = self.client.get(reverse('dares:metrics'))
+        self.assertEqual(response.status_code, 302)
+
+        staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse('dares:metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response, 'dares_request_duration_seconds_count{route="dares:dare_list",method="GET"} 1'
+        )
+
+
+class AsyncEndpointTests(TestCase):
+    """The AJAX endpoints run as coroutines under ASGI."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(3)
+        cls.dare = Dare.objects.filter(is_approved=True).earliest('slug')
+
+    def setUp(self):
+        self.async_client = AsyncClient()
+
+    async def post(self, url, data):
+        return await self.async_client.post(url, data, headers={'X-Requested-With': 'XMLHttpRequest'})
+
+    async def test_like_toggles(self):
+        url = reverse('dares:dare_like', args=[self.dare.slug])
+        response = await self.post(url, {'email': 'fan@example.com'})
+        self.assertEqual(response.json(), {'success': True, 'liked': True, 'likes_count': 3})
+        response = await self.post(url, {'email': 'fan@example.com'})
+        self.assertEqual(response.json(), {'success': True, 'liked': False, 'likes_count': 2})
+
+    async def test_completion_is_recorded_once(self):
+        url = reverse('dares:dare_complete', args=[self.dare.slug])
+        data = {
+            'completer_name': 'Async', 'completer_email': 'async@example.com',
+            'completion_proof': 'Did it.',
+        }
+        response = await self.post(url, data)
+        self.assertEqual(response.json()['completions_count'], 2)
+        response = await self.post(url, data)
+        self.assertFalse(response.json()['success'])
+
+    async def test_stats_and_suggestions(self):
+        await cache.aclear()
+        response = await self.async_client.get(reverse('dares:api_stats'))
+        self.assertEqual(response.json()['totals']['dares'], 2)
+        self.assertIn('max-age=900', response['Cache-Control'])
+
+        response = await self.async_client.get(reverse('dares:search_suggestions'), {'q': 'seeded'})
+        self.assertEqual(len(response.json()['suggestions']), 3)
+
+
+@override_settings(DARES_EVENT_COALESCE_SECONDS=0, DARES_EVENT_HEARTBEAT_SECONDS=0)
+class EventStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(3)
+        cls.dare = Dare.objects.filter(is_approved=True).earliest('slug')
+
+    def setUp(self):
+        events.get_broker.cache_clear()
+        self.addCleanup(events.get_broker.cache_clear)
+
+    def test_broker_sends_one_batch_per_window(self):
+        broker = events.InProcessBroker(window=60)
+        subscriber = mock.Mock()
+        broker.subscribers.add(subscriber)
+        for count in range(100):
+            broker.publish({'type': 'like', 'dare': 'popular', 'likes_count': count})
+        broker.publish({'type': 'like', 'dare': 'quiet', 'likes_count': 1})
+        broker.flush()
+        subscriber.deliver.assert_called_once_with([
+            {'type': 'like', 'dare': 'popular', 'likes_count': 99},
+            {'type': 'like', 'dare': 'quiet', 'likes_count': 1},
+        ])
+
+    async def test_like_is_pushed_to_subscribers_of_that_dare(self):
+        broker = events.get_broker()
+        watching = broker.subscribe(dares=[self.dare.slug])
+        elsewhere = broker.subscribe(dares=['another-dare'])
+        for email in ('a@example.com', 'b@example.com', 'c@example.com'):
+            await AsyncClient().post(
+                reverse('dares:dare_like', args=[self.dare.slug]), {'email': email},
+                headers={'X-Requested-With': 'XMLHttpRequest'},
+            )
+        # Three likes, one coalesced update
+        self.assertEqual(await watching.get(timeout=1), [{'type': 'like', 'dare': self.dare.slug, 'likes_count': 5}])
+        self.assertEqual(await elsewhere.get(timeout=0), [])
+        watching.close()
+        elsewhere.close()
+
+    def test_approval_is_published_after_commit(self):
+        dare = Dare.objects.filter(is_approved=False).first()
+        broker = mock.Mock()
+        with mock.patch('dares.events.get_broker', return_value=broker):
+            with self.captureOnCommitCallbacks(execute=True):
+                dare.status = 'approved'
+                dare.save()
+            dare.save()
+        broker.publish.assert_called_once()
+        self.assertEqual(broker.publish.call_args.args[0]['type'], 'dare_approved')
+
+    def test_wsgi_refuses_the_stream_without_waiting(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings('error', 'StreamingHttpResponse must consume')
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse('dares:events'))
+        self.assertEqual((response.status_code, response.content), (204, b''))
+        self.assertEqual(events.get_broker().subscribers, set())
+
+
+class GenerateDaresTests(TestCase):
+    def test_step_is_coprime_and_reruns_get_fresh_slugs(self):
+        from .management.commands.generate_dares import coprime_step
+        self.assertEqual(coprime_step(7919 * 89), 7923)
+
+        options = {'dares': 20, 'likes': 60, 'completions': 10, 'users': 30, 'stdout': StringIO()}
+        call_command('generate_dares', **options)
+        Dare.objects.filter(pk__in=Dare.objects.order_by('slug').values('pk')[:5]).delete()
+        call_command('generate_dares', seed=1, **options)
+        self.assertEqual(Dare.objects.count(), 35)
+
+
+@override_settings(SQLITE_TUNING=True)
+class CounterQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.dare = seed_dares(1)[0]
+
+    def views(self):
+        return Dare.objects.get(pk=self.dare.pk).views_count
+
+    def test_deltas_wait_for_the_callers_commit(self):
+        views = self.views()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dare.increment_views()
+            self.assertEqual(self.views(), views)
+        self.assertEqual(self.views(), views + 1)
+
+        try:
+            with transaction.atomic(), self.captureOnCommitCallbacks(execute=True):
+                self.dare.increment_views()
+                raise OperationalError('rolled back')
+        except OperationalError:
+            pass
+        self.assertEqual(self.views(), views + 1)
+
+    def test_failed_batch_is_retried(self):
+        views = self.views()
+        with mock.patch.object(counter_queue, '_apply', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('dares.db', 'WARNING'), self.captureOnCommitCallbacks(execute=True):
+                self.dare.increment_views()
+        self.assertEqual(self.views(), views)
+        counter_queue.drain()
+        self.assertEqual(self.views(), views + 1)
+
+
+class UUID7Tests(TestCase):
+    def test_ids_are_strictly_increasing(self):
+        ids = [uuid7() for _ in range(10000)]
+        self.assertEqual(ids, sorted(set(ids)))
+
+    def test_version_variant_and_timestamp(self):
+        value = uuid7(timestamp_ms=1_700_000_000_000)
+        self.assertEqual((value.version, value.variant), (7, uuid.RFC_4122))
+        self.assertEqual(value.int >> 80, 1_700_000_000_000)
+
+    def test_new_dares_get_uuid7_keys_when_sequential(self):
+        with override_settings(DARE_SEQUENTIAL_IDS=True):
+            self.assertEqual(seed_dares(1)[0].pk.version, 7)
+        self.assertEqual(seed_dares(1, start=1)[0].pk.version, 4)
+
+
+@override_settings(BATCH_FLUSH_IN_BACKGROUND=True)
+class BatchBufferTests(SimpleTestCase):
+    def test_idle_buffer_flushes_on_time_and_failed_batches_are_retried(self):
+        flushed, attempts, done = [], [], threading.Event()
+
+        def flush(batch):
+            attempts.append(batch)
+            if len(attempts) == 1:
+                raise OperationalError('database is locked')
+            flushed.append(batch)
+            done.set()
+
+        buffer = BatchBuffer(flush, operator.add, max_items=100, max_age=0.05)
+        buffer.add('a', 1)
+        buffer.add('a', 2)
+        with self.assertLogs('dares.batching', 'WARNING'):
+            self.assertTrue(done.wait(5))
+        self.assertEqual(flushed, [{'a': 3}])
+        self.assertEqual(len(buffer), 0)
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.old, cls.new, cls.quiet = Dare.objects.filter(pk__in=[
+            dare.pk for dare in seed_dares(6) if dare.is_approved
+        ]).order_by('slug')[:3]
+
+    def setUp(self):
+        trending.buffer.drain()
+
+    def test_recent_engagement_outranks_older_heavier_engagement(self):
+        now = timezone.now()
+        with mock.patch('django.utils.timezone.now', return_value=now - timedelta(days=3)):
+            for _ in range(6):
+                self.old.increment_likes()
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            self.new.increment_likes()
+        trending.buffer.flush()
+
+        response = self.client.get(reverse('dares:dare_list'), {'sort_by': 'trending'})
+        # With a 24h half-life six likes three days ago weigh 6/8 of one like today
+        self.assertEqual([dare.pk for dare in response.context['dares']], [self.new.pk, self.old.pk])
+
+    def test_engagement_is_merged_in_batches(self):
+        self.old.increment_views()
+        self.old.increment_likes()
+        self.assertFalse(TrendingScore.objects.exists())
+        trending.buffer.flush()
+        first = TrendingScore.objects.get(dare=self.old).score
+        self.assertAlmostEqual(first, trending.event_score(6.0), places=3)
+
+        self.old.increment_completions()
+        trending.buffer.flush()
+        self.assertAlmostEqual(TrendingScore.objects.get(dare=self.old).score, trending.event_score(16.0), places=3)
+
+    def test_flush_adds_to_scores_created_concurrently(self):
+        real_locked_rows = trending.locked_rows
+        calls = []
+
+        def racing_locked_rows(dare_ids):
+            # Another worker creates the row between this flush's read and insert
+            if not calls:
+                calls.append(dare_ids)
+                TrendingScore.objects.create(dare=self.old, score=trending.event_score(4.0))
+                return {}
+            return real_locked_rows(dare_ids)
+
+        with mock.patch('dares.trending.locked_rows', racing_locked_rows):
+            trending.apply_scores({self.old.pk: trending.event_score(6.0)})
+        self.assertAlmostEqual(TrendingScore.objects.get(dare=self.old).score, trending.event_score(10.0), places=3)
+
+    def test_refresh_command_rebuilds_from_history_and_prunes(self):
+        TrendingScore.objects.create(dare=self.quiet, score=0.0)
+        call_command('refresh_trending', '--rebuild', stdout=StringIO())
+        # Every approved seeded dare has likes and completions
+        self.assertEqual(
+            set(TrendingScore.objects.values_list('dare_id', flat=True)),
+            set(Dare.objects.filter(is_approved=True).values_list('pk', flat=True)),
+        )
+        TrendingScore.objects.filter(dare=self.quiet).update(score=0.0)
+        call_command('refresh_trending', stdout=StringIO())
+        self.assertFalse(TrendingScore.objects.filter(dare=self.quiet).exists())
+
+
+class ViewerSketchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(3)
+        cls.dare = Dare.objects.filter(is_approved=True).earliest('slug')
+
+    def setUp(self):
+        cache.clear()
+        viewers.buffer.drain()
+
+    def sketch(self, items):
+        sketch = viewers.HyperLogLog()
+        for item in items:
+            sketch.add(int.from_bytes(hashlib.blake2b(str(item).encode(), digest_size=8).digest(), 'big'))
+        return sketch
+
+    def test_estimates_are_close_and_sketches_merge(self):
+        first, second = self.sketch(range(0, 30000)), self.sketch(range(20000, 50000))
+        self.assertAlmostEqual(first.count() / 30000, 1, delta=0.07)
+        merged = viewers.HyperLogLog.from_bytes(first.to_bytes()).merge(second)
+        self.assertEqual(merged.registers, self.sketch(range(50000)).registers)
+        self.assertAlmostEqual(merged.count() / 50000, 1, delta=0.07)
+        self.assertEqual(self.sketch(range(40)).count(), 40)
+
+    def test_repeat_visits_and_bots_are_not_counted(self):
+        url = self.dare.get_absolute_url()
+        for address, agent in [
+            ('10.0.0.1', 'Mozilla/5.0'), ('10.0.0.1', 'Mozilla/5.0'), ('10.0.0.2', 'Mozilla/5.0'),
+            ('10.0.0.3', 'Mozilla/5.0'), ('10.0.0.4', 'Googlebot/2.1'),
+        ]:
+            self.client.get(url, REMOTE_ADDR=address, HTTP_USER_AGENT=agent)
+        viewers.buffer.flush()
+
+        self.assertEqual(viewers.unique_viewers(self.dare.pk), {'total': 3, 'today': 3})
+        self.assertEqual(ViewerSketch.objects.count(), 4)
+        self.assertEqual(self.client.get(url).context['unique_viewers']['total'], 3)
+        response = self.client.get(reverse('dares:stats'))
+        self.assertEqual((response.context['unique_viewers']['week'], response.context['most_unique_viewers'][0]['slug']), (3, self.dare.slug))
+
+    def test_flush_merges_into_sketches_created_concurrently(self):
+        today = timezone.localdate()
+        theirs = self.sketch(['them'])
+        ours = int.from_bytes(hashlib.blake2b(b'us', digest_size=8).digest(), 'big')
+        real_locked_rows = viewers.locked_rows
+        calls = []
+
+        def racing_locked_rows(keys):
+            # Another worker creates the rows between this flush's read and insert
+            if not calls:
+                calls.append(keys)
+                ViewerSketch.objects.bulk_create([
+                    ViewerSketch(key=key, dare_id=dare_id, day=day, registers=theirs.to_bytes(), estimate=1)
+                    for key, (dare_id, day, _) in keys.items()
+                ])
+                return {}
+            return real_locked_rows(keys)
+
+        with mock.patch('dares.viewers.locked_rows', racing_locked_rows):
+            viewers.apply_sketches({(self.dare.pk, today): {ours}})
+        self.assertEqual(viewers.unique_viewers(self.dare.pk), {'total': 2, 'today': 2})
+
+
+    def test_rekey_moves_sketches_and_keeps_like_state(self):
+        self.client.get(self.dare.get_absolute_url(), REMOTE_ADDR='10.0.0.1', HTTP_USER_AGENT='Mozilla/5.0')
+        viewers.buffer.flush()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('dares:dare_like', kwargs={'slug': self.dare.slug}), {'email': 'rekey@example.com'},
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            )
+        call_command('rekey_dares', stdout=StringIO())
+
+        dare = Dare.objects.get(slug=self.dare.slug)
+        self.assertEqual(dare.pk.version, 7)
+        self.assertEqual(viewers.unique_viewers(dare.pk), {'total': 1, 'today': 1})
+        self.assertTrue(self.client.get(dare.get_absolute_url()).context['user_has_liked'])
+
+
+class SeriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.first, cls.second = Dare.objects.filter(pk__in=[
+            dare.pk for dare in seed_dares(6) if dare.is_approved
+        ]).order_by('slug')[:2]
+
+    def setUp(self):
+        cache.clear()
+        series.buffer.drain()
+
+    def engage(self, day, dare, kind, times=1):
+        with mock.patch('django.utils.timezone.localdate', return_value=day):
+            for _ in range(times):
+                series.record_engagement(Dare, dare=dare, kind=kind)
+
+    def test_daily_counts_span_years_and_sum_across_dares(self):
+        self.engage(date(2025, 12, 31), self.first, 'view', 3)
+        self.engage(date(2026, 1, 1), self.first, 'like')
+        self.engage(date(2026, 1, 1), self.second, 'view', 2)
+        series.buffer.flush()
+        self.engage(date(2026, 1, 1), self.second, 'view')
+        series.buffer.flush()
+
+        result = series.query([self.first.pk, self.second.pk], ['view', 'like'], date(2025, 12, 30), date(2026, 1, 2))
+        self.assertEqual(result['series'][self.first.pk], {'view': [0, 3, 0, 0], 'like': [0, 0, 1, 0]})
+        self.assertEqual(result['total']['view'], [0, 3, 3, 0])
+        site = series.query([None], ['view'], date(2025, 12, 30), date(2026, 1, 2))
+        self.assertEqual(site['total']['view'], [0, 3, 3, 0])
+        # One row per dare per year, plus the site's
+        self.assertEqual(DareSeries.objects.count(), 5)
+
+    def test_api_returns_requested_dares(self):
+        self.engage(timezone.localdate(), self.first, 'completion', 2)
+        series.buffer.flush()
+        url = reverse('dares:api_stats_series')
+        data = self.client.get(url, {'dare': self.first.slug, 'metric': 'completions'}).json()
+        self.assertEqual(len(data['days']), 30)
+        self.assertEqual(data['dares'][self.first.slug]['completions'][-1], 2)
+        self.assertEqual(self.client.get(url).json()['total']['completions'][-1], 2)
+        self.assertEqual(self.client.get(url, {'metric': 'shares'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2026-02-01', 'end': '2026-01-01'}).status_code, 400)
+
+    def test_history_rebuild_counts_likes_and_completions(self):
+        call_command('rebuild_series', stdout=StringIO())
+        today = timezone.localdate()
+        site = series.query([None], ['like', 'completion'], today, today)['total']
+        self.assertEqual(site, {'like': [DareLike.objects.count()], 'completion': [DareCompletion.objects.count()]})
+        call_command('rebuild_series', stdout=StringIO())
+        self.assertEqual(series.query([None], ['like'], today, today)['total']['like'], [DareLike.objects.count()])
+
+        # Dares left without likes drop back to zero too
+        DareLike.objects.filter(dare=self.first).delete()
+        call_command('rebuild_series', stdout=StringIO())
+        self.assertEqual(series.query([self.first.pk], ['like'], today, today)['total']['like'], [0])
+
+    def test_flush_adds_to_rows_created_concurrently(self):
+        year = timezone.localdate().year
+        # Rows another worker created between this flush's read and insert
+        real_locked_rows = series.locked_rows
+        calls = []
+
+        def racing_locked_rows(keys):
+            if not calls:
+                counts = series.empty()
+                counts[0] = 5
+                DareSeries.objects.create(dare=self.first, year=year, counts=series.pack(counts))
+                DareSeries.objects.create(dare=None, year=year, counts=series.pack(counts))
+                calls.append(keys)
+                return {}
+            return real_locked_rows(keys)
+
+        with mock.patch('dares.series.locked_rows', racing_locked_rows):
+            series.merge({(self.first.pk, year): {0: 2}})
+        for dare_id in (self.first.pk, None):
+            self.assertEqual(series.unpack(DareSeries.objects.get(dare_id=dare_id, year=year).counts)[0], 7)
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a, cls.b, cls.c, cls.d = Dare.objects.filter(pk__in=[
+            dare.pk for dare in seed_dares(6, completions_per_dare=0, likes_per_dare=0) if dare.is_approved
+        ]).order_by('slug')
+        cls.engage(cls.a, 'u1', 'u2', 'u3')
+        cls.engage(cls.b, 'u1', 'u2')
+        cls.engage(cls.c, 'u1', 'u4')
+        DareCompletion.objects.create(
+            dare=cls.d, completer_name='U3', completer_email='u3@example.com', completion_proof='Done.',
+        )
+
+    @classmethod
+    def engage(cls, dare, *names):
+        DareLike.objects.bulk_create([DareLike(dare=dare, user_email=f'{name}@example.com') for name in names])
+
+    def test_full_build_ranks_co_engaged_dares(self):
+        self.assertEqual(recommendations.build(), 4)
+        self.assertEqual(list(recommendations.recommended_for(self.a)), [self.b])
+        # a and c share one visitor, below RECOMMENDATION_MIN_COMMON
+        self.assertFalse(DareRecommendation.objects.filter(dare=self.c).exists())
+        with self.assertNumQueries(1):
+            self.assertEqual(list(recommendations.recommended_for(self.b)), [self.a])
+        response = self.client.get(self.a.get_absolute_url())
+        self.assertEqual(list(response.context['related_dares']), [self.b])
+
+    def test_refresh_recomputes_newly_and_co_engaged_dares(self):
+        recommendations.build()
+        self.engage(self.c, 'u2', 'u3')
+        call_command('build_recommendations', stdout=StringIO())
+        self.assertEqual(list(recommendations.recommended_for(self.c)), [self.a, self.b])
+        # a gained c through visitors it shares, without new engagement of its own
+        self.assertEqual(list(recommendations.recommended_for(self.a)), [self.c, self.b])
+        self.assertEqual(recommendations.refresh(), 0)
+
+    def test_refresh_turns_into_a_full_build_for_unlikes(self):
+        recommendations.build()
+        DareLike.objects.filter(dare=self.b).delete()
+        self.assertEqual(recommendations.refresh(), 0)
+        self.assertEqual(list(recommendations.recommended_for(self.a)), [self.b])
+        with override_settings(RECOMMENDATION_FULL_BUILD_SECONDS=0):
+            recommendations.refresh()
+        self.assertEqual(list(recommendations.recommended_for(self.a)), [])
+
+
+class HomeFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(12, completions_per_dare=2)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_warm_homepage_runs_no_queries(self):
+        self.client.get(reverse('dares:home'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('dares:home'))
+        featured = Dare.objects.filter(is_approved=True, is_featured=True).count()
+        self.assertEqual(len(response.context['feed']['featured']), featured)
+        self.assertContains(response, 'Recently Completed')
+
+    def test_conditional_get(self):
+        response = self.client.get(reverse('dares:home'))
+        self.assertEqual(
+            self.client.get(reverse('dares:home'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+        self.assertEqual(
+            self.client.get(reverse('dares:home'), HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code,
+            304,
+        )
+
+    def test_feature_change_rebuilds_feed(self):
+        first = self.client.get(reverse('dares:home'))
+        dare = Dare.objects.filter(is_approved=True, is_featured=False).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            dare.status = 'featured'
+            dare.save()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('dares:home'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(dare.title, [card['title'] for card in response.context['feed']['featured']])
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(6)
+        cls.dare = Dare.objects.filter(is_approved=True).first()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_are_shared_cacheable(self):
+        response = self.client.get(reverse('dares:dare_list'))
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('s-maxage=60', response['Cache-Control'])
+        self.assertIn('stale-while-revalidate=300', response['Cache-Control'])
+        self.assertIn('s-maxage=86400', self.client.get(reverse('dares:faq'))['Cache-Control'])
+
+    def test_revalidation_skips_rendering_until_content_changes(self):
+        url = reverse('dares:dare_list')
+        etag = self.client.get(url)['ETag']
+        # Only the content versions are read
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dare.title = 'Renamed dare'
+            self.dare.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_detail_revalidation_counts_the_view(self):
+        url = self.dare.get_absolute_url()
+        views = Dare.objects.get(pk=self.dare.pk).views_count
+        etag = self.client.get(url)['ETag']
+        # The dare, the content versions and the view count
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(Dare.objects.get(pk=self.dare.pk).views_count, views + 2)
+        Dare.objects.filter(pk=self.dare.pk).update(likes_count=F('likes_count') + 1)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_personal_responses_are_private(self):
+        user = User.objects.create_user('reader', password='pw')
+        self.client.force_login(user)
+        response = self.client.get(reverse('dares:community'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('s-maxage', response['Cache-Control'])
+
+    def test_stats_snapshot_is_cached(self):
+        self.client.get(reverse('dares:stats'))
+        # The content versions pick the snapshot
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('dares:stats'))
+        self.assertEqual(response.context['total_dares'], Dare.objects.filter(is_approved=True).count())
+
+
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(6)
+
+    def test_pages_link_static_bundles_and_are_gzipped(self):
+        response = self.client.get(reverse('dares:dare_list'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        html = gzip.decompress(response.content).decode()
+        self.assertIn('css/dareora.css', html)
+        self.assertNotIn('<style>', html.split('</head>')[0])
+
+    def test_missing_manifest_fails_unless_optional(self):
+        storage = StaticFilesStorage()
+        self.assertEqual(storage.url('css/dareora.css'), '/static/css/dareora.css')
+        with override_settings(STATIC_MANIFEST_OPTIONAL=False), self.assertRaises(ValueError):
+            storage.url('css/dareora.css')
+
+    def test_event_streams_are_not_compressed(self):
+        request = RequestFactory().get('/events/', HTTP_ACCEPT_ENCODING='gzip')
+        stream = StreamingHttpResponse(iter(['data: x\n\n'] * 100), content_type='text/event-stream')
+        response = StreamingGZipMiddleware(lambda request: stream)(request)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class IconSpriteTests(SimpleTestCase):
+    def make_source(self, root, icons_used):
+        for name, weight in icons_used:
+            path = Path(root) / weight / f'{icons.symbol_id(name, weight)}.svg'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 256 256" fill="currentColor">\n'
+                f'  <path d="M0 0h{len(name)}"/>\n</svg>\n'
+            )
+
+    def test_sprite_covers_templates_and_category_icons(self):
+        template_dirs = [Path(settings.BASE_DIR) / 'templates']
+        used = icons.find_icons(template_dirs, icons.default_dynamic_names())
+        self.assertIn(('heart', 'regular'), used)
+        self.assertIn(('flame', 'thin'), used)
+        # category_detail renders category.icon in bold
+        self.assertIn(('mountains', 'bold'), used)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.make_source(Path(tmp) / 'assets', used)
+            output = Path(tmp) / 'sprite.svg'
+            call_command('build_icon_sprite', source=str(Path(tmp) / 'assets'), output=str(output), stdout=StringIO())
+            sprite = output.read_text()
+            self.assertIn('<symbol id="heart" viewBox="0 0 256 256"><path d="M0 0h5"/></symbol>', sprite)
+            self.assertIn('<symbol id="mountains-bold"', sprite)
+            call_command('build_icon_sprite', source=str(Path(tmp) / 'assets'), output=str(output), check=True,
+                         stdout=StringIO())
+
+            (Path(tmp) / 'assets' / 'regular' / 'heart.svg').unlink()
+            with self.assertRaisesMessage(CommandError, 'heart'):
+                call_command('build_icon_sprite', source=str(Path(tmp) / 'assets'), output=str(output))
+
+    def test_icon_tag(self):
+        template = Template("{% load icons %}{% icon 'ph-heart' 'bold' class='big' %}")
+        self.assertEqual(
+            template.render(Context()),
+            '<svg class="ph-icon big" aria-hidden="true"><use href="/static/icons/sprite.svg#heart-bold"></use></svg>',
+        )
+
+    def test_missing_sprite_fails_the_static_checks(self):
+        with mock.patch('django.contrib.staticfiles.finders.find', return_value=None):
+            self.assertEqual(icons.check_sprite(), [])
+            with override_settings(STATIC_MANIFEST_OPTIONAL=False):
+                self.assertEqual([error.id for error in icons.check_sprite()], ['dares.E001'])
+                with self.assertRaisesMessage(SystemCheckError, 'dares.E001'):
+                    call_command('collectstatic', interactive=False, dry_run=True, verbosity=0, skip_checks=False)
+
+
+class PreloadTests(SimpleTestCase):
+    def test_warm_loads_urls_and_templates(self):
+        stats = preload.warm()
+        self.assertGreater(stats['urls'], 0)
+        # Project templates plus those shipped by contrib and third-party apps
+        self.assertGreater(stats['templates'], len(list((Path(settings.BASE_DIR) / 'templates').glob('*.html'))))
+
+
+class WarmupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(30)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_hot_paths_cover_lists_categories_and_top_dares(self):
+        paths = warmup.hot_paths(top=3, pages=2)
+        kinds = [kind for kind, _ in paths]
+        top = Dare.objects.filter(is_approved=True).order_by('-views_count')[:3]
+        self.assertEqual(
+            [path for kind, path in paths if kind == 'dare_detail'], [dare.get_absolute_url() for dare in top],
+        )
+        self.assertIn((
+            'dare_list', f"{reverse('dares:dare_list')}?sort_by=most_viewed&page=2",
+        ), paths)
+        self.assertEqual(kinds.count('category_detail'), 2 * Category.objects.filter(is_active=True).count())
+        self.assertTrue({'home', 'stats', 'api_stats', 'api_stats_series'} <= set(kinds))
+
+    def test_warm_fills_the_cache_without_counting_views(self):
+        dare = Dare.objects.filter(is_approved=True).order_by('-views_count').first()
+        result = warmup.warm(warmup.hot_paths(top=1), concurrency=1)
+        self.assertEqual({entry['status'] for entry in result['results']}, {200})
+        self.assertEqual(Dare.objects.get(pk=dare.pk).views_count, dare.views_count)
+        self.assertIsNotNone(cache.get(StatsView.SNAPSHOT_KEY.format(conditional.content_versions(
+            'dares', 'completions', 'engagement',
+        )[0])))
+        self.assertIsNotNone(cache.get(APIStatsView.CACHE_KEY))
+
+        out = StringIO()
+        call_command('warm_cache', top=2, concurrency=1, stdout=out, stderr=StringIO())
+        self.assertIn('dare_detail 2', out.getvalue())
+
+    @override_settings(WARMUP_TOKEN='s3cret')
+    def test_only_local_or_token_requests_skip_the_view_count(self):
+        dare = Dare.objects.filter(is_approved=True).first()
+        self.client.get(dare.get_absolute_url(), HTTP_USER_AGENT=warmup.USER_AGENT)
+        self.client.get(dare.get_absolute_url(), HTTP_X_WARMUP_TOKEN='guess')
+        self.assertEqual(Dare.objects.get(pk=dare.pk).views_count, dare.views_count + 2)
+        self.client.get(dare.get_absolute_url(), HTTP_X_WARMUP_TOKEN='s3cret')
+        self.assertEqual(Dare.objects.get(pk=dare.pk).views_count, dare.views_count + 2)
+
+
+class BulkTransferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(6)
+        cls.staff = User.objects.create_superuser('bulk-admin', 'bulk@example.com', 'pw')
+
+    def export(self, kind, fmt):
+        output = StringIO()
+        call_command('export_dares', kind=kind, format=fmt, stdout=output)
+        return output.getvalue()
+
+    def test_round_trip_through_csv_and_jsonl(self):
+        exports = {
+            'dares': self.export('dares', 'csv'),
+            'completions': self.export('completions', 'jsonl'),
+            'likes': self.export('likes', 'csv'),
+        }
+        before = {
+            'dares': set(Dare.objects.values_list('slug', 'status', 'likes_count', 'created_at')),
+            'completions': set(DareCompletion.objects.values_list('dare__slug', 'completer_email', 'is_verified')),
+            'likes': DareLike.objects.count(),
+        }
+        Dare.objects.all().delete()
+        screening.get_automaton()  # built once per process, outside the counted queries
+
+        for kind, fmt in (('dares', 'csv'), ('completions', 'jsonl'), ('likes', 'csv')):
+            # Dares also queue their pending rows for moderation; screened
+            # kinds check the screening version once per batch, and every
+            # kind writes its own timestamps back after the insert
+            with self.assertNumQueries({'dares': 10, 'completions': 7, 'likes': 6}[kind]):
+                result = bulk.import_records(kind, bulk.read_records(StringIO(exports[kind]), fmt))
+            self.assertEqual(result.errors, [])
+
+        self.assertEqual(set(Dare.objects.values_list('slug', 'status', 'likes_count', 'created_at')), before['dares'])
+        self.assertEqual(
+            set(DareCompletion.objects.values_list('dare__slug', 'completer_email', 'is_verified')),
+            before['completions'],
+        )
+        self.assertEqual(DareLike.objects.count(), before['likes'])
+
+        again = bulk.import_records('dares', bulk.read_records(StringIO(exports['dares']), 'csv'))
+        self.assertEqual((again.created, again.skipped), (0, 6))
+
+    def test_csv_cells_cannot_start_formulas(self):
+        values = ['=HYPERLINK("http://x")', '+1', '-1', '@SUM(A1)', "'quoted", 'plain']
+        lines = list(bulk.csv_lines(['value'], [(value,) for value in values]))
+        cells = [row['value'] for row in csv.DictReader(StringIO(''.join(lines)))]
+        self.assertEqual(cells[:5], ["'" + value for value in values[:5]])
+        self.assertEqual(cells[5], 'plain')
+        self.assertEqual([record['value'] for _, record in bulk.read_records(StringIO(''.join(lines)))], values)
+
+    def test_import_assigns_slugs_and_reports_invalid_rows(self):
+        row = {'name': 'Importer', 'email': 'importer@example.com', 'phone_number': '+911234567890',
+               'college': 'Import U', 'dare_text': 'Do it.', 'category': 'extreme', 'difficulty': 'easy',
+               'status': 'approved'}
+        records = [
+            (2, {**row, 'title': 'Seeded dare 1'}),
+            (3, {**row, 'title': 'Seeded dare 1'}),
+            (4, {**row, 'title': 'Broken', 'email': 'not-an-email'}),
+            (5, {**row, 'title': 'Lost', 'category': 'nowhere'}),
+        ]
+        result = bulk.import_records('dares', records)
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, _ in result.errors], [4, 5])
+        self.assertEqual(
+            set(Dare.objects.filter(name='Importer').values_list('slug', 'is_approved')),
+            {('seeded-dare-1-1', True), ('seeded-dare-1-2', True)},
+        )
+
+    def test_staff_endpoints(self):
+        url = reverse('dares:bulk_export', kwargs={'kind': 'likes'})
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.staff)
+        response = self.client.get(url, {'format': 'jsonl'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), DareLike.objects.count())
+
+        upload = SimpleUploadedFile('likes.csv', b'dare,user_email\nseeded-dare-1,new@example.com\n')
+        response = self.client.post(reverse('dares:bulk_import', kwargs={'kind': 'likes'}), {'file': upload})
+        self.assertEqual(response.json()['created'], 1)
+
+
+class AdminExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(9)
+        cls.staff = User.objects.create_superuser('export-admin', 'export@example.com', 'pw')
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def test_export_honors_changelist_filters(self):
+        changelist = self.client.get(reverse('admin:dares_dare_changelist'), {'status': 'pending'})
+        self.assertContains(changelist, '/admin/dares/dare/export/?status=pending')
+
+        response = self.client.get(reverse('admin:dares_dare_export'), {'status': 'pending'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        rows = list(csv.DictReader(StringIO(gzip.decompress(b''.join(response.streaming_content)).decode())))
+        self.assertEqual(
+            sorted(row['slug'] for row in rows),
+            sorted(Dare.objects.filter(status='pending').values_list('slug', flat=True)),
+        )
+
+    def test_gzip_middleware_leaves_export_alone(self):
+        response = self.client.get(reverse('admin:dares_darelike_export'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        lines = gzip.decompress(b''.join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(len(lines), DareLike.objects.count() + 1)
+
+
+class DuplicateDetectionTests(TestCase):
+    TEXT = "Stand on a table and sing your favourite song loudly for the whole cafeteria to hear."
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(4)
+        cls.original = Dare.objects.create(
+            title='Sing a song in the college cafeteria', name='Original', email='original@example.com',
+            phone_number='+911234567890', college='Seed University', dare_text=cls.TEXT,
+            category=Category.objects.get(name='extreme'), difficulty=DifficultyLevel.objects.get(name='easy'),
+        )
+
+    def form(self, title, dare_text):
+        return DareForm(data={
+            'title': title, 'name': 'Copycat', 'email': 'copy@example.com', 'phone_number': '+911234567890',
+            'college': 'Seed University', 'category': self.original.category_id,
+            'difficulty': self.original.difficulty_id, 'dare_text': dare_text,
+        })
+
+    def test_signature_follows_saves(self):
+        self.assertEqual(DareSignatureBand.objects.filter(dare=self.original).count(), similarity.BANDS)
+        before = bytes(DareSignature.objects.get(dare=self.original).signature)
+        self.original.dare_text = 'Something else entirely, done on the roof at midnight.'
+        self.original.save()
+        self.assertNotEqual(bytes(DareSignature.objects.get(dare=self.original).signature), before)
+
+    def test_form_rejects_exact_titles_and_reworded_copies(self):
+        form = self.form('SING A SONG IN THE COLLEGE CAFETERIA', 'Completely different text about juggling.')
+        self.assertIn('title', form.errors)
+
+        reworded = "Stand on a table and sing your favorite song very loudly so the whole cafeteria hears."
+        form = self.form('Sing a song in the cafeteria!', reworded)
+        self.assertIn('copy of a dare awaiting review', form.errors['dare_text'][0])
+        self.assertNotIn(self.original.title, form.errors['dare_text'][0])
+
+        Dare.objects.filter(pk=self.original.pk).update(status='approved', is_approved=True)
+        form = self.form('Sing a song in the cafeteria!', reworded)
+        self.assertIn(f'copy of the existing dare "{self.original.title}"', form.errors['dare_text'][0])
+
+        Dare.objects.filter(pk=self.original.pk).update(status='rejected', is_approved=False)
+        self.assertTrue(self.form('Sing a song in the cafeteria!', reworded).is_valid())
+
+        self.assertTrue(self.form('Juggle in the library', 'Juggle three oranges in the silent section.').is_valid())
+
+    def test_command_indexes_backlog_and_reports_pairs(self):
+        # Seeded rows are bulk-inserted, so they start unindexed
+        copy = Dare.objects.bulk_create([Dare(
+            title='Sing a song in the college cafeteria!', slug='copy', name='Copy', email='copy@example.com',
+            phone_number='+911234567890', college='Seed University', dare_text=self.TEXT,
+            category=self.original.category, difficulty=self.original.difficulty,
+        )])[0]
+        output = StringIO()
+        call_command('find_duplicates', '--status', 'pending', stdout=output, stderr=StringIO())
+        self.assertEqual(DareSignature.objects.count(), Dare.objects.count())
+        self.assertIn(f'{copy.slug} (pending)', output.getvalue())
+        self.assertIn(self.original.slug, output.getvalue())
+
+
+class ScreeningTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_automaton_normalizes_leetspeak_and_respects_word_boundaries(self):
+        automaton = screening.Automaton([('hate', True), ('kill yourself', True), ('ass', False)])
+        self.assertEqual(automaton.search('Whatever you do'), [])
+        self.assertEqual(automaton.search('I H4TE... this; k1ll   y0urself'), ['hate', 'kill yourself'])
+        self.assertEqual(automaton.search('a classy move'), ['ass'])
+
+    def test_stretched_letters_still_match_doubled_terms(self):
+        automaton = screening.Automaton([('kill', True), ('ass', True)])
+        self.assertEqual(automaton.search('killl'), ['kill'])
+        self.assertEqual(automaton.search('KILLLLLL it'), ['kill'])
+        self.assertEqual(automaton.search('a sssilly asssss'), ['ass'])
+        self.assertEqual(automaton.search('as'), [])
+
+    def test_forms_screen_every_text_field_and_follow_term_changes(self):
+        form = DareForm(data={'title': 'Whatever works', 'dare_text': 'No drugs.'})
+        self.assertIn("contains inappropriate content: 'drugs'", form.errors['dare_text'][0])
+        self.assertNotIn('title', form.errors)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ScreeningTerm.objects.create(term='pineapple')
+        form = DareCompletionForm(data={
+            'completer_name': 'Tester', 'completer_email': 'tester@example.com',
+            'completion_proof': 'Ate a p1neapple on stage.',
+        })
+        self.assertIn('completion_proof', form.errors)
+
+    def test_rescreen_command_flags_stored_rows(self):
+        Dare.objects.filter(slug='seeded-dare-1').update(dare_text='Do seeded violence.')
+        output = StringIO()
+        call_command('rescreen', stdout=output, stderr=StringIO())
+        self.assertEqual(Dare.objects.get(slug='seeded-dare-1').screening_flags, ['violence'])
+        self.assertIn('dares: screened 3, 1 flagged, 1 changed.', output.getvalue())
+
+        ScreeningTerm.objects.filter(term='violence').update(is_active=False)
+        screening.conditional.bump_version('screening')
+        call_command('rescreen', '--kind', 'dares', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Dare.objects.get(slug='seeded-dare-1').screening_flags, [])
+
+
+class ModerationQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(9)
+        moderation.rebuild()
+        cls.alice = User.objects.create_superuser('alice', 'alice@example.com', 'pw')
+        cls.bob = User.objects.create_superuser('bob', 'bob@example.com', 'pw')
+
+    def test_queue_follows_status_and_priority(self):
+        pending = set(Dare.objects.filter(status='pending').values_list('pk', flat=True))
+        self.assertEqual(set(ModerationTask.objects.values_list('pk', flat=True)), pending)
+
+        newest = Dare.objects.filter(status='pending').latest('created_at')
+        Dare.objects.filter(pk=newest.pk).update(screening_flags=['drugs'])
+        moderation.rebuild()
+        self.assertEqual(moderation.available().first().pk, newest.pk)
+
+        newest.status = 'approved'
+        newest.save()
+        self.assertFalse(ModerationTask.objects.filter(pk=newest.pk).exists())
+
+    def test_concurrent_reviewers_claim_disjoint_batches_until_leases_lapse(self):
+        first = moderation.claim(self.alice, 2)
+        second = moderation.claim(self.bob, 5)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), ModerationTask.objects.count() - 2)
+        self.assertFalse(set(first) & set(second))
+
+        ModerationTask.objects.filter(pk__in=first).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(moderation.decide(self.alice, first[0], 'approved'))
+        self.assertEqual(sorted(moderation.claim(self.bob, 5)), sorted(first))
+
+    def test_admin_queue_claims_and_decides(self):
+        self.client.force_login(self.alice)
+        url = reverse('admin:dares_dare_moderation')
+        self.client.post(url, {'action': 'claim', 'count': 1})
+        response = self.client.get(url)
+        task = response.context['tasks'][0]
+        self.assertContains(response, task.dare.title)
+
+        self.client.post(url, {'action': 'reject', 'dare': task.pk, 'reason': 'Too risky'})
+        dare = Dare.objects.get(pk=task.pk)
+        self.assertEqual((dare.status, dare.rejection_reason), ('rejected', 'Too risky'))
+        self.assertFalse(ModerationTask.objects.filter(pk=task.pk).exists())
+
+
+class LikeStateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(6)
+        cls.dare = Dare.objects.filter(is_approved=True).earliest('slug')
+
+    def setUp(self):
+        cache.clear()
+
+    def like_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [query['sql'] for query in queries if 'dares_darelike' in query['sql']]
+
+    def test_visitors_without_likes_cost_no_lookup(self):
+        response, queries = self.like_queries(reverse('dares:dare_list'))
+        self.assertEqual((response.context['liked_dares'], queries), (set(), []))
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_liked_dares_are_marked_with_one_query(self):
+        self.client.post(
+            reverse('dares:dare_like', args=[self.dare.slug]), {'email': 'fan@example.com'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        response, queries = self.like_queries(reverse('dares:dare_list'))
+        self.assertEqual(response.context['liked_dares'], {self.dare.pk})
+        self.assertEqual(len(queries), 1)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertTrue(self.client.get(self.dare.get_absolute_url()).context['user_has_liked'])
+
+        # Unliking rebuilds the filter without the dare
+        self.client.post(
+            reverse('dares:dare_like', args=[self.dare.slug]), {'email': 'fan@example.com'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        response, queries = self.like_queries(reverse('dares:dare_list'))
+        self.assertEqual((response.context['liked_dares'], queries), (set(), []))
+
+    def test_anonymous_likes_do_not_reveal_the_emails_history(self):
+        other = Dare.objects.filter(is_approved=True).exclude(pk=self.dare.pk).first()
+        DareLike.objects.filter(dare=other, user_email='liker0@example.com').delete()
+        self.client.post(
+            reverse('dares:dare_like', args=[other.slug]), {'email': 'liker0@example.com'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        response = self.client.get(reverse('dares:dare_list'))
+        self.assertEqual(response.context['liked_dares'], {other.pk})
+        self.assertFalse(self.client.get(self.dare.get_absolute_url()).context['user_has_liked'])
+
+    def test_signed_in_users_see_likes_made_under_their_email(self):
+        self.client.force_login(User.objects.create_user('liker0', 'liker0@example.com', 'pw'))
+        self.assertTrue(self.client.get(self.dare.get_absolute_url()).context['user_has_liked'])
+
+    def test_likes_match_the_account_email_ignoring_case(self):
+        DareLike.objects.filter(user_email='liker0@example.com').update(user_email='Liker0@Example.com')
+        self.client.force_login(User.objects.create_user('liker0', 'liker0@example.com', 'pw'))
+        self.assertIn(self.dare.pk, self.client.get(reverse('dares:dare_list')).context['liked_dares'])
+
+        # Toggling unlikes the stored row instead of adding a second one
+        self.client.post(reverse('dares:dare_like', args=[self.dare.slug]), HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertFalse(DareLike.objects.filter(dare=self.dare).filter(user_email__iexact='liker0@example.com').exists())
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        items = [str(n) for n in range(500)]
+        state = likes.make_state('a@example.com', items)
+        bloom = likes.BloomFilter.decode(state['size'], state['bloom'])
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertLess(sum(str(n) in bloom for n in range(500, 5500)), 250)
+
+
+class ActivityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(6)
+        cls.dare = Dare.objects.filter(is_approved=True).earliest('slug')
+
+    def setUp(self):
+        cache.clear()
+
+    def submit(self, email):
+        return DareForm(data={'email': email}, submission_limit=2).errors.get('email')
+
+    def test_summary_is_cached_until_the_identity_changes_something(self):
+        self.assertEqual(activity.summary('liker0@example.com')['liked'], 6)
+        with self.assertNumQueries(0):
+            activity.summary('liker0@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            DareLike.objects.filter(user_email='liker0@example.com', dare=self.dare).delete()
+            DareLike.objects.get(user_email='liker1@example.com', dare=self.dare).delete()
+        self.assertEqual(activity.summary('liker0@example.com')['liked'], 5)
+        self.assertEqual(activity.summary(' Liker0@Example.COM')['liked'], 5)
+
+    def test_submission_quota_ignores_rejected_dares(self):
+        Dare.objects.filter(slug__in=['seeded-dare-1', 'seeded-dare-2']).update(email='busy@example.com')
+        self.assertIsNotNone(self.submit('busy@example.com'))
+        self.assertIsNotNone(self.submit('BUSY@example.com'))
+        self.assertIsNone(self.submit('seeder3@example.com'))
+        # Counted in the database, so a cached summary cannot hide new dares
+        activity.summary('busy@example.com')
+        Dare.objects.filter(slug='seeded-dare-2').update(status='rejected')
+        self.assertIsNone(self.submit('busy@example.com'))
+        Dare.objects.filter(slug='seeded-dare-3').update(email='Busy@Example.com')
+        self.assertIsNotNone(self.submit('busy@example.com'))
+
+    def test_activity_page_lists_the_users_own_records(self):
+        self.assertEqual(self.client.get(reverse('dares:my_activity')).status_code, 302)
+        self.client.force_login(User.objects.create_user('liker0', 'liker0@example.com', 'pw'))
+        response = self.client.get(reverse('dares:my_activity'))
+        self.assertEqual(response.context['summary']['liked'], 6)
+        self.assertEqual(len(response.context['my_likes']), 6)
+        self.assertEqual(list(response.context['my_dares']), [])
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Requests every named route against a small and a larger dataset and
+    fails if a route's query count grows with the data or exceeds its budget
+    in dares/query_budgets.json. Run with UPDATE_QUERY_BUDGETS=1 to rewrite
+    the budget file from the current counts.
+    """
+
+    SMALL = 4
+    LARGE = 40
+
+    # How to exercise routes that are not plain anonymous GETs.
+    REQUESTS = {
+        'logout': {'method': 'post'},
+        'dares:dare_complete': {
+            'method': 'post', 'ajax': True,
+            'data': {
+                'completer_name': 'Budget', 'completer_email': 'budget-{label}@example.com',
+                'completion_proof': 'Did it.',
+            },
+        },
+        'dares:dare_like': {'method': 'post', 'ajax': True, 'data': {'email': 'budget-{label}@example.com'}},
+        'dares:newsletter_subscribe': {'method': 'post', 'ajax': True, 'data': {'email': 'news@example.com'}},
+        'dares:chatbot_response': {'method': 'post', 'json': {'message': 'What is Dareora?'}},
+        'dares:metrics': {'staff': True},
+        'dares:bulk_export': {'staff': True},
+        'dares:my_activity': {'user': True},
+        'dares:search_suggestions': {'query': {'q': 'seeded'}},
+        # The live stream is only served under ASGI; read its first frames
+        'dares:events': {'asgi': True},
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dares(cls.SMALL)
+        cls.dare = Dare.objects.filter(is_approved=True).earliest('slug')
+        cls.staff = User.objects.create_superuser('budget-admin', 'admin@example.com', 'pw')
+
+    def setUp(self):
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+        # Has likes on every seeded dare, so the activity page has rows to list
+        self.user_client = Client()
+        self.user_client.force_login(User.objects.create_user('budget-liker', 'liker0@example.com', 'pw'))
+
+    def route_kwargs(self, pattern):
+        values = {'slug': self.dare.slug, 'category_name': 'extreme', 'kind': 'dares'}
+        if pattern is None:
+            return {}
+        return {name: values[name] for name in pattern.pattern.converters}
+
+    async def read_stream(self, url):
+        response = await AsyncClient().get(url)
+        frames = response.streaming_content
+        # The retry hint and the first (heartbeat) frame
+        for _ in range(2):
+            await anext(frames)
+        await frames.aclose()
+        return response
+
+    def request(self, name, pattern, label):
+        spec = self.REQUESTS.get(name, {})
+        client = self.staff_client if spec.get('staff') or name.startswith('admin:') else self.client
+        if spec.get('user'):
+            client = self.user_client
+        url = reverse(name, kwargs=self.route_kwargs(pattern))
+        if spec.get('asgi'):
+            with override_settings(DARES_EVENT_HEARTBEAT_SECONDS=0.01):
+                return async_to_sync(self.read_stream)(url)
+        extra = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'} if spec.get('ajax') else {}
+        if spec.get('method') != 'post':
+            return client.get(url, spec.get('query', {}), **extra)
+        if 'json' in spec:
+            return client.post(url, spec['json'], content_type='application/json', **extra)
+        data = {key: value.format(label=label) for key, value in spec.get('data', {}).items()}
+        return client.post(url, data, **extra)
+
+    def measure(self, label):
+        recorders = {}
+        for name, pattern in iter_named_routes():
+            cache.clear()
+            with mock.patch.dict(os.environ, {'GEMINI_API_KEY': ''}), QueryRecorder() as recorder:
+                response = self.request(name, pattern, label)
+            self.assertNotEqual(response.status_code, 500, f'{name} raised a server error')
+            recorders[name] = recorder
+        return recorders
+
+    def test_query_counts_are_flat_and_within_budget(self):
+        small = self.measure('small')
+        seed_dares(self.LARGE - self.SMALL, start=self.SMALL)
+        large = self.measure('large')
+
+        if os.environ.get('UPDATE_QUERY_BUDGETS'):
+            save_budgets({name: len(recorder) for name, recorder in large.items()})
+            self.skipTest('query budgets rewritten')
+
+        budgets = load_budgets()
+        failures = []
+        for name, recorder in large.items():
+            problems = []
+            budget = budgets.get(name)
+            if budget is None:
+                problems.append(f'no budget in query_budgets.json ({len(recorder)} queries)')
+            elif len(recorder) > budget:
+                problems.append(f'{len(recorder)} queries, budget is {budget}')
+            if len(recorder) > len(small[name]):
+                problems.append(f'grows with data size: {len(small[name])} -> {len(recorder)} queries')
+            if problems:
+                failures.append(f"{name}: {'; '.join(problems)}\n{recorder.report()}")
+        if failures:
+            self.fail('Query budget violations:\n' + '\n'.join(failures))
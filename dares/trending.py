@@ -0,0 +1,99 @@
+"""
+Time-decayed "trending" score for dares.
+
+Each engagement of weight ``w`` at time ``t`` is worth ``w * 2^-(now - t)/h``
+at read time, for half-life ``h``. Because every score decays by the same
+factor, ordering by ``sum(w * 2^(t - EPOCH)/h)`` gives the same ranking at
+any ``now``, so a stored score never has to be recomputed as time passes.
+The sum is kept as its base-2 logarithm (it grows by one per half-life) to
+stay within float range.
+
+Engagements arrive through the ``dare_engaged`` signal, are summed per dare
+in a ``BatchBuffer`` and merged into ``TrendingScore`` rows, whose index on
+``score`` serves top-N reads without touching the rest of the Dare table.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import conditional
+from .batching import BatchBuffer
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+DEFAULT_WEIGHTS = {'view': 1.0, 'like': 5.0, 'completion': 10.0}
+
+
+def half_life():
+    return getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 24) * 3600
+
+
+def weights():
+    return getattr(settings, 'TRENDING_WEIGHTS', DEFAULT_WEIGHTS)
+
+
+def log2_add(a, b):
+    """``log2(2**a + 2**b)`` without overflowing."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def event_score(weight, when=None):
+    """Log-space contribution of one engagement of ``weight`` at ``when``."""
+    when = when or timezone.now()
+    return math.log2(weight) + (when - EPOCH).total_seconds() / half_life()
+
+
+def now_score():
+    """Score of a single weight-1 engagement happening right now."""
+    return event_score(1.0)
+
+
+def locked_rows(dare_ids):
+    """``{dare_id: row}`` for the existing scores of ``dare_ids``, locked for update."""
+    from .models import TrendingScore
+    return {row.dare_id: row for row in TrendingScore.objects.select_for_update().filter(dare_id__in=dare_ids)}
+
+
+def apply_scores(batch):
+    """Merge ``{dare_id: log-space score}`` into ``TrendingScore`` rows."""
+    from .models import Dare, TrendingScore
+
+    with transaction.atomic():
+        live = set(Dare.objects.filter(pk__in=batch, is_approved=True).values_list('pk', flat=True))
+        rows = locked_rows(live)
+        missing = live - rows.keys()
+        if missing:
+            # Another worker's flush may create some of these rows first;
+            # insert empty (2**-inf = 0) rows past it, then lock and add to
+            # whichever won
+            TrendingScore.objects.bulk_create(
+                [TrendingScore(dare_id=pk, score=-math.inf) for pk in missing], ignore_conflicts=True,
+            )
+            rows.update(locked_rows(missing))
+        now = timezone.now()
+        for row in rows.values():
+            row.score = log2_add(row.score, batch[row.dare_id])
+            row.updated_at = now
+        TrendingScore.objects.bulk_update(rows.values(), ['score', 'updated_at'])
+        conditional.schedule_bump('trending')
+
+
+buffer = BatchBuffer(
+    apply_scores, log2_add,
+    max_items=getattr(settings, 'TRENDING_BUFFER_SIZE', 500),
+    max_age=getattr(settings, 'TRENDING_BUFFER_SECONDS', 10),
+)
+
+
+def record_engagement(sender, dare, kind, **kwargs):
+    weight = weights().get(kind)
+    if weight:
+        buffer.add(dare.pk, event_score(weight))
@@ -1,5 +1,4 @@
 from django.urls import path
-from django.views.generic import TemplateView
 from .views import (
     HomeView,
     DareListView,
@@ -15,8 +14,17 @@ from .views import (
     ContactView,
     NewsletterSubscribeView,
     APIStatsView,
+    APIStatsSeriesView,
     SearchSuggestionsView,
+    MetricsView,
+    EventStreamView,
+    BulkExportView,
+    BulkImportView,
     CommunityView,
+    MyActivityView,
+    PrivacyView,
+    TermsView,
+    FAQView,
     chatbot_response
 )
 
@@ -31,6 +39,7 @@ urlpatterns = [
     path('features/', AboutView.as_view(), name='about'),
     path('contact/', ContactView.as_view(), name='contact'),
     path('stats/', StatsView.as_view(), name='stats'),
+    path('me/', MyActivityView.as_view(), name='my_activity'),
     
     # Dare CRUD operations
     path('dare/new/', DareCreateView.as_view(), name='dare_create'),
@@ -49,11 +58,18 @@ urlpatterns = [
     
     # API endpoints
     path('api/stats/', APIStatsView.as_view(), name='api_stats'),
+    path('api/stats/series/', APIStatsSeriesView.as_view(), name='api_stats_series'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+    path('events/', EventStreamView.as_view(), name='events'),
+    
+    # Staff-only bulk data transfer
+    path('staff/export/<str:kind>/', BulkExportView.as_view(), name='bulk_export'),
+    path('staff/import/<str:kind>/', BulkImportView.as_view(), name='bulk_import'),
     
     # Static pages (These are fine here if they are part of the 'dares' app context)
-    path('privacy/', TemplateView.as_view(template_name='privacy.html'), name='privacy'),
-    path('terms/', TemplateView.as_view(template_name='terms.html'), name='terms'),
-    path('faq/', TemplateView.as_view(template_name='faq.html'), name='faq'),
+    path('privacy/', PrivacyView.as_view(), name='privacy'),
+    path('terms/', TermsView.as_view(), name='terms'),
+    path('faq/', FAQView.as_view(), name='faq'),
 
     # Backend endpoint for the chatbot
     path('chatbot-response/', chatbot_response, name='chatbot_response'),
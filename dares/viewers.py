@@ -0,0 +1,194 @@
+"""
+Approximate unique viewers per dare and per day, with HyperLogLog sketches.
+
+A visitor is identified by their account when signed in, otherwise by a
+hash of their address and user agent (no cookie is set, so public pages
+stay cacheable), and obvious bots are skipped. The visitor's 64-bit hash
+picks one of ``REGISTERS`` registers by its top ``PRECISION`` bits and the
+register keeps the longest run of leading zeros seen in the rest, so a
+sketch has a fixed size (2 KB, stored zlib-compressed, a few dozen bytes
+while sparse) however many visitors it has absorbed, and estimates their
+number within about 2.3%. Sketches merge by taking the larger of each pair
+of registers, so workers, days and dares combine without double counting.
+
+Each view goes into four sketches (``ViewerSketch`` rows): the dare's day
+and all-time sketches and the site's. Hashes are buffered in memory and
+merged into the rows in batches; the row keeps the current estimate next
+to the registers so pages read a single integer.
+"""
+import hashlib
+import math
+import re
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .batching import BatchBuffer
+
+PRECISION = 11
+REGISTERS = 1 << PRECISION
+ALPHA = 0.7213 / (1 + 1.079 / REGISTERS)
+REST_BITS = 64 - PRECISION
+
+BOT_AGENTS = re.compile(r'bot|crawl|spider|slurp|preview|headless|monitor|curl|wget|python-', re.IGNORECASE)
+
+DEFAULT_RETENTION_DAYS = 90
+
+
+class HyperLogLog:
+    def __init__(self, registers=None):
+        self.registers = bytearray(registers) if registers is not None else bytearray(REGISTERS)
+
+    def add(self, hashed):
+        """Add a 64-bit hash."""
+        index = hashed >> REST_BITS
+        rest = hashed & ((1 << REST_BITS) - 1)
+        rank = REST_BITS - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        total = sum(2.0 ** -register for register in self.registers)
+        estimate = ALPHA * REGISTERS * REGISTERS / total
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * REGISTERS and zeros:
+            # Few visitors: linear counting over the empty registers is more accurate
+            estimate = REGISTERS * math.log(REGISTERS / zeros)
+        return round(estimate)
+
+    def to_bytes(self):
+        return zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls(zlib.decompress(data))
+
+
+def sketch_key(dare_id=None, day=None):
+    scope = f'dare:{dare_id}' if dare_id is not None else 'site'
+    return f'{scope}:{day.isoformat()}' if day is not None else scope
+
+
+def visitor_hash(request):
+    """64-bit hash of the visitor, or ``None`` for bots."""
+    agent = request.META.get('HTTP_USER_AGENT', '')
+    if not agent or BOT_AGENTS.search(agent):
+        return None
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        identity = f'user:{user.pk}'
+    else:
+        identity = f"client:{request.META.get('REMOTE_ADDR', '')}|{agent}"
+    return int.from_bytes(hashlib.blake2b(identity.encode(), digest_size=8).digest(), 'big')
+
+
+def union(pending, hashes):
+    pending |= hashes
+    return pending
+
+
+def locked_rows(keys):
+    """``{key: row}`` for the existing sketches among ``keys``, locked for update."""
+    from .models import ViewerSketch
+    return {row.key: row for row in ViewerSketch.objects.select_for_update().filter(key__in=keys)}
+
+
+def apply_sketches(batch):
+    """Merge ``{(dare_id, day): {hash, ...}}`` into the ``ViewerSketch`` rows."""
+    from .models import Dare, ViewerSketch
+
+    live = set(Dare.objects.filter(pk__in={dare_id for dare_id, _ in batch}).values_list('pk', flat=True))
+    updates = {}
+    for (dare_id, day), hashes in batch.items():
+        if dare_id not in live:
+            continue
+        for scope, period in ((dare_id, day), (dare_id, None), (None, day), (None, None)):
+            updates.setdefault(sketch_key(scope, period), (scope, period, set()))[2].update(hashes)
+    if not updates:
+        return
+
+    with transaction.atomic():
+        rows = locked_rows(updates)
+        missing = updates.keys() - rows.keys()
+        if missing:
+            # Another worker's flush may create some of these rows first;
+            # insert empty rows past it, then lock and merge into whichever won
+            empty = HyperLogLog().to_bytes()
+            ViewerSketch.objects.bulk_create([
+                ViewerSketch(key=key, dare_id=updates[key][0], day=updates[key][1], registers=empty)
+                for key in missing
+            ], ignore_conflicts=True)
+            rows.update(locked_rows(missing))
+        now = timezone.now()
+        for key, (_, _, hashes) in updates.items():
+            row = rows[key]
+            sketch = HyperLogLog.from_bytes(row.registers)
+            for hashed in hashes:
+                sketch.add(hashed)
+            row.registers, row.estimate, row.updated_at = sketch.to_bytes(), sketch.count(), now
+        ViewerSketch.objects.bulk_update(rows.values(), ['registers', 'estimate', 'updated_at'])
+
+
+buffer = BatchBuffer(
+    apply_sketches, union,
+    max_items=getattr(settings, 'VIEWER_BUFFER_SIZE', 500),
+    max_age=getattr(settings, 'VIEWER_BUFFER_SECONDS', 10),
+)
+
+
+def record(request, dare):
+    hashed = visitor_hash(request)
+    if hashed is not None:
+        buffer.add((dare.pk, timezone.localdate()), {hashed})
+
+
+def estimates(keys):
+    """``{key: estimate}`` for the sketches that exist."""
+    from .models import ViewerSketch
+    return dict(ViewerSketch.objects.filter(key__in=keys).values_list('key', 'estimate'))
+
+
+def unique_viewers(dare_id):
+    """``{'total': n, 'today': n}`` estimated unique viewers of a dare."""
+    total, today = sketch_key(dare_id), sketch_key(dare_id, timezone.localdate())
+    found = estimates([total, today])
+    return {'total': found.get(total, 0), 'today': found.get(today, 0)}
+
+
+def union_estimate(keys):
+    """Estimated unique visitors across several sketches (e.g. a week of days)."""
+    from .models import ViewerSketch
+
+    sketch = HyperLogLog()
+    for registers in ViewerSketch.objects.filter(key__in=keys).values_list('registers', flat=True).iterator():
+        sketch.merge(HyperLogLog.from_bytes(registers))
+    return sketch.count()
+
+
+def site_summary(days=14):
+    """Site-wide unique viewers: all time, over the last seven days, and per day."""
+    today = timezone.localdate()
+    period = [today - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+    daily = estimates([sketch_key(), *(sketch_key(day=day) for day in period)])
+    return {
+        'total': daily.get(sketch_key(), 0),
+        'week': union_estimate([sketch_key(day=day) for day in period[-7:]]),
+        'daily': [{'day': day, 'viewers': daily.get(sketch_key(day=day), 0)} for day in period],
+    }
+
+
+def prune(days=None):
+    """Drop per-dare day sketches older than the retention; totals and site days are kept."""
+    from .models import ViewerSketch
+
+    days = days or getattr(settings, 'VIEWER_SKETCH_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+    cutoff = timezone.localdate() - timedelta(days=days)
+    deleted, _ = ViewerSketch.objects.filter(dare__isnull=False, day__lt=cutoff).delete()
+    return deleted
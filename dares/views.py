@@ -1,40 +1,72 @@
-from django.shortcuts import render, get_object_or_404, redirect
+from django.shortcuts import render, get_object_or_404, aget_object_or_404, redirect
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.views.generic.base import TemplateView
 from django.views import View
 from django.urls import reverse_lazy, reverse
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse, Http404
+from django.http import JsonResponse, HttpResponse, Http404, StreamingHttpResponse
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import IntegrityError
 from django.db.models import Q, F, Count, Avg, Max, Min
 from django.db.models.functions import TruncDate
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
-from django.template.loader import render_to_string
+from django.template.loader import get_template, render_to_string
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.cache import cache_page
 from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.cache import patch_cache_control
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from django.views import generic
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.admin.views.decorators import staff_member_required
+import codecs
+import csv
 import json
 import datetime
-import google.generativeai as genai
+import hashlib
+import logging
 from collections import defaultdict
 import os
 
-from .models import Dare, Category, DifficultyLevel, DareCompletion, DareLike, SiteConfiguration
+from asgiref.sync import sync_to_async
+
+from . import activity, bulk, conditional, events, feeds, likes, metrics, recommendations, series, viewers, warmup
+from .caching import aget_or_build, get_or_build
+from .conditional import CachePolicyMixin
+from .models import Dare, Category, DifficultyLevel, DareCompletion, DareLike, SiteConfiguration, ViewerSketch
 from .forms import DareForm, DareSearchForm, DareCompletionForm, ContactForm, NewsletterForm, CustomUserCreationForm
 
-class HomeView(TemplateView):
+logger = logging.getLogger(__name__)
+
+class LikeStateMixin:
+    """For pages marking the dares the visitor liked: private, and tagged per visitor, once they have likes"""
+
+    def get_personal_token(self):
+        return likes.state_token(self.request)
+
+class HomeView(CachePolicyMixin, TemplateView):
+    """Homepage assembled from the cached feed; no queries on a warm cache"""
     template_name = 'home.html'
+    
+    def get_validators(self):
+        self.feed = feeds.get_home_feed()
+        return self.feed['version'], self.feed['generated_at']
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['feed'] = self.feed
+        return context
 
-class DareDetailView(DetailView):
+class DareDetailView(LikeStateMixin, CachePolicyMixin, DetailView):
     model = Dare
     template_name = 'dare_detail.html'
     context_object_name = 'dare'
@@ -46,9 +78,32 @@ class DareDetailView(DetailView):
             'category', 'difficulty'
         )
     
+    def get_validators(self):
+        # The lookup is reused by get_object, so validating costs no extra query
+        self.dare = self.get_queryset().filter(slug=self.kwargs['slug']).first()
+        if self.dare is None:
+            return None, None
+        token, changed_at = conditional.content_versions('dares', 'completions')
+        # views_count is left out, or no request would ever validate
+        version = '-'.join(str(part) for part in (
+            self.dare.pk, self.dare.updated_at.timestamp(), self.dare.likes_count,
+            self.dare.completions_count, token,
+        ))
+        return version, max(self.dare.updated_at, changed_at)
+    
+    def count_view(self, dare):
+        # Cache warming after a deploy is not a visitor
+        if not warmup.is_warmup(self.request):
+            dare.increment_views()
+            viewers.record(self.request, dare)
+    
+    def not_modified(self, response):
+        # A revalidated page is still a view
+        self.count_view(self.dare)
+    
     def get_object(self, queryset=None):
-        obj = super().get_object(queryset)
-        obj.increment_views()
+        obj = getattr(self, 'dare', None) or super().get_object(queryset)
+        self.count_view(obj)
         return obj
     
     def get_context_data(self, **kwargs):
@@ -59,13 +114,16 @@ class DareDetailView(DetailView):
             dare=self.object, is_verified=True
         ).order_by('-completed_at')[:5]
         
-        context['user_has_liked'] = False
-        context['related_dares'] = Dare.objects.filter(
+        context['user_has_liked'] = self.object.pk in likes.liked_ids(self.request, [self.object])
+        # Like views_count, shown as of the page's last other change
+        context['unique_viewers'] = viewers.unique_viewers(self.object.pk)
+        # Precomputed co-engagement picks; same-category dares until there are any
+        context['related_dares'] = list(recommendations.recommended_for(self.object)) or Dare.objects.filter(
             category=self.object.category,
             is_approved=True
         ).exclude(id=self.object.id).select_related(
             'category', 'difficulty'
-        )[:4]
+        ).order_by('-created_at')[:4]
         
         total_attempts = DareCompletion.objects.filter(dare=self.object).count()
         verified_completions = DareCompletion.objects.filter(
@@ -93,9 +151,17 @@ class DareCreateView(SuccessMessageMixin, CreateView):
         context['page_description'] = "Fill out the form to submit a new dare to the exchange."
         return context
 
+    @cached_property
+    def config(self):
+        return SiteConfiguration.get_config()
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs['submission_limit'] = self.config.max_dares_per_user
+        return kwargs
+
     def form_valid(self, form):
-        config = SiteConfiguration.get_config()
-        if config.require_approval:
+        if self.config.require_approval:
             form.instance.status = 'pending'
         else:
             form.instance.status = 'approved'
@@ -109,8 +175,7 @@ class DareCreateView(SuccessMessageMixin, CreateView):
         return response
     
     def get_success_url(self):
-        config = SiteConfiguration.get_config()
-        if config.require_approval:
+        if self.config.require_approval:
             messages.info(
                 self.request, 
                 "Your dare is under review and will be published once approved."
@@ -136,7 +201,7 @@ class DareCreateView(SuccessMessageMixin, CreateView):
                 fail_silently=True,
             )
         except Exception as e:
-            print(f"Failed to send admin notification: {e}")
+            logger.exception("Failed to send admin notification: %s", e)
     
     def send_user_confirmation(self):
         try:
@@ -155,7 +220,7 @@ class DareCreateView(SuccessMessageMixin, CreateView):
                 fail_silently=True,
             )
         except Exception as e:
-            print(f"Failed to send user confirmation: {e}")
+            logger.exception("Failed to send user confirmation: %s", e)
 
 class DareUpdateView(SuccessMessageMixin, UpdateView):
     model = Dare
@@ -195,30 +260,30 @@ class DareDeleteView(DeleteView):
         messages.success(request, "🗑️ Dare deleted successfully.")
         return super().delete(request, *args, **kwargs)
 
-class CategoryDetailView(ListView):
+class CategoryDetailView(CachePolicyMixin, ListView):
     model = Dare
     template_name = 'category_detail.html'
     context_object_name = 'dares'
     paginate_by = 12
     
+    def get_validators(self):
+        return conditional.content_versions('dares', 'engagement')
+    
     def get_queryset(self):
         self.category = get_object_or_404(Category, name=self.kwargs['category_name'])
-        return Dare.objects.filter(
-            category=self.category,
-            is_approved=True
-        ).select_related('category', 'difficulty').order_by('-created_at')
+        self.category_dares = Dare.objects.filter(category=self.category, is_approved=True)
+        return self.category_dares.select_related('category', 'difficulty').order_by('-created_at')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['category'] = self.category
         
         # Get category statistics
+        totals = self.category_dares.aggregate(total=Count('id'), avg=Avg('difficulty__id'))
         context['category_stats'] = {
-            'total_dares': self.get_queryset().count(),
-            'avg_difficulty': self.get_queryset().aggregate(
-                avg=Avg('difficulty__id')
-            )['avg'] or 0,
-            'most_popular': self.get_queryset().order_by('-views_count').first(),
+            'total_dares': totals['total'],
+            'avg_difficulty': totals['avg'] or 0,
+            'most_popular': self.category_dares.order_by('-views_count').first(),
         }
         
         return context
@@ -226,21 +291,22 @@ class CategoryDetailView(ListView):
 class DareCompletionCreateView(View):
     """Handle dare completion submissions via AJAX"""
     
-    def post(self, request, slug):
-        dare = get_object_or_404(Dare, slug=slug, is_approved=True)
+    async def post(self, request, slug):
+        dare = await aget_object_or_404(Dare, slug=slug, is_approved=True)
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             form = DareCompletionForm(request.POST)
             
-            if form.is_valid():
+            # Model validation may query the database
+            if await sync_to_async(form.is_valid)():
                 completion = form.save(commit=False)
                 completion.dare = dare
                 
                 # Check if user already completed this dare
-                existing = DareCompletion.objects.filter(
+                existing = await DareCompletion.objects.filter(
                     dare=dare,
                     completer_email=completion.completer_email
-                ).first()
+                ).afirst()
                 
                 if existing:
                     return JsonResponse({
@@ -248,8 +314,8 @@ class DareCompletionCreateView(View):
                         'error': 'You have already submitted a completion for this dare.'
                     })
                 
-                completion.save()
-                dare.increment_completions()
+                await completion.asave()
+                await dare.aincrement_completions()
                 
                 return JsonResponse({
                     'success': True,
@@ -267,31 +333,38 @@ class DareCompletionCreateView(View):
 class DareLikeToggleView(View):
     """Handle dare likes via AJAX"""
     
-    def post(self, request, slug):
-        dare = get_object_or_404(Dare, slug=slug, is_approved=True)
+    async def post(self, request, slug):
+        dare = await aget_object_or_404(Dare, slug=slug, is_approved=True)
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            # Simple email-based tracking (you might want to use sessions or user accounts)
-            email = request.POST.get('email')
+            # Likes are keyed by email; signed-in users like as their account
+            user = await request.auser()
+            email = user.email if user.is_authenticated and user.email else request.POST.get('email')
             if not email:
                 return JsonResponse({'success': False, 'error': 'Email required'})
             
-            like, created = DareLike.objects.get_or_create(
-                dare=dare,
-                user_email=email
-            )
-            
-            if created:
-                dare.increment_likes()
+            # The hot write path: a bare INSERT, without the transaction
+            # get_or_create wraps it in; the unique key still settles races
+            like = await activity.for_email(DareLike.objects.filter(dare=dare), 'user_email', email).afirst()
+            if like is None:
                 liked = True
+                try:
+                    await DareLike.objects.acreate(dare=dare, user_email=email)
+                except IntegrityError:
+                    # A concurrent request liked it first and counted it
+                    pass
+                else:
+                    await dare.aincrement_likes()
             else:
-                like.delete()
-                dare.likes_count = F('likes_count') - 1
-                dare.save(update_fields=['likes_count'])
+                await like.adelete()
+                await dare.adecrement_likes()
                 liked = False
             
-            # Refresh from database to get updated count
-            dare.refresh_from_db()
+            await likes.arecord(request, email, dare.slug, liked)
+            
+            # The increment mirrors the count on the instance, so the response
+            # needs no second read (a queued SQLite counter would not show yet)
+            await events.apublish('like', dare, likes_count=dare.likes_count)
             
             return JsonResponse({
                 'success': True,
@@ -301,30 +374,47 @@ class DareLikeToggleView(View):
         
         return JsonResponse({'success': False, 'error': 'Invalid request'})
 
-class StatsView(TemplateView):
+class StatsView(CachePolicyMixin, TemplateView):
     """Display site statistics and analytics"""
     template_name = 'stats.html'
+    cache_s_maxage = 60 * 5
+    cache_stale_while_revalidate = 60 * 30
+    
+    SNAPSHOT_KEY = 'dares:stats-snapshot:{}'
+    SNAPSHOT_TIMEOUT = 60 * 15
+    
+    def get_validators(self):
+        # Keyed by the content versions, so any change builds a new snapshot
+        token, _ = conditional.content_versions('dares', 'completions', 'engagement')
+        self.snapshot = get_or_build(self.SNAPSHOT_KEY.format(token), self.build_snapshot, self.SNAPSHOT_TIMEOUT)
+        return self.snapshot['version'], self.snapshot['generated_at']
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context.update(self.snapshot)
+        return context
+    
+    def build_snapshot(self):
+        snapshot = {}
         
         # Overall statistics
-        context['total_dares'] = Dare.objects.filter(is_approved=True).count()
-        context['total_completions'] = DareCompletion.objects.filter(is_verified=True).count()
-        context['total_likes'] = DareLike.objects.count()
+        snapshot['total_dares'] = Dare.objects.filter(is_approved=True).count()
+        snapshot['total_completions'] = DareCompletion.objects.filter(is_verified=True).count()
+        snapshot['total_likes'] = DareLike.objects.count()
+        snapshot['total_users'] = User.objects.filter(is_active=True).count()
         
         # Category breakdown
-        context['category_stats'] = Category.objects.filter(is_active=True).annotate(
+        snapshot['category_stats'] = list(Category.objects.filter(is_active=True).annotate(
             dare_count=Count('dares', filter=Q(dares__is_approved=True)),
             completion_count=Count('dares__completions', filter=Q(dares__completions__is_verified=True)),
             likes_count=Count('dares__user_likes')
-        ).order_by('-dare_count')
+        ).order_by('-dare_count').values('name', 'dare_count', 'completion_count', 'likes_count'))
         
         # Difficulty breakdown
-        context['difficulty_stats'] = DifficultyLevel.objects.annotate(
+        snapshot['difficulty_stats'] = list(DifficultyLevel.objects.annotate(
             dare_count=Count('dares', filter=Q(dares__is_approved=True)),
             avg_completions=Avg('dares__completions_count')
-        ).order_by('id')
+        ).order_by('id').values('name', 'dare_count', 'avg_completions'))
         
         # Monthly submission trends (last 12 months)
         twelve_months_ago = timezone.now() - datetime.timedelta(days=365)
@@ -337,22 +427,26 @@ class StatsView(TemplateView):
             count=Count('id')
         ).order_by('month')
         
-        context['monthly_submissions'] = list(monthly_data)
+        snapshot['monthly_submissions'] = list(monthly_data)
         
         # Top performers
-        context['most_viewed_dares'] = Dare.objects.filter(
-            is_approved=True
-        ).order_by('-views_count')[:10]
-        
-        context['most_liked_dares'] = Dare.objects.filter(
-            is_approved=True
-        ).order_by('-likes_count')[:10]
-        
-        context['most_completed_dares'] = Dare.objects.filter(
-            is_approved=True
-        ).order_by('-completions_count')[:10]
-        
-        return context
+        approved = Dare.objects.filter(is_approved=True)
+        fields = ('title', 'slug', 'views_count', 'likes_count', 'completions_count')
+        snapshot['most_viewed_dares'] = list(approved.order_by('-views_count').values(*fields)[:10])
+        snapshot['most_liked_dares'] = list(approved.order_by('-likes_count').values(*fields)[:10])
+        snapshot['most_completed_dares'] = list(approved.order_by('-completions_count').values(*fields)[:10])
+        
+        # Approximate unique viewers (HyperLogLog, see dares.viewers)
+        snapshot['unique_viewers'] = viewers.site_summary()
+        snapshot['most_unique_viewers'] = list(ViewerSketch.objects.filter(
+            day__isnull=True, dare__isnull=False, dare__is_approved=True,
+        ).order_by('-estimate').values('estimate', title=F('dare__title'), slug=F('dare__slug'))[:10])
+        
+        snapshot['version'] = hashlib.sha1(
+            json.dumps(snapshot, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        snapshot['generated_at'] = timezone.now().replace(microsecond=0)
+        return snapshot
 
 class AboutView(TemplateView):
     """About page with site information"""
@@ -397,7 +491,7 @@ class ContactView(SuccessMessageMixin, View):
                 fail_silently=True,
             )
         except Exception as e:
-            print(f"Failed to send contact email: {e}")
+            logger.exception("Failed to send contact email: %s", e)
 
 class NewsletterSubscribeView(View):
     """Handle newsletter subscriptions via AJAX"""
@@ -423,43 +517,173 @@ class NewsletterSubscribeView(View):
         
         return JsonResponse({'success': False, 'error': 'Invalid request'})
 
-@method_decorator(cache_page(60 * 15), name='dispatch')  # Cache for 15 minutes
 class APIStatsView(View):
     """JSON API endpoint for statistics (for charts/widgets)"""
     
-    def get(self, request):
-        stats = {
+    CACHE_KEY = 'dares:api-stats'
+    CACHE_TIMEOUT = 60 * 15  # Cache for 15 minutes
+    
+    async def get(self, request):
+        stats = await aget_or_build(self.CACHE_KEY, self.build_stats, self.CACHE_TIMEOUT)
+        version = hashlib.sha1(json.dumps(stats, sort_keys=True).encode()).hexdigest()[:16]
+        # The same for every visitor, so skip the per-user tag and its session lookup
+        response, headers = conditional.conditional(request, version, per_user=False)
+        if response is None:
+            response = JsonResponse(stats)
+            for header, value in headers.items():
+                response[header] = value
+        patch_cache_control(
+            response, public=True, max_age=self.CACHE_TIMEOUT, s_maxage=self.CACHE_TIMEOUT,
+            stale_while_revalidate=self.CACHE_TIMEOUT,
+        )
+        return response
+    
+    async def build_stats(self):
+        return {
             'totals': {
-                'dares': Dare.objects.filter(is_approved=True).count(),
-                'completions': DareCompletion.objects.filter(is_verified=True).count(),
-                'likes': DareLike.objects.count(),
-                'categories': Category.objects.filter(is_active=True).count(),
+                'dares': await Dare.objects.filter(is_approved=True).acount(),
+                'completions': await DareCompletion.objects.filter(is_verified=True).acount(),
+                'likes': await DareLike.objects.acount(),
+                'categories': await Category.objects.filter(is_active=True).acount(),
             },
-            'categories': list(Category.objects.filter(is_active=True).annotate(
+            'categories': [row async for row in Category.objects.filter(is_active=True).annotate(
                 count=Count('dares', filter=Q(dares__is_approved=True))
-            ).values('name', 'count')),
-            'difficulties': list(DifficultyLevel.objects.annotate(
+            ).values('name', 'count')],
+            'difficulties': [row async for row in DifficultyLevel.objects.annotate(
                 count=Count('dares', filter=Q(dares__is_approved=True))
-            ).values('name', 'count')),
+            ).values('name', 'count')],
         }
-        
-        return JsonResponse(stats)
+
+class APIStatsSeriesView(View):
+    """
+    Daily views, likes and completions as JSON, site-wide or for up to
+    MAX_DARES dares (``?dare=<slug>``, repeatable, summed under ``total``).
+    ``start``/``end`` are ISO dates, the last 30 days by default.
+    """
+    
+    CACHE_KEY = 'dares:api-series:{}'
+    CACHE_TIMEOUT = 60 * 5
+    MAX_DAYS = 366
+    MAX_DARES = 50
+    METRICS = {f'{kind}s': kind for kind in series.METRICS}
+    
+    def get(self, request):
+        try:
+            end = datetime.date.fromisoformat(request.GET.get('end') or timezone.localdate().isoformat())
+            start = datetime.date.fromisoformat(
+                request.GET.get('start') or (end - datetime.timedelta(days=29)).isoformat()
+            )
+        except ValueError:
+            return JsonResponse({'error': 'start and end must be YYYY-MM-DD dates'}, status=400)
+        if not 0 <= (end - start).days < self.MAX_DAYS:
+            return JsonResponse({'error': f'The range must run forward and span at most {self.MAX_DAYS} days'}, status=400)
+        metrics = request.GET.getlist('metric') or list(self.METRICS)
+        if set(metrics) - set(self.METRICS):
+            return JsonResponse({'error': f"metric must be one of {', '.join(self.METRICS)}"}, status=400)
+        slugs = sorted(set(request.GET.getlist('dare')))
+        if len(slugs) > self.MAX_DARES:
+            return JsonResponse({'error': f'At most {self.MAX_DARES} dares per request'}, status=400)
+        
+        params = json.dumps([slugs, metrics, start.isoformat(), end.isoformat()])
+        data = get_or_build(
+            self.CACHE_KEY.format(hashlib.sha1(params.encode()).hexdigest()),
+            lambda: self.build(slugs, metrics, start, end), self.CACHE_TIMEOUT,
+        )
+        response = JsonResponse(data)
+        patch_cache_control(response, public=True, max_age=self.CACHE_TIMEOUT, s_maxage=self.CACHE_TIMEOUT)
+        return response
+    
+    def build(self, slugs, metrics, start, end):
+        dares = dict(Dare.objects.filter(slug__in=slugs, is_approved=True).values_list('pk', 'slug')) if slugs else {}
+        result = series.query(list(dares) or [None], [self.METRICS[metric] for metric in metrics], start, end)
+        data = {
+            'start': start.isoformat(), 'end': end.isoformat(), 'days': result['days'],
+            'total': self.by_metric(result['total']),
+        }
+        if slugs:
+            data['dares'] = {dares[pk]: self.by_metric(counts) for pk, counts in result['series'].items()}
+        return data
+    
+    def by_metric(self, counts):
+        return {f'{kind}s': values for kind, values in counts.items()}
+
+@method_decorator(staff_member_required, name='dispatch')
+class MetricsView(View):
+    """Per-route request metrics for this worker in Prometheus text format"""
+    
+    def get(self, request):
+        return HttpResponse(
+            metrics.registry.render_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8'
+        )
+
+@method_decorator(staff_member_required, name='dispatch')
+class BulkExportView(View):
+    """Stream dares, completions or likes as CSV (default) or ?format=jsonl"""
+    
+    def get(self, request, kind):
+        fmt = request.GET.get('format', 'csv')
+        if kind not in bulk.KINDS or fmt not in bulk.FORMATS:
+            raise Http404
+        response = StreamingHttpResponse(bulk.export_lines(kind, fmt), content_type=bulk.FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+@method_decorator(staff_member_required, name='dispatch')
+class BulkImportView(View):
+    """Import an uploaded CSV/JSONL file of dares, completions or likes"""
+    
+    def post(self, request, kind):
+        upload = request.FILES.get('file')
+        if kind not in bulk.KINDS or upload is None:
+            return JsonResponse({'success': False, 'error': 'Upload a file of a known kind.'}, status=400)
+        fmt = request.POST.get('format') or upload.name.rsplit('.', 1)[-1]
+        if fmt not in bulk.FORMATS:
+            return JsonResponse({'success': False, 'error': 'Format must be csv or jsonl.'}, status=400)
+        # Large uploads are spooled to disk by Django and read line by line
+        lines = codecs.iterdecode(upload, 'utf-8')
+        try:
+            result = bulk.import_records(kind, bulk.read_records(lines, fmt))
+        except (ValueError, csv.Error) as error:
+            return JsonResponse({'success': False, 'error': str(error)}, status=400)
+        return JsonResponse({'success': True, **result.as_dict()})
+
+class EventStreamView(View):
+    """Server-sent events for likes, verified completions and new approvals"""
+    
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            # WSGI buffers an async stream whole, holding a worker for every
+            # open page; 204 tells EventSource to stop reconnecting
+            return HttpResponse(status=204)
+        # ?dare=<slug> and ?type=<event type> (both repeatable) narrow the stream
+        stream = events.stream(dares=request.GET.getlist('dare'), types=request.GET.getlist('type'))
+        response = StreamingHttpResponse(stream, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
 
 class SearchSuggestionsView(View):
-    def get(self, request, *args, **kwargs):
+    async def get(self, request, *args, **kwargs):
         query = request.GET.get('q', '')
         suggestions = []
         if query:
-            dares = Dare.objects.filter(title__icontains=query)[:5]
-            suggestions = [{'title': dare.title, 'url': dare.get_absolute_url()} for dare in dares]
+            dares = Dare.objects.filter(title__icontains=query).only('title', 'slug')[:5]
+            suggestions = [{'title': dare.title, 'url': dare.get_absolute_url()} async for dare in dares]
         return JsonResponse({'suggestions': suggestions})
 
-class DareListView(ListView):
+class DareListView(LikeStateMixin, CachePolicyMixin, ListView):
     model = Dare
     template_name = 'dare_list.html'
     context_object_name = 'dares'
     paginate_by = 12
     
+    def get_validators(self):
+        names = ['dares', 'engagement']
+        if self.request.GET.get('sort_by') == 'trending':
+            names.append('trending')
+        return conditional.content_versions(*names)
+    
     def get_queryset(self):
         queryset = Dare.objects.filter(is_approved=True).select_related(
             'category', 'difficulty'
@@ -489,7 +713,10 @@ class DareListView(ListView):
                 queryset = queryset.filter(is_featured=True)
 
             sort_by = self.search_form.cleaned_data.get('sort_by')
-            if sort_by == 'oldest':
+            if sort_by == 'trending':
+                # Driven by the score index; dares with no recent engagement drop out
+                queryset = queryset.filter(trending__isnull=False).order_by('-trending__score')
+            elif sort_by == 'oldest':
                 queryset = queryset.order_by('created_at')
             elif sort_by == 'most_viewed':
                 queryset = queryset.order_by('-views_count', '-created_at')
@@ -508,6 +735,7 @@ class DareListView(ListView):
             self.search_form = DareSearchForm()
         
         context['search_form'] = self.search_form
+        context['liked_dares'] = likes.liked_ids(self.request, context['dares'])
         
         context['categories'] = Category.objects.filter(is_active=True).annotate(
             dare_count=Count('dares', filter=Q(dares__is_approved=True))
@@ -519,7 +747,7 @@ class DareListView(ListView):
         
         return context
 
-class CommunityView(ListView):
+class CommunityView(CachePolicyMixin, ListView):
     """
     Display a board of recently completed and verified dares.
     """
@@ -527,24 +755,66 @@ class CommunityView(ListView):
     template_name = 'community.html'
     context_object_name = 'completions'
     paginate_by = 9
+    
+    def get_validators(self):
+        return conditional.content_version('completions')
 
     def get_queryset(self):
         return DareCompletion.objects.filter(is_verified=True).select_related(
             'dare', 'dare__category'
         ).order_by('-completed_at')
 
+class MyActivityView(LoginRequiredMixin, TemplateView):
+    """The signed-in user's dares, completions and likes, found by their account email"""
+    template_name = 'my_activity.html'
+    login_url = reverse_lazy('login')
+    recent_limit = 20
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        email = self.request.user.email
+        context['activity_email'] = email
+        if not email:
+            return context
+        
+        context['summary'] = activity.summary(email)
+        context['quota_left'] = activity.quota_left(email, SiteConfiguration.get_config().max_dares_per_user)
+        context['my_dares'] = activity.for_email(Dare.objects, 'email', email).select_related(
+            'category'
+        ).order_by('-created_at')[:self.recent_limit]
+        context['my_completions'] = activity.for_email(DareCompletion.objects, 'completer_email', email).select_related(
+            'dare'
+        ).order_by('-completed_at')[:self.recent_limit]
+        context['my_likes'] = activity.for_email(DareLike.objects, 'user_email', email).select_related(
+            'dare'
+        ).order_by('-created_at')[:self.recent_limit]
+        return context
+
 class SignUpView(generic.CreateView):
     form_class = CustomUserCreationForm
     success_url = reverse_lazy('login')
     template_name = 'signup.html'
     
-class PrivacyView(TemplateView):
+class StaticPageView(CachePolicyMixin, TemplateView):
+    """Template-only page, validated by the template file's modification time"""
+    cache_max_age = 60 * 10
+    cache_s_maxage = 60 * 60 * 24
+    cache_stale_while_revalidate = 60 * 60 * 24
+    
+    def get_validators(self):
+        mtime = max(
+            os.path.getmtime(get_template(name).origin.name) for name in (self.template_name, 'base.html')
+        )
+        modified = datetime.datetime.fromtimestamp(int(mtime), tz=datetime.timezone.utc)
+        return f'{self.template_name}-{modified.timestamp()}', modified
+
+class PrivacyView(StaticPageView):
     template_name = 'privacy.html'
 
-class TermsView(TemplateView):
+class TermsView(StaticPageView):
     template_name = 'terms.html'
 
-class FAQView(TemplateView):
+class FAQView(StaticPageView):
     template_name = 'faq.html'
 
 
@@ -564,6 +834,9 @@ def chatbot_response(request):
         return JsonResponse({'response': error_message}, status=503)
 
     try:
+        # Imported on first use: the Google client stack takes about a second
+        # to load and nothing else needs it
+        import google.generativeai as genai
         genai.configure(api_key=GEMINI_API_KEY)
         model = genai.GenerativeModel('gemini-1.5-flash-latest')
         system_prompt = """
@@ -594,6 +867,6 @@ def chatbot_response(request):
         return JsonResponse({'response': response.text})
 
     except Exception as e:
-        print(f"An error occurred with the Gemini API: {e}")
+        logger.exception("An error occurred with the Gemini API: %s", e)
         user_error_message = "Oops! I'm having a little trouble connecting right now. Please try again in a moment."
         return JsonResponse({'response': user_error_message}, status=500)
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Post-deploy cache warming.
+
+``hot_paths`` lists the pages the first visitors after a deploy are most
+likely to hit: the homepage, the first pages of the dare list in every
+sort order, every active category, the most viewed dares, the stats page
+and the stats APIs. ``warm`` requests them anonymously, ``concurrency`` at
+a time, either in-process through the Django test client or over HTTP
+against ``base_url``. Either way the shared cache (the home feed, the stats
+snapshot and API payloads) is filled; over HTTP, through the CDN or load
+balancer, anonymous pages also land in any shared HTTP cache in front of
+the site.
+
+With the default local-memory cache each process has its own cache, so an
+in-process run only helps the process it runs in: gunicorn.conf.py warms
+the master before workers fork when ``WARM_CACHE`` is set, and each worker
+inherits the entries.
+
+Warming requests are not counted as dare views. The user agent is only a
+label anyone can send, so ``is_warmup`` trusts either a WSGI environ key
+that only in-process requests can carry, or, over HTTP, the shared secret
+``WARMUP_TOKEN`` in the ``X-Warmup-Token`` header. Without a token set,
+remote warming counts as views.
+"""
+import hmac
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connections
+from django.urls import reverse
+
+USER_AGENT = 'DareoraWarmup/1.0'
+HEADERS = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip'}
+# Not an HTTP_* key, so no header can set it
+ENVIRON_KEY = 'dares.warmup'
+TOKEN_HEADER = 'X-Warmup-Token'
+
+
+def token():
+    return getattr(settings, 'WARMUP_TOKEN', '')
+
+
+def is_warmup(request):
+    if request.META.get(ENVIRON_KEY) is True:
+        return True
+    secret, sent = token(), request.META.get('HTTP_X_WARMUP_TOKEN', '')
+    return bool(secret and sent) and hmac.compare_digest(sent.encode(), secret.encode())
+
+
+def hot_paths(top=50, pages=1):
+    """``[(kind, path), ...]`` in the order they should be warmed."""
+    from .forms import DareSearchForm
+    from .models import Category, Dare
+
+    paths = [('home', reverse('dares:home'))]
+    dare_list = reverse('dares:dare_list')
+    paths.append(('dare_list', dare_list))
+    for sort, _ in DareSearchForm.SORT_CHOICES:
+        for page in range(1, pages + 1):
+            query = {'sort_by': sort, **({'page': page} if page > 1 else {})}
+            paths.append(('dare_list', f'{dare_list}?{urlencode(query)}'))
+    for name in Category.objects.filter(is_active=True).order_by('name').values_list('name', flat=True):
+        for page in range(1, pages + 1):
+            path = reverse('dares:category_detail', kwargs={'category_name': name})
+            paths.append(('category_detail', f'{path}?page={page}' if page > 1 else path))
+    slugs = Dare.objects.filter(is_approved=True).order_by('-views_count').values_list('slug', flat=True)[:top]
+    paths.extend(('dare_detail', reverse('dares:dare_detail', kwargs={'slug': slug})) for slug in slugs)
+    paths.extend((name, reverse(f'dares:{name}')) for name in ('stats', 'api_stats', 'api_stats_series', 'community'))
+    return paths
+
+
+def default_host():
+    """A host the site accepts, for in-process requests."""
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*' and not host.startswith('.'):
+            return host
+    # Accepted with DEBUG on and ALLOWED_HOSTS empty, and matched by '*'
+    return 'localhost'
+
+
+def fetch_local(path, host):
+    from django.test import Client
+
+    client = Client(HTTP_HOST=host, HTTP_USER_AGENT=USER_AGENT, HTTP_ACCEPT_ENCODING='gzip', **{ENVIRON_KEY: True})
+    started = time.perf_counter()
+    response = client.get(path, secure=settings.SECURE_SSL_REDIRECT)
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response.status_code, time.perf_counter() - started
+
+
+def closing_connections(fetch):
+    """Close the calling pool thread's database connections after each request."""
+    def wrapped(target):
+        try:
+            return fetch(target)
+        finally:
+            connections.close_all()
+    return wrapped
+
+
+def fetch_remote(url, timeout):
+    started = time.perf_counter()
+    request = urllib.request.Request(url, headers={**HEADERS, TOKEN_HEADER: token()} if token() else HEADERS)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as error:
+        status = error.code
+    except OSError:
+        status = 0
+    return status, time.perf_counter() - started
+
+
+def warm(paths, concurrency=4, base_url=None, host=None, timeout=30):
+    """
+    Request every ``(kind, path)``; returns ``{'seconds', 'results'}`` with
+    one ``{'kind', 'path', 'status', 'seconds'}`` per path, in order.
+    """
+    if base_url:
+        targets = [base_url.rstrip('/') + path for _, path in paths]
+        fetch = partial(fetch_remote, timeout=timeout)
+    else:
+        targets = [path for _, path in paths]
+        fetch = partial(fetch_local, host=host or default_host())
+
+    started = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            responses = list(pool.map(fetch if base_url else closing_connections(fetch), targets))
+    else:
+        responses = [fetch(target) for target in targets]
+    return {
+        'seconds': round(time.perf_counter() - started, 3),
+        'results': [
+            {'kind': kind, 'path': path, 'status': status, 'seconds': round(seconds, 3)}
+            for (kind, path), (status, seconds) in zip(paths, responses)
+        ],
+    }
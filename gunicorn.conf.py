@@ -0,0 +1,39 @@
+"""
+Gunicorn settings, picked up from the working directory:
+
+    gunicorn
+
+The application is loaded once in the master (``preload_app``) and warmed
+by ``dares.preload`` before any worker is forked, so workers share the
+imported code and compiled templates and start serving hot. Override any
+setting on the command line or with ``GUNICORN_CMD_ARGS``.
+
+With ``WARM_CACHE=1`` the master also requests the hottest pages
+(``dares.warmup``) before forking, so workers inherit a filled cache even
+with the per-process default backend.
+"""
+import multiprocessing
+import os
+
+wsgi_app = 'daredb.wsgi:application'
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+preload_app = True
+
+
+def when_ready(server):
+    from dares.preload import warm
+
+    stats = warm()
+    server.log.info(
+        "Warmed %(urls)s URL names and %(templates)s templates in %(seconds)ss", stats,
+    )
+    if os.getenv('WARM_CACHE'):
+        from django.db import connections
+        from dares import warmup
+
+        paths = warmup.hot_paths()
+        result = warmup.warm(paths)
+        connections.close_all()
+        warmed = sum(1 for entry in result['results'] if 200 <= entry['status'] < 400)
+        server.log.info("Warmed %s of %s hot URLs in %ss", warmed, len(paths), result['seconds'])
@@ -0,0 +1,81 @@
+document.addEventListener('DOMContentLoaded', () => {
+    const chatbotButton = document.getElementById('chatbot-button');
+    const chatbotWindow = document.getElementById('chatbot-window');
+    const chatbotClose = document.getElementById('chatbot-close');
+    const chatbotSend = document.getElementById('chatbot-send');
+    const chatbotInput = document.getElementById('chatbot-input');
+    const chatbotMessages = document.getElementById('chatbot-messages');
+
+    chatbotButton.addEventListener('click', () => {
+        chatbotWindow.style.display = 'flex';
+    });
+
+    chatbotClose.addEventListener('click', () => {
+        chatbotWindow.style.display = 'none';
+    });
+
+    chatbotSend.addEventListener('click', sendMessage);
+    chatbotInput.addEventListener('keypress', (e) => {
+        if (e.key === 'Enter') {
+            sendMessage();
+        }
+    });
+
+    function showWelcomeMessage() {
+        const welcomeText = "Hi there! I'm DareBot. Ask me anything about Dareora, or try one of the suggestions below.";
+        appendMessage(welcomeText, 'bot');
+    }
+
+    function sendMessage() {
+        const message = chatbotInput.value;
+        if (message.trim() === '') return;
+
+        appendMessage(message, 'user');
+        chatbotInput.value = '';
+        document.getElementById('chatbot-starter-questions').style.display = 'none'; // Hide starters
+        showTypingIndicator(true);
+
+        fetch('/chatbot-response/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                // Read from the cookie so the page itself carries no per-visitor token
+                'X-CSRFToken': (document.cookie.match(/(?:^|; )csrftoken=([^;]*)/) || [])[1] || ''
+            },
+            body: JSON.stringify({ message: message })
+        })
+            .then(response => response.json())
+            .then(data => {
+                showTypingIndicator(false);
+                appendMessage(data.response, 'bot');
+            });
+    }
+
+    function appendMessage(text, sender) {
+        const messageElement = document.createElement('div');
+        messageElement.textContent = text;
+        messageElement.classList.add('message', sender + '-message');
+        chatbotMessages.appendChild(messageElement);
+        chatbotMessages.scrollTop = chatbotMessages.scrollHeight;
+    }
+
+    function showTypingIndicator(show) {
+        let indicator = chatbotMessages.querySelector('.typing-indicator');
+        if (show && !indicator) {
+            indicator = document.createElement('div');
+            indicator.textContent = 'DareBot is typing...';
+            indicator.classList.add('message', 'typing-indicator');
+            chatbotMessages.appendChild(indicator);
+            chatbotMessages.scrollTop = chatbotMessages.scrollHeight;
+        } else if (!show && indicator) {
+            indicator.remove();
+        }
+    }
+    document.querySelectorAll('.starter-btn').forEach(button => {
+        button.addEventListener('click', () => {
+            chatbotInput.value = button.textContent;
+            sendMessage();
+        });
+    });
+    showWelcomeMessage();
+});